@@ -1,7 +1,18 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, condecimal
 from datetime import datetime
+from typing import List, Optional
 from app.Model.Bidding.BiddingModel import BiddingModel
+from app.Service.fast_json import FastJSONResponse
+from app.Service.http_cache import cache_headers, not_modified
+from app.Service.state_versions import state_versions, BIDS, bids_of
+from app.Service.Bidding.bid_stream import bid_stream
+from app.Service.Bidding.order_book import BadCursor
+from app.Service.Users.user_names import user_names
 
 router = APIRouter(prefix="/bids", tags=["Bidding"])
 
@@ -22,6 +33,27 @@ class BidRequest(BaseModel):
     product_id: str
     bid_amount: condecimal(gt=0)
     user_id: str
+
+
+# Response shapes (docs only: bid lists go out through FastJSONResponse)
+class BidOut(BaseModel):
+    bid_id: str
+    bidder_id: str
+    bidder_name: Optional[str] = None
+    bid_amount: float
+    created_at: str
+
+
+class BidListOut(BaseModel):
+    total_bids: int
+    bids: List[BidOut]
+
+
+class BidDeltaOut(BaseModel):
+    bids: List[BidOut]
+    total_bids: int
+    highest_bid: float
+    cursor: Optional[str] = None
 # ======================================================
 # GET PRODUCT DETAILS
 # ======================================================
@@ -58,38 +90,96 @@ def create_bid(payload: BidRequest):
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
 
-    return {
+    state_versions.bump(BIDS, bids_of(product_id))
+
+    # 3. กระจาย bid ใหม่ให้ทุกคนที่เปิด stream ของสินค้านี้อยู่
+    # ชื่อผู้ประมูลจาก cache เท่านั้น: no query on the bid path; a miss is
+    # sent without a name (as attach() does for unknown users) and fetched
+    # in the background for the next bids and list reads
+    hit, bidder_name = user_names.peek(bidder_id)
+    if not hit:
+        user_names.prefetch([bidder_id])
+    bid = dict(result["bid"], bidder_name=bidder_name)
+    bid_stream.publish(product_id, {
+        "bid": bid,
+        "highest_bid": result["new_price"],
+        "total_bids": result.get("total_bids"),
+    })
+
+    response = {
         "status": "success",
-        "message": "Bid placed successfully",
+        "message": result.get("message", "Bid placed successfully"),
         "new_price": result["new_price"],
         "data": result["bid"],
     }
+    # durable ack mode only: False = accepted, DB write still being retried
+    if "persisted" in result:
+        response["persisted"] = result["persisted"]
+    return response
 
 
 # ======================================================
 # GET ALL BIDS
 # ======================================================
-@router.get("/product/{product_id}/bids")
+@router.get("/product/{product_id}/bids", response_class=FastJSONResponse, responses={200: {"model": BidListOut}})
 def get_all_bids(product_id: str):
-    bids = BiddingModel.get_all_bids(product_id)
-    return {"total_bids": len(bids), "bids": bids}
+    bids = user_names.attach(BiddingModel.get_all_bids(product_id), "bidder_id", "bidder_name")
+    return FastJSONResponse({"total_bids": len(bids), "bids": bids})
+
+
+# ======================================================
+# GET NEW BIDS SINCE CURSOR (incremental polling)
+# ======================================================
+@router.get("/product/{product_id}/bids/delta", response_class=FastJSONResponse, responses={200: {"model": BidDeltaOut}})
+def get_bids_delta(product_id: str, since_bid_id: str | None = None, since: str | None = None):
+    """
+    Return only bids newer than the client's cursor (`since_bid_id` or a
+    `since` created_at timestamp), plus the current total and highest bid.
+    Pass the returned `cursor` back as `since_bid_id` on the next poll.
+    400 for a malformed `since` or a `since_bid_id` this product never had
+    (reload the full list with GET /bids/product/{product_id}/bids then).
+    """
+    try:
+        bids = BiddingModel.get_bids_since(product_id, since_bid_id=since_bid_id, since=since)
+    except BadCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    user_names.attach(bids, "bidder_id", "bidder_name")
+    highest = BiddingModel.get_highest_bid(product_id)
+    highest_bid = (
+        float(highest["bid_amount"]) if highest
+        else BiddingModel.get_product_start_price(product_id)
+    )
+
+    return FastJSONResponse({
+        "bids": bids,
+        "total_bids": BiddingModel.count_bids(product_id),
+        "highest_bid": highest_bid,
+        "cursor": bids[-1]["bid_id"] if bids else since_bid_id,
+    })
 
 
 # ======================================================
 # GET HIGHEST BID
 # ======================================================
 @router.get("/{product_id}/highest")
-def get_highest_bid(product_id: str):
+def get_highest_bid(product_id: str, request: Request):
+    # ETag = จำนวนครั้งที่มี bid ใหม่ของสินค้านี้ -> poll ซ้ำระหว่างไม่มีใคร bid ได้ 304
+    # + minute slot: a bid this process never saw is at most a minute stale
+    etag = state_versions.etag(bids_of(product_id), per_minute=True)
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+
     highest = BiddingModel.get_highest_bid(product_id)
     start_price = BiddingModel.get_product_start_price(product_id)
 
     if not highest:
-        return {"highest_bid": start_price, "message": "No bids yet."}
+        return FastJSONResponse({"highest_bid": start_price, "message": "No bids yet."}, headers=cache_headers(etag))
 
-    return {
+    return FastJSONResponse({
         "highest_bid": float(highest["bid_amount"]),
         "data": highest
-    }
+    }, headers=cache_headers(etag))
 
 
 # ======================================================
@@ -99,3 +189,56 @@ def get_highest_bid(product_id: str):
 def get_latest_bid(product_id: str):
     bid_id = BiddingModel.get_latest_bid(product_id)
     return {"bid_id": bid_id}
+
+
+
+# ======================================================
+# LIVE BID STREAM (Server-Sent Events)
+# ======================================================
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _bid_snapshot(product_id: str) -> dict:
+    bids = user_names.attach(BiddingModel.get_all_bids(product_id), "bidder_id", "bidder_name")
+    if bids:
+        highest_bid = float(bids[0]["bid_amount"])
+    else:
+        highest_bid = BiddingModel.get_product_start_price(product_id)
+    return {"highest_bid": highest_bid, "total_bids": len(bids), "bids": bids}
+
+
+@router.get("/product/{product_id}/stream")
+async def stream_bids(product_id: str, request: Request):
+    """
+    Push endpoint for bid updates.
+    Sends a `snapshot` event on connect, then one `bid` event per accepted bid.
+    """
+    queue = bid_stream.subscribe(product_id)
+    try:
+        snapshot = await run_in_threadpool(_bid_snapshot, product_id)
+    except Exception:
+        bid_stream.unsubscribe(product_id, queue)
+        raise
+
+    async def events():
+        try:
+            yield _sse("snapshot", snapshot)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse("bid", event)
+        finally:
+            bid_stream.unsubscribe(product_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-from Model.CreateAccount.CreateAccountModel import create_new_user
+from app.Model.CreateAccount.CreateAccountModel import create_new_user
+from app.Service.db_async import run_db
 
 # Define the data structure for the incoming request body
 class SignUpRequest(BaseModel):
@@ -28,7 +29,8 @@ async def register_user(request_body: SignUpRequest):
             raise HTTPException(status_code=400, detail="Password must be at least 6 characters.")
             
         # 2. Call the Model to handle the database logic
-        result = create_new_user(
+        result = await run_db(
+            create_new_user,
             username=request_body.username,
             email=request_body.email,
             password=request_body.password,
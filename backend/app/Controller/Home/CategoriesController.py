@@ -1,24 +1,32 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Dict, Any, Optional
 
 # Controller should be thin: import business logic from the service layer
 from app.Service.Home.categories_service import (
-    get_categories,
+    FALLBACK_CATEGORIES,
     get_products_by_category,
 )
+from app.Service.http_cache import cached_json
+from app.Service.reference_data import reference_data, category_names_of
 
 router = APIRouter(prefix="/api/categories", tags=["home"])
 
 @router.get("/", response_model=List[str])
-def list_categories():
+def list_categories(request: Request):
     """
     GET /api/categories
     Returns a list of category names.
     """
     try:
-        return get_categories()
+        # body and ETag from the same snapshot
+        data, etag = reference_data.snapshot("names")
+        names = category_names_of(data)
     except Exception:
-        raise HTTPException(status_code=500, detail="Unable to load categories")
+        names = []
+    if not names:
+        # DB down / empty table -> sample fallback list, never tagged
+        return list(FALLBACK_CATEGORIES)
+    return cached_json(request, names, etag=etag, max_age=60)
 
 @router.get("/{category}/products", response_model=List[Dict[str, Any]])
 def products_by_category(
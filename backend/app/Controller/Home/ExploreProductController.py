@@ -1,16 +1,34 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
-from Service.Home.explore_product_service import get_explore_products
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List
+from app.Model.Home.ProductCardModel import ProductCard
+from app.Service.Home.explore_product_service import load_explore_products
+from app.Service.fast_json import FastJSONResponse
+from app.Service.clock import get_now, DB_TIME_FORMAT
+from app.Service.http_cache import cache_headers, not_modified
+from app.Service.state_versions import state_versions, CATALOG, BIDS
 
 router = APIRouter(prefix="/api/products/explore", tags=["home", "products"])
 
-@router.get("/", response_model=List[Dict[str, Any]])
-def list_explore(limit: int = Query(50, ge=1, le=200)):
+@router.get("/", response_class=FastJSONResponse, responses={200: {"model": List[ProductCard]}})
+def list_explore(request: Request, limit: int = Query(50, ge=1, le=200)):
     """
     GET /api/products/explore/?limit=50
     Returns products for ExploreProduct.jsx (mapped in Model).
+    Conditional GET: the ETag moves with product changes, bids and the
+    minute slot (timeLeft), so unchanged polls get 304.
+    X-Server-Time (also on 304) anchors the cached timeLeft values, as on
+    /api/products/upcoming.
     """
+    server_time = {"X-Server-Time": get_now().strftime(DB_TIME_FORMAT)}
+    etag = state_versions.etag(CATALOG, BIDS, per_minute=True)
+    unchanged = not_modified(request, etag, headers=server_time)
+    if unchanged is not None:
+        return unchanged
+
     try:
-        return get_explore_products(limit=limit)
+        items, live = load_explore_products(limit=limit)
+        # demo/error placeholders: no ETag, or clients would keep them until the next bump
+        headers = {**cache_headers(etag), **server_time} if live else {**server_time, "Cache-Control": "no-store"}
+        return FastJSONResponse(items, headers=headers)
     except Exception:
         raise HTTPException(status_code=500, detail="Unable to load explore products")
\ No newline at end of file
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.Service.Images.image_store import image_store, VARIANTS
+from app.Service.Images.image_derivatives import image_derivatives
+from app.Service.Images.image_blobs import image_blobs
+
+router = APIRouter(tags=["Images"])
+
+# ไฟล์ถูกอ้างด้วย hash ของเนื้อหา -> ไม่มีวันเปลี่ยน cache ได้ตลอด
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# ระหว่างที่ยังย่อรูปไม่เสร็จ ส่งต้นฉบับไปก่อนแต่ห้าม cache นาน
+FALLBACK_CACHE = "public, max-age=60"
+
+
+def _serve(path: str, etag: str, cache_control: str, media_type: str, request: Request):
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    # FileResponse streams the file in chunks instead of loading it whole
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@router.get("/images/{image_hash}")
+def get_image(image_hash: str, request: Request):
+    image_hash = image_hash.lower()
+    # local disk is a cache: a fresh container refills it from the durable store
+    if not image_blobs.ensure_local(image_hash):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return _serve(
+        image_store.path_for(image_hash),
+        f'"{image_hash}"',
+        IMMUTABLE_CACHE,
+        image_store.content_type(image_hash),
+        request,
+    )
+
+
+@router.get("/images/{image_hash}/{variant}")
+def get_image_variant(image_hash: str, variant: str, request: Request):
+    image_hash = image_hash.lower()
+    if variant not in VARIANTS or not image_blobs.ensure_local(image_hash):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    if image_store.has_derivative(image_hash, variant):
+        return _serve(
+            image_store.derivative_path(image_hash, variant),
+            f'"{image_hash}-{variant}"',
+            IMMUTABLE_CACHE,
+            "image/jpeg",
+            request,
+        )
+
+    # รูปเก่าหรือ job ยังไม่เสร็จ -> สั่งย่อแล้วส่งต้นฉบับไปก่อน
+    image_derivatives.schedule(image_hash)
+    return _serve(
+        image_store.path_for(image_hash),
+        f'"{image_hash}"',
+        FALLBACK_CACHE,
+        image_store.content_type(image_hash),
+        request,
+    )
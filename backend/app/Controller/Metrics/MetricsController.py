@@ -0,0 +1,63 @@
+from fastapi import APIRouter
+
+from app.Service.single_flight import single_flight
+from app.Service.db_connection import pool_stats
+from app.Service.Images.image_derivatives import image_derivatives
+from app.Service.Images.legacy_images import decoded_images
+from app.Service.Images.image_blobs import image_blobs
+from app.Service.Search.product_search import product_search
+from app.Service.state_versions import state_versions
+from app.Service.Bidding.bid_writer import bid_writer
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/single-flight")
+def single_flight_metrics():
+    """
+    Per-key request coalescing stats: calls, backend executions,
+    shared (calls that reused an in-flight result) and coalescing_ratio.
+    """
+    return single_flight.stats()
+
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    """Utilisation of the shared Supabase (PostgREST) HTTP connection pool."""
+    return pool_stats()
+
+
+@router.get("/image-derivatives")
+def image_derivative_metrics():
+    """Thumbnail / medium resize jobs queued in the process pool."""
+    return image_derivatives.stats()
+
+
+@router.get("/image-blobs")
+def image_blob_metrics():
+    """Images saved to / restored from the durable Storage bucket."""
+    return image_blobs.stats()
+
+
+@router.get("/decoded-images")
+def decoded_image_cache_metrics():
+    """Size and hit rate of the decoded legacy image LRU."""
+    return decoded_images.stats()
+
+
+@router.get("/search-index")
+def search_index_metrics():
+    """Size and age of the in-process product search index."""
+    return product_search.stats()
+
+
+@router.get("/state-versions")
+def state_version_metrics():
+    """Change counters behind the catalog / winners / bid ETags."""
+    return state_versions.stats()
+
+
+@router.get("/bid-writer")
+def bid_writer_metrics():
+    """Write-behind bid persistence: queue depth, retries and last DB error."""
+    return bid_writer.stats()
@@ -2,6 +2,12 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
 from datetime import datetime
 import uuid
+from app.Service.db_async import run_db
+from app.Service.Images.image_store import image_url
+from app.Service.Images.image_upload import store_uploads
+from app.Service.Search.product_search import product_search
+from app.Service.response_cache import invalidate_seller_totals
+from app.Service.state_versions import state_versions, WINNERS
 
 router = APIRouter()  # ← สำคัญมาก! บรรทัดนี้หายไป
 
@@ -25,44 +31,48 @@ async def create_payment(
         if not payment_slip.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        slip_bytes = await payment_slip.read()
-        slip_hex = "\\x" + slip_bytes.hex()
+        [slip_ref] = await store_uploads([payment_slip], derivatives=False)
+        if not slip_ref:
+            raise HTTPException(status_code=400, detail="Payment slip is empty")
         payment_id = str(int(datetime.now().timestamp() * 1000))
         
         print(f"Creating payment for user: {user_id}, product: {product_id}")
         
         # 1. Insert payment
-        payment_result = supabase.table("payment").insert({
+        payment_result = await run_db(lambda: supabase.table("payment").insert({
             "payment_id": payment_id,
             "amount": amount,
             "address": address,
-            "payment_slip": slip_hex,
+            "payment_slip": slip_ref,
             "payment_status": payment_status
-        }).execute()
+        }).execute())
         
         if not payment_result.data:
             raise HTTPException(status_code=500, detail="Failed to insert payment record")
         
         # 2. Update product status
-        product_update = supabase.table("product")\
+        product_update = await run_db(lambda: supabase.table("product")\
             .update({"status_id": 4})\
             .eq("product_id", product_id)\
-            .execute()
+            .execute())
         
         if not product_update.data:
             print(f"Warning: Failed to update product status for {product_id}")
+        else:
+            invalidate_seller_totals(product_search.set_status(product_id, 4))
+            state_versions.bump(WINNERS)
         
         # 3. Create Invoice
         invoice_id = str(uuid.uuid4())
         current_time = datetime.now().isoformat()
         
-        invoice_result = supabase.table("invoice").insert({
+        invoice_result = await run_db(lambda: supabase.table("invoice").insert({
             "invoice_id": invoice_id,
             "payment_id": payment_id,
             "invoice_date": current_time,
             "total_amount": amount,
             "create_at": current_time,
-        }).execute()
+        }).execute())
         
         if not invoice_result.data:
             print(f"Warning: Failed to create invoice for payment {payment_id}")
@@ -91,17 +101,19 @@ async def get_payment(payment_id: str):
         from app.Service.db_connection import get_supabase_client
         supabase = get_supabase_client()
         
-        result = supabase.table("payment")\
+        result = await run_db(lambda: supabase.table("payment")\
             .select("*")\
             .eq("payment_id", payment_id)\
-            .execute()
+            .execute())
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Payment not found")
         
+        payment = result.data[0]
+        payment["payment_slip"] = image_url(payment.get("payment_slip"))
         return JSONResponse({
             "success": True,
-            "data": result.data[0]
+            "data": payment
         })
     except HTTPException as he:
         raise he
@@ -115,10 +127,10 @@ async def get_invoice(invoice_id: str):
         from app.Service.db_connection import get_supabase_client
         supabase = get_supabase_client()
         
-        result = supabase.table("invoice")\
+        result = await run_db(lambda: supabase.table("invoice")\
             .select("*")\
             .eq("invoice_id", invoice_id)\
-            .execute()
+            .execute())
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Invoice not found")
@@ -143,10 +155,10 @@ async def update_payment_status(payment_id: str, status: str = Form(...)):
         if status not in valid_statuses:
             raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
         
-        result = supabase.table("payment")\
+        result = await run_db(lambda: supabase.table("payment")\
             .update({"payment_status": status})\
             .eq("payment_id", payment_id)\
-            .execute()
+            .execute())
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Payment not found")
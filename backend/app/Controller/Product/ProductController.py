@@ -1,57 +1,74 @@
 # backend/app/Controller/ProductController.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from datetime import datetime, timedelta
 import traceback
 from fastapi import HTTPException
-from app.Service.db_connection import supabase
-from datetime import datetime, timedelta
+from app.Service.db_connection import get_supabase_client
+from app.Service.Bidding.order_book import order_books
+from app.Service.Bidding.bid_store import bid_store
+from app.Service.Auction import auction_lifecycle
+from app.Service.clock import get_now, parse_db_time
+from app.Service.response_cache import slot_cache
+from app.Service.single_flight import single_flight
+from app.Service.Images.image_store import image_url
+from app.Service.reference_data import reference_data
+from app.Service.http_cache import cached_json, cache_headers, not_modified
+from app.Service.fast_json import FastJSONResponse
+from app.Service.state_versions import state_versions, CATALOG, WINNERS
+from app.Service.Users.user_names import user_names
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
-def get_now() -> datetime:
-    """
-    Return current real time (Adjusted to Thai Time UTC+7)
-    """
-    # ดึงเวลาปัจจุบันแบบ UTC (เวลาโลก)
-    utc_now = datetime.utcnow()
-    # บวก 7 ชั่วโมงเพื่อให้เป็นเวลาไทย
-    thai_now = utc_now + timedelta(hours=7)
-    # ตัดหน่วยไมโครวินาทีออกเพื่อให้ Format ตรงกับ DB
-    return thai_now.replace(microsecond=0)
-
-
 # ======================================================
 # ✅ GET CATEGORIES ENDPOINT
 # ======================================================
 @router.get("/categories")
-def get_categories():
+def get_categories(request: Request):
     """
-    Return list of product categories.
+    Return list of product categories (from the in-memory reference data).
     """
-    res = (
-        supabase.table("category")
-        .select("category_id, category_name")
-        .order("category_id", desc=False)
-        .execute()
-    )
-    return {"categories": res.data or []}
+    data, etag = reference_data.snapshot("products")
+    return cached_json(request, {"categories": data["categories"]}, etag=etag, max_age=60)
 
 
 # ======================================================
 # ✅ UPCOMING PRODUCTS
 # ======================================================
 @router.get("/upcoming")
-def get_upcoming_products(limit: int = 60):
+def get_upcoming_products(request: Request, limit: int = 60):
     """
     Return upcoming products that haven't started yet.
+    Conditional GET: the ETag changes when a product is created or changes
+    status, and at each minute boundary; otherwise polls get 304.
     """
     now = get_now()
     now_str = now.strftime("%Y-%m-%d %H:%M:%S")
-    
+
+    # body ที่ browser cache ไว้มี current_time เก่า -> ส่งเวลาจริงใน header ด้วยเสมอ (รวม 304)
+    server_time = {"X-Server-Time": now_str}
+    etag = state_versions.etag(CATALOG, per_minute=True)
+    unchanged = not_modified(request, etag, headers=server_time)
+    if unchanged is not None:
+        return unchanged
+
+    # รายการเปลี่ยนแค่ตอนขึ้นนาทีใหม่ หรือตอนสถานะสินค้าเปลี่ยน
+    # cache miss at a minute boundary -> concurrent callers share one query
+    items = slot_cache.get_or_load(
+        ("upcoming", limit),
+        lambda: single_flight.do(f"products:upcoming:{limit}", lambda: _load_upcoming(now_str, limit)),
+    )
+
+    return FastJSONResponse(
+        {"current_time": now_str, "items": items},
+        headers={**cache_headers(etag), **server_time},
+    )
+
+
+def _load_upcoming(now_str: str, limit: int) -> list[dict]:
     res = (
-        supabase.table("product")
+        get_supabase_client().table("product")
         .select(
             "product_id, product_name, product_desc, product_img, "
             "start_price, seller_id, start_time, end_time, product_cat_id, status_id"
@@ -71,7 +88,7 @@ def get_upcoming_products(limit: int = 60):
             "product_id": prod.get("product_id"),
             "product_name": prod.get("product_name"),
             "product_desc": prod.get("product_desc"),
-            "product_img": prod.get("product_img"),
+            "product_img": image_url(prod.get("product_img"), "thumb"),
             "start_price": prod.get("start_price"),
             "seller_id": prod.get("seller_id"),
             "product_cat_id": prod.get("product_cat_id"),
@@ -79,11 +96,7 @@ def get_upcoming_products(limit: int = 60):
             "end_time": prod.get("end_time"),
             "status_id": prod.get("status_id"),
         })
-
-    return {
-        "current_time": now_str,
-        "items": items,
-    }
+    return items
 
 
 # ======================================================
@@ -94,56 +107,25 @@ def get_upcoming_products(limit: int = 60):
 @router.get("/bidding-now")
 def get_bidding_now():
     """
-    1. Check if any upcoming product (status=2) has reached start_time.
-    2. If yes, update status to 8 (Bidding).
-    3. Return the current bidding product.
+    Return the current bidding product.
+    Promotion 2 -> 8 is done by the auction scheduler at start_time,
+    so this endpoint is a pure read.
     """
     now = get_now()
     now_str = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Debug: ปริ้นดูเวลา Server ใน Terminal (จะได้รู้ว่าเวลาตรงไหม)
-    print(f"🕒 Server Time (Thai): {now_str}")
-
-    # -------------------------------------------------------
-    # 🔥 STEP 1: Auto-Promote (Trigger เปลี่ยนสถานะอัตโนมัติ)
-    # -------------------------------------------------------
-    # หาสินค้าที่ถึงเวลาเริ่มแล้ว (start_time <= now) และสถานะเป็น 2
-    # ❌ เอา .gte("end_time", now_str) ออก เพื่อกันพลาดกรณีเวลาเหลื่อม
-    to_promote = (
-        supabase.table("product")
-        .select("product_id, start_time")
-        .lte("start_time", now_str)   # ถึงเวลาเริ่มแล้ว
-        .eq("status_id", 2)           # แต่สถานะยังเป็น 2
-        .execute()
-    )
-    
-    # ถ้าเจอสินค้าที่ต้องเริ่มประมูล ให้เปลี่ยนสถานะเป็น 8 ทันที
-    if to_promote.data:
-        for item in to_promote.data:
-            print(f"⚡ Promoting Product: {item['product_id']} (Start: {item['start_time']})")
-            supabase.table("product").update({"status_id": 8}).eq("product_id", item['product_id']).execute()
-
-    # -------------------------------------------------------
-    # 🔥 STEP 2: Fetch Active Product (ดึงข้อมูลตามปกติ)
-    # -------------------------------------------------------
-    # ขั้นตอนนี้ยังต้องเช็ค end_time เพื่อไม่ให้เอาของที่จบไปแล้วมาโชว์
-    res = (
-        supabase.table("product")
-        .select(
-            "product_id, product_name, product_desc, product_img, "
-            "start_price, seller_id, start_time, end_time, status_id"
-        )
-        .lte("start_time", now_str)  # เริ่มไปแล้ว
-        .gte("end_time", now_str)    # ยังไม่จบ
-        .eq("status_id", 8)          # สถานะต้องเป็น 8
-        .order("start_time", desc=False) # เอาอันที่เริ่มก่อนมาโชว์
-        .limit(1)
-        .execute()
+    cached = slot_cache.get_or_load(
+        ("bidding-now",),
+        lambda: single_flight.do("products:bidding-now", lambda: _load_bidding_now(now_str)),
     )
+    bidding_product = dict(cached) if cached else None
+
+    # ราคาปัจจุบันมาจาก order book (bid เปลี่ยนราคาได้ระหว่างนาที)
+    if bidding_product:
+        book = order_books.get(bidding_product["product_id"])
+        if book:
+            bidding_product["start_price"] = book.current_price()
 
-    data = res.data or []
-    bidding_product = data[0] if data else None
-    
     # คำนวณเวลาที่เหลือ
     time_remaining = None
     if bidding_product and bidding_product.get("end_time"):
@@ -164,6 +146,28 @@ def get_bidding_now():
     }
 
 
+def _load_bidding_now(now_str: str) -> dict | None:
+    res = (
+        get_supabase_client().table("product")
+        .select(
+            "product_id, product_name, product_desc, product_img, "
+            "start_price, seller_id, start_time, end_time, status_id"
+        )
+        .lte("start_time", now_str)  # เริ่มไปแล้ว
+        .gte("end_time", now_str)    # ยังไม่จบ
+        .eq("status_id", 8)          # สถานะต้องเป็น 8
+        .order("start_time", desc=False) # เอาอันที่เริ่มก่อนมาโชว์
+        .limit(1)
+        .execute()
+    )
+    data = res.data or []
+    if not data:
+        return None
+    row = data[0]
+    row["product_img"] = image_url(row.get("product_img"), "medium")
+    return row
+
+
 # ======================================================
 # ✅ GET CURRENT TIME ENDPOINT
 # ======================================================
@@ -188,95 +192,29 @@ def get_current_time():
 @router.post("/finalize/{product_id}")
 def finalize_auction(product_id: str):
     """
-    Finalize auction safely.
-    Handles potential errors and checks for correct column names.
+    Report the auction result.
+    Finalization itself is driven by the auction scheduler at end_time;
+    this is a status read that only finalizes as a fallback when the
+    auction is past end_time and the scheduler has not closed it yet.
     """
     try:
-        print(f"🏁 [Finalize] Processing product: {product_id}")
-
-        # 1. ดึงข้อมูล product (ใช้ limit(1) แทน single เพื่อกัน Error 500)
-        prod_res = (
-            supabase.table("product")
-            .select("*")
-            .eq("product_id", product_id)
-            .limit(1)
-            .execute()
-        )
-        
-        # เช็คว่าเจอสินค้าไหม
-        if not prod_res.data:
-            print(f"❌ Product {product_id} not found")
+        product = auction_lifecycle.get_status(product_id)
+        if not product:
             return {"message": "Product not found", "product_id": product_id}
-        
-        product = prod_res.data[0]
-        
-        # ถ้า status เป็น 4 แล้ว (จบไปแล้ว) ไม่ต้องทำอะไร
-        if product.get("status_id") == 4:
-            print(f"⚠️ Product {product_id} is already finalized.")
-            return {
-                "message": "Auction already finalized",
-                "product_id": product_id,
-                "winner_id": product.get("winner_id"),
-                "final_price": product.get("final_price")
-            }
-        
-        # 2. หา bid สูงสุด
-        bid_res = (
-            supabase.table("bid")
-            .select("*")
-            .eq("product_id", product_id)
-            .order("bid_amount", desc=True)
-            .limit(1)
-            .execute()
-        )
-        
-        bids = bid_res.data or []
-        
-        if bids:
-            # --- มีคนประมูล ---
-            highest_bid = bids[0]
-            print(f"💰 Highest bid found: {highest_bid}")
-
-            # 🔥 จุดสำคัญ: เช็คทั้ง user_id หรือ bidder_id (เผื่อชื่อคอลัมน์ไม่ตรง)
-            winner_id = highest_bid.get("user_id") or highest_bid.get("bidder_id")
-            final_price = highest_bid.get("bid_amount")
-
-            if not winner_id:
-                # ถ้าหา ID ไม่เจอ แสดงว่า Column ใน DB ชื่อไม่ตรงกับ code
-                print("❌ Error: Bid found but could not identify user_id/bidder_id column.")
-                raise HTTPException(status_code=500, detail="Database column mismatch for bidder ID")
-
-            # 3. อัพเดท product (Set Winner)
-            supabase.table("product").update({
-                "status_id": 4,
-                "winner_id": winner_id,
-                "final_price": final_price
-            }).eq("product_id", product_id).execute()
-            
-            print(f"✅ Auction Won by {winner_id} at {final_price}")
-            
-            return {
-                "message": "Auction finalized with winner",
-                "product_id": product_id,
-                "winner_id": winner_id,
-                "final_price": final_price
-            }
-        else:
-            # --- ไม่มีคนประมูล ---
-            print("tel: No bids found. Closing auction.")
-            
-            supabase.table("product").update({
-                "status_id": 4,
-                "winner_id": None,
-                "final_price": product.get("start_price") # หรือ None แล้วแต่ Logic
-            }).eq("product_id", product_id).execute()
-            
-            return {
-                "message": "Auction finalized with no winner",
-                "product_id": product_id,
-                "winner_id": None,
-                "final_price": None
-            }
+
+        if product.get("status_id") not in auction_lifecycle.OPEN_STATUSES:
+            return auction_lifecycle.finalized_result(product)
+
+        end_time = parse_db_time(product.get("end_time"))
+        if end_time and end_time <= get_now():
+            return auction_lifecycle.finalize(product_id)
+
+        return {
+            "message": "Auction still running",
+            "product_id": product_id,
+            "winner_id": None,
+            "final_price": None,
+        }
 
     except Exception as e:
         # 🔥 ปริ้น Error ยาวๆ ออกมาดูใน Terminal ถ้ามันพัง
@@ -308,75 +246,79 @@ def get_next_refresh():
 # ======================================================
 # ✅ GET WINNER PRODUCTS
 # ======================================================
+def _backfill_final_prices(rows: list[dict]):
+    """Fill in and persist final_price for completed rows finalized without one."""
+    missing = [r for r in rows if r.get("final_price") in (None, "")]
+    if not missing:
+        return
+    top = bid_store.max_bids([r["product_id"] for r in missing])
+    for r in missing:
+        best = top.get(r["product_id"])
+        r["final_price"] = best["bid_amount"] if best else r.get("start_price")
+        try:
+            (
+                get_supabase_client().table("product")
+                .update({"final_price": r["final_price"]})
+                .eq("product_id", r["product_id"])
+                .is_("final_price", "null")
+                .execute()
+            )
+        except Exception as e:
+            print(f"⚠️ final_price backfill failed for {r['product_id']}: {e}")
+
+
 @router.get("/winners")
-def list_winners(limit: int = 20):
+def list_winners(request: Request, limit: int = 20):
     """
     Get products that have been sold (status_id = 4).
+    Conditional GET: 304 until an auction is finalized, paid, received or
+    refunded, or a winner renames; the minute slot bounds how long a change
+    made outside this process (admin edit in Supabase) can stay hidden.
     """
+    etag = state_versions.etag(WINNERS, per_minute=True)
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+
     # Fetch winner products (status_id = 4)
     res = (
-        supabase.table("product")
-        .select("*")
+        get_supabase_client().table("product")
+        .select(
+            "product_id, product_name, product_desc, product_cat_id, product_img, "
+            "start_price, final_price, winner_id, start_time, end_time"
+        )
         .eq("status_id", 4)
         .order("end_time", desc=True)
         .limit(limit)
         .execute()
     )
     rows = res.data or []
-    product_ids = [r.get("product_id") for r in rows if r.get("product_id")]
-
-    # Map winner_id -> user_name
-    winner_ids = [r.get("winner_id") for r in rows if r.get("winner_id")]
-    user_map: dict[str, str] = {}
-    if winner_ids:
-        ures = (
-            supabase.table("users")
-            .select("user_id,user_name")
-            .in_("user_id", winner_ids)
-            .execute()
-        )
-        for u in (ures.data or []):
-            user_map[u["user_id"]] = u.get("user_name") or "Unknown"
-
-    # Fetch bids for these products and compute max bid_amount
-    max_bid_map: dict[str, float] = {}
-    if product_ids:
-        bres = (
-            supabase.table("bid")
-            .select("product_id,bid_amount")
-            .in_("product_id", product_ids)
-            .execute()
-        )
-        for b in (bres.data or []):
-            pid = b.get("product_id")
-            amt = b.get("bid_amount")
-            if pid is None or amt is None:
-                continue
-            cur = max_bid_map.get(pid)
-            if cur is None or amt > cur:
-                max_bid_map[pid] = amt
+
+    # Map winner_id -> user_name (cached, at most one query)
+    user_map = user_names.resolve_many(r.get("winner_id") for r in rows)
+
+    # final_price ถูกบันทึกตอน finalize แล้ว; เฉพาะแถวเก่าที่ยังไม่มี
+    # ให้ DB หา max bid ให้ (ไม่ดึง bid ทุกแถวมาวนหาเอง) แล้วบันทึกกลับไป
+    _backfill_final_prices(rows)
 
     items = []
     for r in rows:
         pid = r.get("product_id")
         wid = r.get("winner_id")
-        # Prefer stored final_price, else max bid, else start_price
-        stored_final = r.get("final_price")
-        computed_final = stored_final if stored_final not in (None, "") else max_bid_map.get(pid, r.get("start_price"))
         items.append({
             "product_id": pid,
             "product_name": r.get("product_name"),
             "product_desc": r.get("product_desc"),
             "product_cat_id": r.get("product_cat_id"),
-            "product_img": r.get("product_img"),
+            "product_img": image_url(r.get("product_img"), "thumb"),
             "start_price": r.get("start_price"),
-            "final_price": computed_final,
+            "final_price": r.get("final_price"),
             "winner_id": wid,
-            "winner_name": user_map.get(wid, "Unknown"),
+            "winner_name": user_map.get(wid) or "Unknown",
             "start_time": r.get("start_time"),
             "end_time": r.get("end_time"),
         })
-    return {"items": items}
+    return FastJSONResponse({"items": items}, headers=cache_headers(etag))
 
 
 # ======================================================
@@ -395,7 +337,7 @@ def update_status(product_id: str, target: int = 8):
 
     # Fetch current status
     current = (
-        supabase.table("product")
+        get_supabase_client().table("product")
         .select("product_id,status_id")
         .eq("product_id", product_id)
         .single()
@@ -407,43 +349,34 @@ def update_status(product_id: str, target: int = 8):
     old_status = current.data["status_id"]
 
     # Promote 2 -> 8 (start bidding)
+    # ผ่าน promote ตัวเดียวกับ scheduler: guarded UPDATE + order book / cache / search
     if old_status == 2 and target == 8:
-        updated = (
-            supabase.table("product")
-            .update({"status_id": 8})
-            .eq("product_id", product_id)
-            .eq("status_id", 2)
-            .execute()
-        )
-        if getattr(updated, "error", None) or not updated.data:
+        if product_id not in auction_lifecycle.promote([product_id]):
             return {"updated": None, "message": "Promotion failed or already changed"}
-        row = updated.data[0]
         return {
             "updated": {
-                "product_id": row.get("product_id"),
+                "product_id": product_id,
                 "old_status_id": old_status,
-                "new_status_id": row.get("status_id"),
+                "new_status_id": auction_lifecycle.STATUS_BIDDING,
             },
             "message": "Started bidding (2 -> 8)"
         }
 
     # End bidding 8 -> 4 (completed)
+    # ผ่าน finalize เพื่อให้ winner_id / final_price ถูกบันทึกเสมอ
     if old_status == 8 and target == 4:
-        updated = (
-            supabase.table("product")
-            .update({"status_id": 4})
-            .eq("product_id", product_id)
-            .eq("status_id", 8)
-            .execute()
-        )
-        if getattr(updated, "error", None) or not updated.data:
+        result = auction_lifecycle.finalize(product_id)
+        if result["status"] == auction_lifecycle.NOT_FOUND:
+            return {"updated": None, "message": "Product not found"}
+        if result["status"] != auction_lifecycle.FINALIZED:
             return {"updated": None, "message": "Update failed or already changed"}
-        row = updated.data[0]
         return {
             "updated": {
-                "product_id": row.get("product_id"),
+                "product_id": product_id,
                 "old_status_id": old_status,
-                "new_status_id": row.get("status_id"),
+                "new_status_id": 4,
+                "winner_id": result.get("winner_id"),
+                "final_price": result.get("final_price"),
             },
             "message": "Bidding completed (8 -> 4)"
         }
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-from Model.ProfileBuyer.MyProfileModel import update_buyer_profile
+from app.Model.ProfileBuyer.MyProfileModel import update_buyer_profile
+from app.Service.db_async import run_db
 
 router = APIRouter(
     prefix="/api/buyer",
@@ -30,7 +31,8 @@ async def update_profile(user_id: str, body: BuyerProfileUpdateRequest):
             raise HTTPException(status_code=400, detail="User ID mismatch between path and body.")
 
         # 2. Call the Model layer to handle DB logic
-        result = update_buyer_profile(
+        result = await run_db(
+            update_buyer_profile,
             user_id=body.user_id,
             user_email=body.user_email,
             user_name=body.user_name,
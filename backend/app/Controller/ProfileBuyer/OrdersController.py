@@ -1,14 +1,27 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Header, Query, HTTPException
+from pydantic import TypeAdapter
 
 from app.Service.db_connection import get_supabase_client
+from app.Service.fast_json import FastJSONResponse
+from app.Service.Images.image_store import image_url
+from app.Service.Search.product_search import product_search
+from app.Service.response_cache import invalidate_seller_totals
+from app.Service.state_versions import state_versions, WINNERS
 from app.Model.ProfileBuyer.OrdersModel import OrderOut
 
 router = APIRouter(prefix="/api/buyer", tags=["Orders"])
 
+ORDER_COLUMNS = "product_id, product_name, start_price, end_time, winner_id, status_id, product_img"
+# ids per `in_` filter, keeps the query URL a sane length
+IN_CHUNK = 200
+
+# purchasedAt / cancelledAt in the exact form OrderOut emits ("...Z")
+_TIMESTAMP = TypeAdapter(Optional[datetime])
+
 
 # -----------------------------------------------------
 # Helper: Map status_id -> text
@@ -24,115 +37,134 @@ def _status_map(status_id: int):
 # -----------------------------------------------------
 # Convert a raw product row into DTO
 # -----------------------------------------------------
-def _to_dto(row: dict) -> OrderOut:
+def _timestamp(value):
+    return _TIMESTAMP.dump_python(_TIMESTAMP.validate_python(value), mode="json")
+
+
+def _to_order(row: dict) -> dict:
+    """Order as a plain dict in the OrderOut shape (list route, no validation)."""
     pid = str(row["product_id"])
-    thumb = row.get("thumbnailUrl") or row.get("product_img")
-
-    return OrderOut(
-        id=pid,
-        orderId="ORD-" + pid[:8].upper(),
-        productId=pid,
-        productName=row.get("product_name", ""),
-        finalPrice=row.get("final_price"),
-        purchasedAt=row.get("paid_at"),
-        cancelledAt=row.get("cancelled_at"),
-        thumbnailUrl=thumb,
-        status=_status_map(row.get("status_id")),
+    final_price = row.get("final_price")
+
+    return {
+        "id": pid,
+        "orderId": "ORD-" + pid[:8].upper(),
+        "productId": pid,
+        "productName": row.get("product_name") or "",
+        "finalPrice": float(final_price) if final_price is not None else None,
+        "quantity": 1,
+        "purchasedAt": _timestamp(row.get("paid_at")),
+        "cancelledAt": _timestamp(row.get("cancelled_at")),
+        "thumbnailUrl": row.get("thumbnailUrl") or image_url(row.get("product_img"), "thumb"),
+        "status": _status_map(row.get("status_id")),
+    }
+
+
+def _to_dto(row: dict) -> OrderOut:
+    return OrderOut(**_to_order(row))
+
+
+# -----------------------------------------------------
+# Batched enrichment: one query per table, not per order
+# -----------------------------------------------------
+def _select_in(make_query, column: str, values: list) -> list[dict]:
+    """Run `make_query().in_(column, chunk)` over values, IN_CHUNK ids at a time."""
+    rows = []
+    for start in range(0, len(values), IN_CHUNK):
+        resp = make_query().in_(column, values[start:start + IN_CHUNK]).execute()
+        rows.extend(resp.data or [])
+    return rows
+
+
+def _latest_by(rows: list[dict], key: str, order_col: str) -> dict:
+    """rows grouped by `key`, keeping the row with the greatest `order_col`."""
+    latest = {}
+    for r in rows:
+        k = r.get(key)
+        cur = latest.get(k)
+        if cur is None or (r.get(order_col) or "") > (cur.get(order_col) or ""):
+            latest[k] = r
+    return latest
+
+
+def _enrich_orders(supabase, rows: list[dict], buyer_id: str) -> list[dict]:
+    """
+    Attach final_price / paid_at / cancelled_at to won products.
+    Uses at most three queries (bids, payments, refund deliveries) for
+    any number of rows (per IN_CHUNK ids), assembled in memory.
+    """
+    if not rows:
+        return []
+    pids = [r["product_id"] for r in rows]
+
+    # ------- latest bid of this buyer per product -------
+    bids = _select_in(
+        lambda: supabase.table("bid").select("bid_id, product_id, created_at").eq("bidder_id", buyer_id),
+        "product_id", pids,
     )
+    latest_bid = _latest_by(bids, "product_id", "created_at")
+
+    # ------- PAYMENT ENRICHMENT (latest payment per bid) -------
+    bid_ids = [b["bid_id"] for b in latest_bid.values()]
+    payments = _select_in(
+        lambda: supabase.table("payment").select("bid_id, amount, payment_time"),
+        "bid_id", bid_ids,
+    ) if bid_ids else []
+    latest_payment = _latest_by(payments, "bid_id", "payment_time")
+
+    # ------- DELIVERY (for refund) -------
+    refunded = [r["product_id"] for r in rows if r.get("status_id") == 6]
+    deliveries = _select_in(
+        lambda: supabase.table("delivery").select("product_id, received_date").eq("delivery_status", "Refund"),
+        "product_id", refunded,
+    ) if refunded else []
+    latest_refund = _latest_by(deliveries, "product_id", "received_date")
+
+    for row in rows:
+        pid = row["product_id"]
+        bid = latest_bid.get(pid)
+        pay = latest_payment.get(bid["bid_id"]) if bid else None
+        refund = latest_refund.get(pid)
+
+        # fallback: ราคาเริ่มต้น / เวลาจบประมูล
+        row["final_price"] = pay["amount"] if pay else row.get("start_price")
+        row["paid_at"] = pay["payment_time"] if pay else row.get("end_time")
+        row["cancelled_at"] = refund["received_date"] if refund else None
+    return rows
+
+
+def _build_order(supabase, product: dict, buyer_id: str) -> OrderOut:
+    """
+    OrderOut for one won product (the row the caller already loaded),
+    with the same enrichment as list_orders: at most three more queries
+    whatever the size of the buyer's history.
+    """
+    return _to_dto(_enrich_orders(supabase, [dict(product)], buyer_id)[0])
 
 
 # -----------------------------------------------------
 # GET /orders?status=completed|cancelled
 # -----------------------------------------------------
-@router.get("/orders", response_model=List[OrderOut])
+@router.get("/orders", response_class=FastJSONResponse, responses={200: {"model": List[OrderOut]}})
 def list_orders(
     status: str = Query("completed", regex="^(completed|cancelled)$"),
     x_user_id: str = Header(..., alias="X-User-Id")
 ):
     supabase = get_supabase_client()
 
-    # Load base products
-    product_resp = (
+    # Load base products (filter by refund state in the query)
+    query = (
         supabase.table("product")
-        .select(
-            "product_id, product_name, start_price, end_time, winner_id, status_id, product_img"
-        )
+        .select(ORDER_COLUMNS)
         .eq("winner_id", x_user_id)
-        .execute()
     )
-
-
-    rows = product_resp.data or []
-
-    # filter by refund state
     if status == "completed":
-        rows = [r for r in rows if r.get("status_id") != 6]
+        query = query.neq("status_id", 6)
     else:
-        rows = [r for r in rows if r.get("status_id") == 6]
-
-    enriched = []
+        query = query.eq("status_id", 6)
+    rows = query.execute().data or []
 
-    for row in rows:
-        pid = row["product_id"]
-        final_price = None
-        paid_at = None
-        cancelled_at = None
-
-        # ------- PAYMENT ENRICHMENT -------
-        bid_resp = (
-            supabase.table("bid")
-            .select("bid_id")
-            .eq("product_id", pid)
-            .eq("bidder_id", x_user_id)
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        bids = bid_resp.data or []
-        if bids:
-            bid_id = bids[0]["bid_id"]
-
-            pay_resp = (
-                supabase.table("payment")
-                .select("amount, payment_time")
-                .eq("bid_id", bid_id)
-                .order("payment_time", desc=True)
-                .limit(1)
-                .execute()
-            )
-            pays = pay_resp.data or []
-            if pays:
-                final_price = pays[0]["amount"]
-                paid_at = pays[0]["payment_time"]
-
-        # fallback
-        if final_price is None:
-            final_price = row.get("start_price")
-        if paid_at is None:
-            paid_at = row.get("end_time")
-
-        # ------- DELIVERY (for refund) -------
-        if row.get("status_id") == 6:
-            d = (
-                supabase.table("delivery")
-                .select("received_date")
-                .eq("product_id", pid)
-                .eq("delivery_status", "Refund")
-                .order("received_date", desc=True)
-                .limit(1)
-                .execute()
-            )
-            dd = d.data or []
-            if dd:
-                cancelled_at = dd[0]["received_date"]
-
-        row["final_price"] = final_price
-        row["paid_at"] = paid_at
-        row["cancelled_at"] = cancelled_at
-
-        enriched.append(row)
-
-    return [_to_dto(r) for r in enriched]
+    return FastJSONResponse([_to_order(r) for r in _enrich_orders(supabase, rows, x_user_id)])
 
 
 # -----------------------------------------------------
@@ -146,9 +178,7 @@ def receive_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-I
     # verify owner
     base = (
         supabase.table("product")
-        .select(
-            "product_id, product_name, start_price, end_time, winner_id, status_id, product_img"
-        )
+        .select(ORDER_COLUMNS)
         .eq("product_id", pid)
         .single()
         .execute()
@@ -163,6 +193,8 @@ def receive_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-I
 
     # update status delivered
     supabase.table("product").update({"status_id": 9}).eq("product_id", pid).execute()
+    invalidate_seller_totals(product_search.set_status(pid, 9))
+    state_versions.bump(WINNERS)
 
     # insert delivery
     supabase.table("delivery").insert(
@@ -174,14 +206,9 @@ def receive_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-I
         }
     ).execute()
 
-    # return enriched object
-    all_orders = list_orders(status="completed", x_user_id=x_user_id)
-    for o in all_orders:
-        if o.productId == pid:
-            o.status = "received"
-            return o
-
-    return _to_dto(product)
+    # return enriched object (แค่ order นี้ ไม่ต้องโหลดประวัติทั้งหมด)
+    product["status_id"] = 9
+    return _build_order(supabase, product, x_user_id)
 
 
 # -----------------------------------------------------
@@ -194,9 +221,7 @@ def refund_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-Id
 
     base = (
         supabase.table("product")
-        .select(
-            "product_id, product_name, start_price, end_time, winner_id, status_id, product_img"
-        )
+        .select(ORDER_COLUMNS)
         .eq("product_id", pid)
         .single()
         .execute()
@@ -210,6 +235,8 @@ def refund_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-Id
         raise HTTPException(403, "Not your order")
 
     supabase.table("product").update({"status_id": 6}).eq("product_id", pid).execute()
+    invalidate_seller_totals(product_search.set_status(pid, 6))
+    state_versions.bump(WINNERS)
 
     supabase.table("delivery").insert(
         {
@@ -220,10 +247,5 @@ def refund_order(product_id: UUID, x_user_id: str = Header(..., alias="X-User-Id
         }
     ).execute()
 
-    all_refund = list_orders(status="cancelled", x_user_id=x_user_id)
-    for o in all_refund:
-        if o.productId == pid:
-            o.status = "refunded"
-            return o
-
-    return _to_dto(product)
+    product["status_id"] = 6
+    return _build_order(supabase, product, x_user_id)
@@ -1,12 +1,19 @@
 import uuid
 import base64
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Header
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Header, Request
 from app.Service.db_connection import get_supabase_client
+from app.Service.db_async import run_db
+from app.Service.Auction.auction_scheduler import auction_scheduler
+from app.Service.response_cache import slot_cache, invalidate_seller_totals
+from app.Service.Images.image_upload import store_uploads
+from app.Service.Search.product_search import product_search
+from app.Service.state_versions import state_versions, CATALOG
+from app.Service.reference_data import reference_data
+from app.Service.http_cache import cached_json
 
 router = APIRouter(prefix="/api/seller", tags=["Product"])
 
-CATEGORY_TABLE = "category"
 PRODUCT_TABLE = "product"
 
 
@@ -27,12 +34,9 @@ def _normalize_to_timestamp_no_tz(iso_str: str) -> str:
 
 
 @router.get("/categories")
-def get_categories():
-    supabase = get_supabase_client()
-    res = supabase.table(CATEGORY_TABLE).select("category_id, category_name").order("category_id").execute()
-    if getattr(res, "error", None):
-        raise HTTPException(status_code=500, detail=str(res.error))
-    return res.data
+def get_categories(request: Request):
+    data, etag = reference_data.snapshot("seller")
+    return cached_json(request, data["categories"], etag=etag, max_age=60)
 
 
 @router.get("/products/check-slot")
@@ -68,7 +72,9 @@ async def create_product(
     product_id = str(uuid.uuid4())
 
     # --- 1) get verify_img from users ---
-    user_q = supabase.table("users").select("verify_img").eq("user_id", user_id).single().execute()
+    user_q = await run_db(
+        lambda: supabase.table("users").select("verify_img").eq("user_id", user_id).single().execute()
+    )
     if getattr(user_q, "error", None):
         raise HTTPException(500, detail="Could not read user profile")
     verify_img = (user_q.data or {}).get("verify_img")
@@ -84,34 +90,16 @@ async def create_product(
         end_key = (dt_start + timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S")
 
     # --- 3) duplicate guard ---
-    dup = supabase.table(PRODUCT_TABLE).select("product_id", count="exact").eq("start_time", start_key).execute()
+    dup = await run_db(
+        lambda: supabase.table(PRODUCT_TABLE).select("product_id", count="exact").eq("start_time", start_key).execute()
+    )
     if getattr(dup, "error", None):
         raise HTTPException(500, detail="Failed to validate slot")
     if (dup.count or 0) > 0:
         raise HTTPException(status_code=409, detail="A product with this start_time already exists")
 
-    # --- 4) แปลงรูปเป็น hex string สำหรับ Supabase bytea ---
-    def _to_hex(file: UploadFile | None):
-        """แปลงไฟล์เป็น hex string สำหรับเก็บใน bytea column"""
-        if not file:
-            return None
-        try:
-            data = file.file.read()
-            if not data:
-                return None
-            # ส่งเป็น hex string สำหรับ Supabase bytea
-            return "\\x" + data.hex()
-        except Exception as e:
-            print(f"Error reading file: {e}")
-            return None
-
-    imgs = [
-        _to_hex(product_img1),
-        _to_hex(product_img2),
-        _to_hex(product_img3),
-        _to_hex(product_img4),
-        _to_hex(product_img5)
-    ]
+    # --- 4) stream รูปลง image store ทีละ chunk, ใน row เก็บแค่ hash ---
+    imgs = await store_uploads([product_img1, product_img2, product_img3, product_img4, product_img5])
 
     # --- 5) insert ---
     record = {
@@ -131,8 +119,15 @@ async def create_product(
         "status_id": status_id,
     }
 
-    ins = supabase.table(PRODUCT_TABLE).insert(record).execute()
+    ins = await run_db(lambda: supabase.table(PRODUCT_TABLE).insert(record).execute())
     if getattr(ins, "error", None):
         raise HTTPException(status_code=500, detail=str(ins.error))
 
+    # --- 6) ให้ scheduler รู้ทันที ไม่ต้องรอ resync ---
+    auction_scheduler.schedule_product(product_id, start_key, end_key, status_id)
+    slot_cache.invalidate()
+    state_versions.bump(CATALOG)
+    invalidate_seller_totals({user_id})
+    product_search.upsert(record)
+
     return {"ok": True, "product_id": product_id, "message": "Product created successfully"}
\ No newline at end of file
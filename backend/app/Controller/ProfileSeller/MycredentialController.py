@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Header, status, UploadFile, File
 from app.Model.ProfileSeller.MyCredentialModel import PasswordChangeIn
 from app.Service.db_connection import get_supabase_client
+from app.Service.db_async import run_db
 
 router = APIRouter(prefix="/api/seller", tags=["MyCredential"])
 
@@ -77,8 +78,8 @@ async def upload_verify_image(
     # base64 encode for bytea via JSON
     b64 = base64.b64encode(data).decode("utf-8")
 
-    upd = (
-        supabase.table("users")
+    upd = await run_db(
+        lambda: supabase.table("users")
         .update({"verify_img": b64})
         .eq("user_id", user_id)
         .execute()
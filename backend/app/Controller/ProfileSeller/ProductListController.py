@@ -1,5 +1,13 @@
+from typing import List, Optional
 from fastapi import APIRouter, Header, Query, HTTPException
+from pydantic import BaseModel
 from app.Service.db_connection import get_supabase_client
+from app.Service.Images.image_store import parse_ref, image_url
+from app.Service.Images.legacy_images import decode_legacy_image, image_version, decoded_images
+from app.Service.pagination import keyset_after_desc, encode_cursor, decode_cursor
+from app.Service.Search.product_search import product_search
+from app.Service.response_cache import seller_totals
+from app.Service.fast_json import FastJSONResponse
 import base64
 
 router = APIRouter(prefix="/api/seller", tags=["Seller Product List"])
@@ -9,105 +17,142 @@ PRODUCT_TABLE = "product"
 
 def _hex_to_base64(hex_str: str) -> str | None:
     """แปลง hex string จาก Supabase bytea เป็น base64 สำหรับ frontend"""
-    if not hex_str or not isinstance(hex_str, str):
-        return None
-    
-    try:
-        # ลบ prefix \\x หรือ \x
-        clean = hex_str
-        if clean.startswith("\\\\x"):
-            clean = clean[3:]
-        elif clean.startswith("\\x"):
-            clean = clean[2:]
-        elif clean.startswith("0x"):
-            clean = clean[2:]
-        
-        # แปลง hex เป็น bytes
-        img_bytes = bytes.fromhex(clean)
-        
-        # เช็คว่าเป็นรูปภาพจริงหรือไม่ (JPEG, PNG, GIF, WEBP)
-        is_jpeg = img_bytes[:3] == b'\xff\xd8\xff'
-        is_png = img_bytes[:8] == b'\x89PNG\r\n\x1a\n'
-        is_gif = img_bytes[:3] == b'GIF'
-        is_webp = img_bytes[:4] == b'RIFF' and img_bytes[8:12] == b'WEBP'
-        
-        if is_jpeg or is_png or is_gif or is_webp:
-            # เป็นรูปภาพจริง - แปลงเป็น base64
-            return base64.b64encode(img_bytes).decode("utf-8")
-        
-        # ไม่ใช่รูปภาพ - อาจเป็น base64 string ที่ถูกเก็บเป็น bytes (double encoded)
-        # ลอง decode เป็น string แล้วเช็คว่าเป็น base64 ของรูปหรือไม่
-        try:
-            maybe_b64 = img_bytes.decode("utf-8")
-            
-            # เช็คว่าเป็น base64 ของรูปจริงไหม
-            if maybe_b64.startswith("/9j/"):  # JPEG
-                return maybe_b64
-            if maybe_b64.startswith("iVBOR"):  # PNG
-                return maybe_b64
-            if maybe_b64.startswith("R0lG"):   # GIF
-                return maybe_b64
-            if maybe_b64.startswith("UklG"):   # WEBP
-                return maybe_b64
-            
-            # ลอง decode base64 อีกรอบ (triple encoded case)
-            decoded = base64.b64decode(maybe_b64)
-            is_jpeg2 = decoded[:3] == b'\xff\xd8\xff'
-            is_png2 = decoded[:8] == b'\x89PNG\r\n\x1a\n'
-            is_gif2 = decoded[:3] == b'GIF'
-            is_webp2 = decoded[:4] == b'RIFF' and decoded[8:12] == b'WEBP'
-            
-            if is_jpeg2 or is_png2 or is_gif2 or is_webp2:
-                # เป็น double encoded - return base64 ที่ถูกต้อง
-                return base64.b64encode(decoded).decode("utf-8")
-            
-        except Exception:
-            pass
-        
-        # ไม่สามารถแปลงได้ - return None
-        return None
-        
-    except Exception as e:
-        print(f"Error converting hex to base64: {e}")
+    img_bytes = decode_legacy_image(hex_str)
+    if img_bytes is None:
         return None
+    return base64.b64encode(img_bytes).decode("utf-8")
+
+
+LIST_COLUMNS = "product_id, product_name, product_desc, product_cat_id, start_price, start_time, end_time, status_id, product_img"
+
+
+# Response shape (docs only: the page goes out through FastJSONResponse)
+class SellerProductOut(BaseModel):
+    product_id: str
+    product_name: Optional[str] = None
+    product_desc: Optional[str] = None
+    product_cat_id: Optional[int] = None
+    start_price: Optional[float] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    status_id: Optional[int] = None
+    # image URL, or base64 for images not yet in the image store
+    product_img: Optional[str] = None
+
+
+class SellerProductPage(BaseModel):
+    items: List[SellerProductOut]
+    total: Optional[int] = None
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+
+def _filtered(query, user_id: str, status_id: int | None):
+    query = query.eq("seller_id", user_id)
+    if status_id is not None:
+        query = query.eq("status_id", status_id)
+    return query
+
+
+def _count_products(user_id: str, status_id: int | None) -> int:
+    # count แยกจากหน้า list และ cache ไว้ ไม่ต้อง count ทุกครั้งที่เปลี่ยนหน้า
+    def load():
+        res = _filtered(
+            get_supabase_client().table(PRODUCT_TABLE).select("product_id", count="exact", head=True),
+            user_id, status_id,
+        ).execute()
+        return res.count or 0
+
+    return seller_totals.get_or_load((user_id, status_id), load)
+
+
+def _with_images(rows: list[dict]) -> list[dict]:
+    # รูปใหม่อยู่ใน image store -> ส่ง URL, รูปเก่ายังเป็น hex -> แปลงเป็น base64 (cache ไว้)
+    items = []
+    for item in rows:
+        img = item.get("product_img")
+        if img and parse_ref(img):
+            item["product_img"] = image_url(img, "thumb")
+        elif img:
+            item["product_img"] = decoded_images.get_or_decode(
+                (item["product_id"], image_version(img)),
+                lambda: _hex_to_base64(img),
+            )
+        items.append(item)
+    return items
+
+
+def _search_products(user_id, status_id, search, page, page_size, cursor) -> FastJSONResponse:
+    """Ranked search through the trigram index; the cursor is a rank offset."""
+    ranked = product_search.search(search, seller_id=user_id, status_id=status_id)
+    offset = decode_cursor(cursor, 2)[1] if cursor else (page - 1) * page_size
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(400, detail="Invalid cursor")
+    page_ids = ranked[offset:offset + page_size]
+
+    rows = []
+    if page_ids:
+        res = (
+            get_supabase_client().table(PRODUCT_TABLE)
+            .select(LIST_COLUMNS)
+            .in_("product_id", page_ids)
+            .execute()
+        )
+        by_id = {r["product_id"]: r for r in (res.data or [])}
+        rows = [by_id[pid] for pid in page_ids if pid in by_id]
+
+    has_more = offset + page_size < len(ranked)
+    return FastJSONResponse({
+        "items": _with_images(rows),
+        "total": len(ranked),
+        "has_more": has_more,
+        "next_cursor": encode_cursor("rank", offset + page_size) if has_more else None,
+    })
 
 
-@router.get("/products")
+@router.get("/products", response_class=FastJSONResponse, responses={200: {"model": SellerProductPage}})
 def list_products(
     user_id: str = Header(..., alias="X-User-Id"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     search: str | None = None,
-    status_id: int | None = Query(None, ge=1)
+    status_id: int | None = Query(None, ge=1),
+    cursor: str | None = None,
+    include_total: bool = True,
 ):
-    supabase = get_supabase_client()
-
-    q = supabase.table(PRODUCT_TABLE).select(
-        "product_id, product_name, product_desc, product_cat_id, start_price, start_time, end_time, status_id, product_img",
-        count="exact"
-    ).eq("seller_id", user_id)
+    """
+    Keyset pagination on (start_time, product_id), newest first.
+    Pass `next_cursor` from the previous response as `cursor` to get the
+    next page. `page` without a cursor still works (offset) for old clients.
+    `total` comes from a short-lived cached count; skip it with include_total=false.
+    With `search`, results come ranked from the in-process search index.
+    """
+    if search and search.strip():
+        return _search_products(user_id, status_id, search, page, page_size, cursor)
 
-    if status_id is not None:
-        q = q.eq("status_id", status_id)
-    if search:
-        like = f"%{search}%"
-        q = q.or_(f"product_name.ilike.{like},product_desc.ilike.{like}")
+    supabase = get_supabase_client()
 
-    q = q.order("start_time", desc=True)
+    q = _filtered(supabase.table(PRODUCT_TABLE).select(LIST_COLUMNS), user_id, status_id)
+    q = keyset_after_desc(q, "start_time", "product_id", cursor)
 
-    from_idx = (page - 1) * page_size
-    to_idx = from_idx + page_size - 1
-    res = q.range(from_idx, to_idx).execute()
+    # ขอเกินมา 1 แถวเพื่อรู้ว่ามีหน้าถัดไปไหม
+    if cursor or page == 1:
+        res = q.limit(page_size + 1).execute()
+    else:
+        from_idx = (page - 1) * page_size
+        res = q.range(from_idx, from_idx + page_size).execute()
 
     if getattr(res, "error", None):
         raise HTTPException(500, detail=str(res.error))
 
-    # แปลง product_img จาก hex เป็น base64
-    items = []
-    for item in (res.data or []):
-        img = item.get("product_img")
-        if img:
-            item["product_img"] = _hex_to_base64(img)
-        items.append(item)
+    rows = res.data or []
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
 
-    return {"items": items, "total": res.count or 0}
\ No newline at end of file
+    last = rows[-1] if rows else None
+    return FastJSONResponse({
+        "items": _with_images(rows),
+        "total": _count_products(user_id, status_id) if include_total else None,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(last["start_time"], last["product_id"]) if has_more else None,
+    })
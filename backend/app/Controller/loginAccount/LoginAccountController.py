@@ -1,11 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
 from app.Model.User import UserLogin, LoginResponse, UserResponse, EditUserProfileRequest
-import sys
-import os
-
-# เพิ่ม path สำหรับ import Service
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from Service.auth_service import AuthService
+from app.Service.auth_service import AuthService
 
 router = APIRouter(
     prefix="/api/users",
@@ -1,7 +1,10 @@
 # backend/app/Model/Bidding/BiddingModel.py
 
-from app.Service.db_connection import supabase
-from uuid import uuid4
+from app.Service.db_connection import get_supabase_client
+from app.Service.Bidding.order_book import order_books, parse_since, BadCursor
+from app.Service.Bidding.bid_store import bid_store
+from app.Service.single_flight import single_flight
+from app.Service.Images.image_store import image_url
 from datetime import datetime
 
 
@@ -12,51 +15,69 @@ class BiddingModel:
     # ======================================================
     @staticmethod
     def get_product(product_id: str):
-        res = (
-            supabase.table("product")
+        # viewers opening the same auction share one query
+        res = single_flight.do(f"bids:product:{product_id}", lambda: (
+            get_supabase_client().table("product")
             .select(
                 "product_id, product_name, product_desc, product_img, product_cat_id, "
-                "seller_id, start_price, start_time, end_time"
+                "seller_id, start_price, start_time, end_time, status_id"
             )
             .eq("product_id", product_id)
             .limit(1)
             .execute()
-        )
+        ))
         data = res.data or []
-        return data[0] if data else None
+        if not data:
+            return None
+        # copy: the row is shared with every coalesced caller
+        product = dict(data[0])
+        product["product_img"] = image_url(product.get("product_img"))
+        return product
 
     @staticmethod
     def get_product_start_price(product_id: str) -> float:
-        res = (
-            supabase.table("product")
+        book = order_books.get(product_id)
+        if book:
+            return book.start_price
+
+        res = single_flight.do(f"bids:start_price:{product_id}", lambda: (
+            get_supabase_client().table("product")
             .select("start_price")
             .eq("product_id", product_id)
             .limit(1)
             .execute()
-        )
+        ))
         data = res.data or []
         return float((data[0] or {}).get("start_price", 0)) if data else 0.0
 
     # ======================================================
-    # BIDS
+    # BIDS (served from the live order book while bidding)
     # ======================================================
     @staticmethod
     def get_highest_bid(product_id: str):
-        res = (
-            supabase.table("bid")
+        book = order_books.get(product_id)
+        if book:
+            return book.highest()
+
+        res = single_flight.do(f"bids:highest:{product_id}", lambda: (
+            get_supabase_client().table("bid")
             .select("bid_id, bidder_id, bid_amount, created_at")
             .eq("product_id", product_id)
             .order("bid_amount", desc=True)
             .limit(1)
             .execute()
-        )
+        ))
         data = res.data or []
-        return data[0] if data else None
+        return dict(data[0]) if data else None
 
     @staticmethod
     def get_latest_bid(product_id: str):
+        book = order_books.get(product_id)
+        if book:
+            return book.latest_bid_id()
+
         res = (
-            supabase.table("bid")
+            get_supabase_client().table("bid")
             .select("bid_id")
             .eq("product_id", product_id)
             .order("created_at", desc=True)
@@ -68,8 +89,12 @@ class BiddingModel:
 
     @staticmethod
     def get_all_bids(product_id: str):
+        book = order_books.get(product_id)
+        if book:
+            return book.all_bids()
+
         res = (
-            supabase.table("bid")
+            get_supabase_client().table("bid")
             .select("bid_id, bidder_id, bid_amount, created_at")
             .eq("product_id", product_id)
             .order("bid_amount", desc=True)
@@ -77,44 +102,97 @@ class BiddingModel:
         )
         return res.data or []
 
+    @staticmethod
+    def count_bids(product_id: str) -> int:
+        book = order_books.get(product_id)
+        if book:
+            return book.total_bids()
+
+        res = (
+            get_supabase_client().table("bid")
+            .select("bid_id", count="exact")
+            .eq("product_id", product_id)
+            .limit(1)
+            .execute()
+        )
+        return res.count or 0
+
+    @staticmethod
+    def get_bids_since(product_id: str, since_bid_id: str | None = None, since: str | None = None):
+        """
+        Bids newer than the cursor, oldest first.
+        Cursor is either the last bid_id the client has (exact keyset on
+        (created_at, bid_id)) or a created_at timestamp. Both paths raise
+        BadCursor for a malformed `since` or a bid_id of another product.
+        """
+        since_ts = parse_since(since) if since else None
+
+        book = order_books.get(product_id)
+        if book:
+            return book.bids_since(since_bid_id=since_bid_id, since=since_ts)
+
+        q = (
+            get_supabase_client().table("bid")
+            .select("bid_id, bidder_id, bid_amount, created_at")
+            .eq("product_id", product_id)
+        )
+        anchor = None
+        if since_bid_id:
+            cur = (
+                get_supabase_client().table("bid")
+                .select("created_at")
+                .eq("bid_id", since_bid_id)
+                .eq("product_id", product_id)
+                .limit(1)
+                .execute()
+            )
+            data = cur.data or []
+            if not data:
+                raise BadCursor(f"Unknown since_bid_id {since_bid_id} for this product")
+            anchor = data[0]["created_at"]
+            # >= so bids sharing the cursor's timestamp are not lost;
+            # the ones at or before the cursor itself are dropped below
+            q = q.gte("created_at", anchor)
+        elif since_ts:
+            q = q.gt("created_at", since_ts.isoformat())
+
+        rows = q.order("created_at", desc=False).order("bid_id", desc=False).execute().data or []
+        if anchor is not None:
+            rows = [r for r in rows if r["created_at"] != anchor or r["bid_id"] > since_bid_id]
+        return rows
+
     # ======================================================
     # INSERT BID (WITH VALIDATION + UPDATE PRODUCT CURRENT PRICE)
     # ======================================================
     @staticmethod
     def insert_bid(product_id: str, bidder_id: str, bid_amount: float):
 
-        # 1️⃣ Validate product exists
-        product = BiddingModel.get_product(product_id)
-        if not product:
+        # 0️⃣ Live auction -> the in-memory order book is authoritative
+        book = order_books.get(product_id)
+        if book:
+            return book.place(bidder_id, bid_amount)
+
+        # 1️⃣ Check + insert + bump current price in one atomic server-side call
+        result = bid_store.place_bid(product_id, bidder_id, bid_amount)
+        status = result.get("status")
+
+        if status == "not_found":
             return {"error": "Product not found"}
 
-        # 2️⃣ Get highest current bid
-        highest = BiddingModel.get_highest_bid(product_id)
-        current_price = highest["bid_amount"] if highest else product["start_price"]
-
-        # 3️⃣ Reject invalid bid
-        if bid_amount <= current_price:
-            return {"error": f"Bid too low. Must be > {current_price}"}
-
-        # 4️⃣ Insert bid
-        bid_id = str(uuid4())
-        payload = {
-            "bid_id": bid_id,
-            "product_id": product_id,
-            "bidder_id": bidder_id,
-            "bid_amount": bid_amount,
-        }
+        if status == "closed":
+            return {"error": "Auction is closed"}
 
-        supabase.table("bid").insert(payload).execute()
+        if status == "rejected":
+            return {"error": f"Bid too low. Must be > {result.get('current_price')}"}
 
-        # 5️⃣ Update product current_price
-        supabase.table("product").update(
-            {"start_price": bid_amount}
-        ).eq("product_id", product_id).execute()
+        # 2️⃣ Already bidding but book not loaded yet (e.g. after a restart):
+        # load it now (it picks up this bid) so the next bids stay in memory
+        if result.get("status_id") == 8:
+            order_books.open(product_id)
 
         return {
             "status": "success",
             "message": "Bid placed successfully",
-            "bid": payload,
-            "new_price": bid_amount,
+            "bid": result["bid"],
+            "new_price": float(result["current_price"]),
         }
@@ -1,11 +1,8 @@
 import hashlib
 import uuid
-from Service.db_connection import get_supabase_client
+from app.Service.db_connection import get_supabase_client
 from datetime import datetime, timezone
 
-# Get the Supabase client instance
-supabase = get_supabase_client()
-
 def hash_md5(password: str) -> str:
     """Hashes a string using MD5 and returns the hexadecimal digest."""
     return hashlib.md5(password.encode('utf-8')).hexdigest()
@@ -21,6 +18,8 @@ def create_new_user(
     """
     Inserts a new user record into the 'users' table in Supabase.
     """
+    supabase = get_supabase_client()
+
     # 1. Check if user already exists (by email)
     existing_user_response = supabase.table('users').select('user_id').eq('user_email', email).execute()
     
@@ -0,0 +1,28 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+# Card shape shared by ExploreProduct.jsx and ComingUp.jsx.
+# Documents the response only; the rows are built as plain dicts by the
+# Home services and sent with FastJSONResponse (no per-row validation).
+class ProductCard(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    startPrice: float = 0
+    image: str
+    timeLeft: int = 0
+
+    # active | expired
+    status: str = "active"
+    views: int = 0
+    likes: int = 0
+    auctionId: Optional[str] = None
+    listedBy: Optional[str] = None
+    category: str = "Uncategorized"
+    description: str = ""
+    condition: str = ""
+    currentBid: float = 0
+    totalBids: int = 0
+
+    # explore | coming_up
+    source: str
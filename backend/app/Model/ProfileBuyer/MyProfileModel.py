@@ -1,8 +1,6 @@
-from Service.db_connection import get_supabase_client
+from app.Service.db_connection import get_supabase_client
 from datetime import datetime
-
-# Initialize Supabase client
-supabase = get_supabase_client()
+from app.Service.Users.user_names import user_names
 
 def update_buyer_profile(
     user_id: str,
@@ -17,6 +15,7 @@ def update_buyer_profile(
     """
     Updates a buyer's profile data in the 'users' table.
     """
+    supabase = get_supabase_client()
 
     try:
         # 1. Check if the user exists
@@ -41,6 +40,7 @@ def update_buyer_profile(
 
         # 3. Execute the update
         response = supabase.table("users").update(update_data).eq("user_id", user_id).execute()
+        user_names.invalidate(user_id)
 
         if response.data and len(response.data) > 0:
             return {
@@ -0,0 +1,151 @@
+# backend/app/Service/Auction/auction_lifecycle.py
+
+import threading
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.Bidding.order_book import order_books
+from app.Service.Bidding.bid_store import bid_store
+from app.Service.response_cache import slot_cache, invalidate_seller_totals
+from app.Service.Search.product_search import product_search
+from app.Service.state_versions import state_versions, CATALOG, WINNERS
+from app.Service.Auction.winner_feed import winner_feed
+
+STATUS_VERIFIED = 2
+STATUS_BIDDING = 8
+STATUS_COMPLETED = 4
+# statuses an auction can still be finalized from
+OPEN_STATUSES = (STATUS_VERIFIED, STATUS_BIDDING)
+
+# finalize() result["status"]
+FINALIZED = "finalized"
+ALREADY_FINALIZED = "already_finalized"
+NOT_FOUND = "not_found"
+
+# Striped locks: a fixed pool shared by hash, so memory stays bounded no
+# matter how many auctions get finalized (unrelated products rarely collide,
+# and a collision only serialises two finalizes)
+FINALIZE_LOCK_STRIPES = 64
+_finalize_locks = [threading.Lock() for _ in range(FINALIZE_LOCK_STRIPES)]
+
+
+def promote(product_ids: list[str]) -> list[str]:
+    """
+    2 -> 8 for all given products in one bulk UPDATE.
+    The status guard makes it exactly-once: only rows still at 2 change,
+    and only the caller that changed them opens their order books.
+    """
+    if not product_ids:
+        return []
+
+    res = (
+        get_supabase_client().table("product")
+        .update({"status_id": STATUS_BIDDING})
+        .in_("product_id", product_ids)
+        .eq("status_id", STATUS_VERIFIED)
+        .execute()
+    )
+    promoted = [r["product_id"] for r in (res.data or [])]
+    if promoted:
+        slot_cache.invalidate()
+        state_versions.bump(CATALOG)
+        invalidate_seller_totals(product_search.set_status(promoted, STATUS_BIDDING))
+    for pid in promoted:
+        print(f"⚡ Promoting Product: {pid}")
+        order_books.open(pid)
+    return promoted
+
+
+def _finalize_lock(product_id: str) -> threading.Lock:
+    return _finalize_locks[hash(product_id) % FINALIZE_LOCK_STRIPES]
+
+
+def get_status(product_id: str) -> dict | None:
+    """Cheap status read used by the public finalize endpoint."""
+    res = (
+        get_supabase_client().table("product")
+        .select("product_id, status_id, winner_id, final_price, start_price, end_time")
+        .eq("product_id", product_id)
+        .limit(1)
+        .execute()
+    )
+    data = res.data or []
+    return data[0] if data else None
+
+
+def finalized_result(product: dict) -> dict:
+    return {
+        "status": ALREADY_FINALIZED,
+        "message": "Auction already finalized",
+        "product_id": product.get("product_id"),
+        "winner_id": product.get("winner_id"),
+        "final_price": product.get("final_price"),
+    }
+
+
+def finalize(product_id: str) -> dict:
+    """
+    8 -> 4: close bidding and record the winner and final price.
+
+    Idempotent: concurrent triggers in this process serialise on the
+    product's lock stripe, and the UPDATE only applies while the product is
+    still open, so across workers exactly one caller records the result.
+    The winner comes from the live order book when it is loaded.
+    """
+    with _finalize_lock(product_id):
+        product = get_status(product_id)
+        if not product:
+            print(f"❌ Product {product_id} not found")
+            return {"status": NOT_FOUND, "message": "Product not found", "product_id": product_id}
+
+        if product.get("status_id") not in OPEN_STATUSES:
+            return finalized_result(product)
+
+        print(f"🏁 [Finalize] Processing product: {product_id}")
+
+        # ปิดรับ bid ใน order book ก่อน เพื่อให้ bid สูงสุดนิ่ง
+        order_books.close(product_id)
+
+        # หา bid สูงสุด (ใช้ order book ถ้ามี เพราะ bid ล่าสุดอาจยังเขียนลง DB ไม่เสร็จ)
+        book = order_books.get(product_id)
+        if book:
+            highest = book.highest()
+        else:
+            highest = bid_store.max_bids([product_id]).get(product_id)
+
+        winner_id = highest.get("bidder_id") if highest else None
+        # ไม่มีคนประมูล -> เก็บราคาเริ่มต้นไว้เป็น final_price
+        final_price = highest.get("bid_amount") if highest else product.get("start_price")
+
+        updated = (
+            get_supabase_client().table("product")
+            .update({
+                "status_id": STATUS_COMPLETED,
+                "winner_id": winner_id,
+                "final_price": final_price,
+            })
+            .eq("product_id", product_id)
+            .in_("status_id", list(OPEN_STATUSES))
+            .execute()
+        )
+        if not updated.data:
+            # another worker got there first
+            return finalized_result(get_status(product_id) or product)
+        slot_cache.invalidate()
+        state_versions.bump(CATALOG, WINNERS)
+        invalidate_seller_totals(product_search.set_status(product_id, STATUS_COMPLETED))
+
+        if highest:
+            print(f"✅ Auction Won by {winner_id} at {final_price}")
+            winner_feed.record(product_id)
+            message = "Auction finalized with winner"
+        else:
+            print("tel: No bids found. Closing auction.")
+            message = "Auction finalized with no winner"
+
+        return {
+            "status": FINALIZED,
+            "message": message,
+            "product_id": product_id,
+            "winner_id": winner_id,
+            "final_price": final_price,
+        }
@@ -0,0 +1,156 @@
+# backend/app/Service/Auction/auction_scheduler.py
+
+import heapq
+import itertools
+import os
+import threading
+from datetime import datetime, timedelta
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.clock import get_now, parse_db_time, DB_TIME_FORMAT
+from app.Service.Auction import auction_lifecycle
+
+# How often the heap is re-synced with the product table
+RESYNC_SECONDS = int(os.getenv("AUCTION_RESYNC_SECONDS", "30"))
+# Only products starting within this window are loaded into the heap
+HORIZON_MINUTES = int(os.getenv("AUCTION_HORIZON_MINUTES", "15"))
+
+PROMOTE = "promote"
+FINALIZE = "finalize"
+
+
+class AuctionScheduler:
+    """
+    Drives the auction lifecycle from a timer heap keyed on
+    start_time / end_time instead of promoting on every homepage read.
+
+    - promote   2 -> 8 at start_time (one bulk UPDATE per instant)
+    - finalize  8 -> 4 at end_time
+
+    The heap is re-synced from the DB every RESYNC_SECONDS, and
+    `schedule_product` lets writers add a product immediately.
+    """
+
+    def __init__(self, resync_seconds: int = RESYNC_SECONDS):
+        self.resync_seconds = resync_seconds
+        self._heap: list[tuple[datetime, int, str, str]] = []
+        self._scheduled: set[tuple[str, str]] = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._next_resync: datetime | None = None
+
+    # ======================================================
+    # SCHEDULING
+    # ======================================================
+    def _push(self, when: datetime, action: str, product_id: str):
+        key = (action, product_id)
+        if key in self._scheduled:
+            return
+        self._scheduled.add(key)
+        heapq.heappush(self._heap, (when, next(self._seq), action, product_id))
+
+    def schedule_product(self, product_id: str, start_time: str | None, end_time: str | None, status_id: int):
+        start = parse_db_time(start_time)
+        end = parse_db_time(end_time)
+        with self._cond:
+            if status_id == auction_lifecycle.STATUS_VERIFIED and start:
+                self._push(start, PROMOTE, product_id)
+            if status_id in (auction_lifecycle.STATUS_VERIFIED, auction_lifecycle.STATUS_BIDDING) and end:
+                self._push(end, FINALIZE, product_id)
+            self._cond.notify()
+
+    def resync(self):
+        now = get_now()
+        horizon = (now + timedelta(minutes=HORIZON_MINUTES)).strftime(DB_TIME_FORMAT)
+        supabase = get_supabase_client()
+
+        upcoming = (
+            supabase.table("product")
+            .select("product_id, start_time, end_time, status_id")
+            .eq("status_id", auction_lifecycle.STATUS_VERIFIED)
+            .lte("start_time", horizon)
+            .execute()
+        )
+        live = (
+            supabase.table("product")
+            .select("product_id, start_time, end_time, status_id")
+            .eq("status_id", auction_lifecycle.STATUS_BIDDING)
+            .execute()
+        )
+        for row in (upcoming.data or []) + (live.data or []):
+            self.schedule_product(
+                row["product_id"], row.get("start_time"), row.get("end_time"), row.get("status_id")
+            )
+
+    # ======================================================
+    # TIMER LOOP
+    # ======================================================
+    def _pop_due(self, now: datetime) -> list[tuple[str, str]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, action, product_id = heapq.heappop(self._heap)
+            self._scheduled.discard((action, product_id))
+            due.append((action, product_id))
+        return due
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                now = get_now()
+                if self._next_resync is None or now >= self._next_resync:
+                    due = None
+                else:
+                    due = self._pop_due(now)
+                    if not due:
+                        wake_at = self._next_resync
+                        if self._heap and self._heap[0][0] < wake_at:
+                            wake_at = self._heap[0][0]
+                        self._cond.wait(max(0.05, (wake_at - now).total_seconds()))
+                        continue
+
+            if due is None:
+                self._safe(self.resync)
+                self._next_resync = get_now() + timedelta(seconds=self.resync_seconds)
+                continue
+
+            self._fire(due)
+
+    def _fire(self, due: list[tuple[str, str]]):
+        to_promote = [pid for action, pid in due if action == PROMOTE]
+        if to_promote:
+            self._safe(auction_lifecycle.promote, to_promote)
+        for action, pid in due:
+            if action == FINALIZE:
+                self._safe(auction_lifecycle.finalize, pid)
+
+    @staticmethod
+    def _safe(fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            print(f"🔥 [AuctionScheduler] {fn.__name__}{args} failed: {e}")
+            return None
+
+    # ======================================================
+    # START / STOP
+    # ======================================================
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="auction-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+auction_scheduler = AuctionScheduler()
@@ -0,0 +1,121 @@
+# backend/app/Service/Auction/winner_feed.py
+
+import os
+import threading
+from collections import deque
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.Images.image_store import parse_ref
+from app.Service.Users.user_names import user_names
+
+# How many finalized auctions to keep in memory
+RECENT_WINNERS_SIZE = int(os.getenv("RECENT_WINNERS_SIZE", "100"))
+# Re-read from the DB this often, to include auctions finalized by other workers
+RECENT_WINNERS_REFRESH_SECONDS = float(os.getenv("RECENT_WINNERS_REFRESH_SECONDS", "60"))
+
+_PRODUCT_COLUMNS = "product_id, product_name, product_img, winner_id, final_price, end_time"
+
+
+def _entry(product: dict, winner_name: str | None) -> dict:
+    img = product.get("product_img")
+    return {
+        "product_id": product.get("product_id"),
+        "product_name": product.get("product_name"),
+        # เก็บแค่ reference ของ image store (รูป legacy แบบ hex ใหญ่เกินจะเก็บใน memory)
+        "image_ref": img if parse_ref(img) else None,
+        "winner_id": product.get("winner_id"),
+        "winner_name": winner_name,
+        "final_price": product.get("final_price"),
+        "ended_at": product.get("end_time"),
+    }
+
+
+class WinnerFeed:
+    """
+    Bounded ring buffer of recent auction results (newest first).
+
+    Appended by auction_lifecycle.finalize, warmed from the DB at startup
+    and refreshed in the background, so /api/winners/ is served from
+    memory without touching the DB.
+    """
+
+    def __init__(self, size: int = RECENT_WINNERS_SIZE):
+        self._entries: deque[dict] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        with self._lock:
+            return [dict(e) for e in list(self._entries)[:limit]]
+
+    def record(self, product_id: str):
+        """Add a just-finalized auction (one product + one user lookup, off the read path)."""
+        if self._contains(product_id):
+            return
+        try:
+            res = (
+                get_supabase_client().table("product")
+                .select(_PRODUCT_COLUMNS)
+                .eq("product_id", product_id)
+                .limit(1)
+                .execute()
+            )
+            rows = res.data or []
+            if not rows or not rows[0].get("winner_id"):
+                return
+            product = rows[0]
+            entry = _entry(product, user_names.resolve(product["winner_id"]))
+        except Exception as e:
+            print(f"⚠️ Winner feed: could not record {product_id}: {e}")
+            return
+
+        with self._lock:
+            if not any(e["product_id"] == product_id for e in self._entries):
+                self._entries.appendleft(entry)
+
+    def _contains(self, product_id: str) -> bool:
+        with self._lock:
+            return any(e["product_id"] == product_id for e in self._entries)
+
+    def warm(self):
+        """Replace the buffer with the latest finalized auctions from the DB."""
+        res = (
+            get_supabase_client().table("product")
+            .select(_PRODUCT_COLUMNS)
+            .in_("status_id", [4, 9, 6])
+            .not_.is_("winner_id", "null")
+            .order("end_time", desc=True)
+            .limit(self._entries.maxlen)
+            .execute()
+        )
+        rows = res.data or []
+        names = user_names.resolve_many(r["winner_id"] for r in rows)
+        entries = [_entry(r, names.get(r["winner_id"])) for r in rows]
+        with self._lock:
+            self._entries.clear()
+            self._entries.extend(entries)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.warm()
+            except Exception as e:
+                print(f"⚠️ Winner feed refresh failed: {e}")
+            self._stop.wait(RECENT_WINNERS_REFRESH_SECONDS)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="winner-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+winner_feed = WinnerFeed()
@@ -0,0 +1,126 @@
+# backend/app/Service/Bidding/bid_store.py
+
+import os
+import threading
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.Service.db_connection import get_supabase_client
+
+# product.status_id values that still accept bids (verified, bidding)
+BIDDABLE_STATUSES = (2, 8)
+
+# Result shape shared by every store:
+#   {"status": "accepted", "bid": {...}, "current_price": x, "status_id": n}
+#   {"status": "rejected", "current_price": x, "status_id": n}
+#   {"status": "closed", "status_id": n}      (auction not open for bids)
+#   {"status": "not_found"}
+#
+# max_bids(product_ids) -> {product_id: {"bid_amount", "bidder_id", "total_bids"}}
+# (products without bids are absent)
+
+
+class SupabaseBidStore:
+    """
+    Atomic bid placement through the `place_bid` Postgres function
+    (see backend/sql/place_bid.sql). One network round trip per bid.
+    """
+
+    def place_bid(self, product_id: str, bidder_id: str, bid_amount: float) -> dict:
+        res = get_supabase_client().rpc(
+            "place_bid",
+            {
+                "p_product_id": product_id,
+                "p_bidder_id": bidder_id,
+                "p_bid_amount": bid_amount,
+            },
+        ).execute()
+        return res.data or {"status": "not_found"}
+
+    def max_bids(self, product_ids: list[str]) -> dict[str, dict]:
+        """Highest bid per product via the `max_bids` function (sql/max_bids.sql)."""
+        if not product_ids:
+            return {}
+        res = get_supabase_client().rpc("max_bids", {"p_product_ids": product_ids}).execute()
+        return {str(r["product_id"]): r for r in (res.data or [])}
+
+
+class LocalBidStore:
+    """
+    In-process stand-in for `place_bid` with the same semantics,
+    so bid placement can be exercised offline without Supabase.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._products: dict[str, dict] = {}
+        self.bids: list[dict] = []
+
+    def add_product(self, product_id: str, start_price: float, status_id: int = 8):
+        with self._lock:
+            self._products[product_id] = {
+                "start_price": float(start_price),
+                "status_id": status_id,
+            }
+
+    def place_bid(self, product_id: str, bidder_id: str, bid_amount: float) -> dict:
+        with self._lock:
+            product = self._products.get(product_id)
+            if product is None:
+                return {"status": "not_found"}
+            if product["status_id"] not in BIDDABLE_STATUSES:
+                return {"status": "closed", "status_id": product["status_id"]}
+
+            current = product["start_price"]
+            if bid_amount <= current:
+                return {
+                    "status": "rejected",
+                    "current_price": current,
+                    "status_id": product["status_id"],
+                }
+
+            bid = {
+                "bid_id": str(uuid4()),
+                "product_id": product_id,
+                "bidder_id": bidder_id,
+                "bid_amount": bid_amount,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self.bids.append(bid)
+            product["start_price"] = bid_amount
+            return {
+                "status": "accepted",
+                "bid": bid,
+                "current_price": bid_amount,
+                "status_id": product["status_id"],
+            }
+
+    def max_bids(self, product_ids: list[str]) -> dict[str, dict]:
+        wanted = set(product_ids)
+        out: dict[str, dict] = {}
+        with self._lock:
+            for bid in self.bids:
+                pid = bid["product_id"]
+                if pid not in wanted:
+                    continue
+                best = out.get(pid)
+                if best is None:
+                    out[pid] = {"product_id": pid, "bid_amount": bid["bid_amount"],
+                                "bidder_id": bid["bidder_id"], "total_bids": 1}
+                    continue
+                best["total_bids"] += 1
+                # ราคาเท่ากัน -> คนที่ bid ก่อนชนะ (เหมือน order by created_at asc)
+                if bid["bid_amount"] > best["bid_amount"]:
+                    best["bid_amount"] = bid["bid_amount"]
+                    best["bidder_id"] = bid["bidder_id"]
+        return out
+
+
+def _make_store():
+    # BID_STORE=local -> offline stand-in (tests / local dev without Supabase)
+    if os.getenv("BID_STORE", "").lower() == "local":
+        return LocalBidStore()
+    return SupabaseBidStore()
+
+
+bid_store = _make_store()
@@ -0,0 +1,61 @@
+# backend/app/Service/Bidding/bid_stream.py
+
+import asyncio
+import threading
+
+# Per-subscriber buffer; a slow client loses its oldest events, not the server
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class BidStream:
+    """
+    Fan-out hub for accepted bids.
+
+    Every open stream connection subscribes to one product and receives each
+    accepted bid once, so the number of viewers no longer multiplies DB
+    queries. `publish` is thread-safe and can be called from the sync
+    endpoints that FastAPI runs in its threadpool.
+    """
+
+    def __init__(self):
+        self._subs: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, product_id: str) -> asyncio.Queue:
+        """Must be called from the event loop that will read the queue."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), q)
+        with self._lock:
+            self._subs.setdefault(product_id, set()).add(entry)
+        return q
+
+    def unsubscribe(self, product_id: str, q: asyncio.Queue):
+        with self._lock:
+            subs = self._subs.get(product_id)
+            if not subs:
+                return
+            subs.difference_update({e for e in subs if e[1] is q})
+            if not subs:
+                self._subs.pop(product_id, None)
+
+    def subscriber_count(self, product_id: str) -> int:
+        return len(self._subs.get(product_id) or ())
+
+    def publish(self, product_id: str, event: dict):
+        with self._lock:
+            subs = list(self._subs.get(product_id) or ())
+        for loop, q in subs:
+            try:
+                loop.call_soon_threadsafe(_offer, q, event)
+            except RuntimeError:
+                # loop already closed (server shutting down)
+                pass
+
+
+def _offer(q: asyncio.Queue, event: dict):
+    if q.full():
+        q.get_nowait()
+    q.put_nowait(event)
+
+
+bid_stream = BidStream()
@@ -0,0 +1,213 @@
+# backend/app/Service/Bidding/bid_writer.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.Service.db_connection import get_supabase_client
+
+# Flush whichever comes first: every N ms, or once N rows are waiting
+FLUSH_INTERVAL_MS = int(os.getenv("BID_FLUSH_INTERVAL_MS", "5"))
+FLUSH_MAX_ROWS = int(os.getenv("BID_FLUSH_MAX_ROWS", "200"))
+# "async": accept as soon as the bid is queued
+# "durable": the bidder's request waits until the bid's batch is written
+WRITE_ACK = os.getenv("BID_WRITE_ACK", "async").lower()
+# Failed batches are retried (never dropped) with exponential backoff
+RETRY_BASE_MS = int(os.getenv("BID_RETRY_BASE_MS", "200"))
+RETRY_MAX_SECONDS = float(os.getenv("BID_RETRY_MAX_SECONDS", "30"))
+
+_STOP = object()
+
+
+class BidWriter:
+    """
+    Write-behind persistence for bids accepted by an in-memory order book.
+
+    Bids are queued and flushed on a background thread as one bulk insert
+    into `bid`, plus a single `product.start_price` update per product
+    carrying only the final price of that batch. Bursts of hundreds of
+    bids per second collapse into a handful of round trips.
+
+    The order book has already accepted and broadcast every queued bid, so
+    a failed write is never dropped: the batch is kept and retried with
+    exponential backoff, and acks only resolve once the rows are in the DB.
+    A retry batch tops up to at most `max_rows`; during a long outage the
+    rest stays in the queue (the backlog, see stats()), so each attempt
+    sends a bounded batch. Inserts ignore bid_ids that are already stored,
+    so a retry after a lost response is harmless.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        max_rows: int = FLUSH_MAX_ROWS,
+        durable: bool = WRITE_ACK == "durable",
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.durable = durable
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # batch waiting for its next attempt (writer thread only)
+        self._retry: list[tuple] = []
+        self.written_total = 0
+        self.failed_attempts = 0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="bid-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, bid: dict) -> Future:
+        """Queue a bid. The returned future resolves once it is in the DB."""
+        self._ensure_started()
+        ack: Future = Future()
+        self._queue.put((bid, ack))
+        return ack
+
+    def flush(self, timeout: float = 5.0):
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return
+        marker: Future = Future()
+        self._queue.put((None, marker))
+        marker.result(timeout=timeout)
+
+    # ======================================================
+    # BACKGROUND LOOP
+    # ======================================================
+    def _run(self):
+        stop = False
+        while not stop:
+            if self._retry:
+                # wait out the backoff, topping the batch up to max_rows with new bids
+                batch, self._retry = self._retry, []
+                deadline = time.monotonic() + self._backoff()
+                retrying = True
+            else:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                retrying = False
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if len(batch) >= self.max_rows:
+                    if retrying:
+                        # retry batch is full: sit out the backoff, new bids stay queued
+                        stop = self._stopping.wait(remaining)
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if item[0] is None and not retrying:
+                    # flush() marker: write what we have right away
+                    break
+
+            self._flush(batch)
+
+        # shutting down mid-outage: the failed batch plus whatever is still queued
+        unsaved = self._retry
+        self._retry = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                unsaved.append(item)
+        if unsaved:
+            lost = [bid for bid, _ in unsaved if bid is not None]
+            print(f"🔥 [BidWriter] Shutdown with {len(lost)} unsaved bids: {[b['bid_id'] for b in lost]}")
+            for bid, ack in unsaved:
+                ack.set_exception(RuntimeError(self.last_error or "bid writer stopped"))
+
+    def _backoff(self) -> float:
+        delay = RETRY_BASE_MS / 1000 * (2 ** max(0, self.consecutive_failures - 1))
+        return min(delay, RETRY_MAX_SECONDS)
+
+    def _flush(self, batch: list[tuple]):
+        rows = [bid for bid, _ in batch if bid is not None]
+        if rows:
+            try:
+                self._write(rows, self.max_rows)
+            except Exception as e:
+                self.failed_attempts += 1
+                self.consecutive_failures += 1
+                self.last_error = str(e)
+                self._retry = batch
+                print(
+                    f"🔥 [BidWriter] Failed to persist {len(rows)} bids "
+                    f"(attempt {self.consecutive_failures}, retry in {self._backoff():.1f}s): {e}"
+                )
+                return
+
+            if self.consecutive_failures:
+                print(f"✅ [BidWriter] Recovered after {self.consecutive_failures} failed attempts")
+            self.consecutive_failures = 0
+            self.written_total += len(rows)
+
+        for _, ack in batch:
+            ack.set_result(True)
+
+    @staticmethod
+    def _write(rows: list[dict], chunk: int = FLUSH_MAX_ROWS):
+        supabase = get_supabase_client()
+        for start in range(0, len(rows), chunk):
+            supabase.table("bid").upsert(
+                rows[start:start + chunk], on_conflict="bid_id", ignore_duplicates=True
+            ).execute()
+
+        # only the final price per product matters
+        final_price: dict[str, float] = {}
+        for bid in rows:
+            pid = bid["product_id"]
+            if bid["bid_amount"] > final_price.get(pid, float("-inf")):
+                final_price[pid] = bid["bid_amount"]
+
+        for pid, price in final_price.items():
+            supabase.table("product").update(
+                {"start_price": price}
+            ).eq("product_id", pid).execute()
+
+    def stats(self) -> dict:
+        pending_retry = sum(1 for bid, _ in list(self._retry) if bid is not None)
+        return {
+            "mode": "durable" if self.durable else "async",
+            "queued": self._queue.qsize(),
+            "pending_retry": pending_retry,
+            "written_total": self.written_total,
+            "failed_attempts": self.failed_attempts,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush pending writes and stop the background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._stopping.set()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+bid_writer = BidWriter()
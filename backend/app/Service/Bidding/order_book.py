@@ -0,0 +1,269 @@
+# backend/app/Service/Bidding/order_book.py
+
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.Bidding.bid_writer import bid_writer
+
+# How long a caller waits for the actor to answer before giving up
+PLACE_TIMEOUT_SECONDS = 2.0
+# Closed books stay readable for a while so reads don't race the bid writer
+MAX_CLOSED_BOOKS = 16
+
+
+class OrderBook:
+    """
+    Authoritative in-memory order book for one live auction.
+
+    All writes go through a single actor thread (one per auction), so bids
+    are validated and accepted in strict arrival order without any DB round
+    trip. Because every accepted bid must beat the current price, the bid
+    list is always sorted by amount and by time at once.
+
+    Reads never touch the actor: they look at the last published state.
+    """
+
+    def __init__(self, product_id: str, start_price: float, bids: list[dict], persist=None):
+        self.product_id = product_id
+        self.start_price = float(start_price or 0)
+        # ascending by bid_amount == ascending by created_at
+        self._bids: list[dict] = list(bids)
+        # bid_id -> position in _bids, for cursor reads
+        self._index: dict[str, int] = {b["bid_id"]: i for i, b in enumerate(self._bids)}
+        self._persist = persist or bid_writer.submit
+        # bid_ids accepted here but not yet confirmed written by the bid writer
+        self._unconfirmed: set[str] = set()
+        self.closed = False
+
+        self._inbox: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name=f"order-book-{product_id[:8]}", daemon=True
+        )
+        self._thread.start()
+
+    # ======================================================
+    # ACTOR LOOP
+    # ======================================================
+    def _run(self):
+        while True:
+            fn, args, fut = self._inbox.get()
+            if fn is None:
+                fut.set_result(None)
+                return
+            try:
+                fut.set_result(fn(*args))
+            except Exception as e:
+                fut.set_exception(e)
+
+    def _call(self, fn, *args, timeout: float = PLACE_TIMEOUT_SECONDS):
+        fut: Future = Future()
+        self._inbox.put((fn, args, fut))
+        return fut.result(timeout=timeout)
+
+    # ======================================================
+    # WRITES (actor thread only)
+    # ======================================================
+    def _accept(self, bidder_id: str, bid_amount: float):
+        if self.closed:
+            return {"error": "Auction is closed"}
+
+        current_price = self.current_price()
+        if bid_amount <= current_price:
+            return {"error": f"Bid too low. Must be > {current_price}"}
+
+        bid = {
+            "bid_id": str(uuid4()),
+            "product_id": self.product_id,
+            "bidder_id": bidder_id,
+            "bid_amount": bid_amount,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._index[bid["bid_id"]] = len(self._bids)
+        self._bids.append(bid)
+        ack = self._persist(bid)
+        if ack is not None and not ack.done():
+            self._unconfirmed.add(bid["bid_id"])
+            ack.add_done_callback(lambda f, bid_id=bid["bid_id"]: self._confirm(bid_id, f))
+
+        return {
+            "_ack": ack,
+            "status": "success",
+            "message": "Bid placed successfully",
+            "bid": bid,
+            "new_price": bid_amount,
+            "total_bids": len(self._bids),
+        }
+
+    def _confirm(self, bid_id: str, ack: Future):
+        # runs on the bid writer thread once the bid's batch is settled
+        if ack.exception() is None:
+            self._unconfirmed.discard(bid_id)
+
+    def _close(self):
+        self.closed = True
+
+    def place(self, bidder_id: str, bid_amount: float) -> dict:
+        result = self._call(self._accept, bidder_id, bid_amount)
+        ack = result.pop("_ack", None)
+        # durable mode: answer only after the bid's batch hit the DB
+        # (waited on here, outside the actor, so other bids keep flowing)
+        if ack is not None and bid_writer.durable:
+            try:
+                ack.result(timeout=PLACE_TIMEOUT_SECONDS)
+                result["persisted"] = True
+            except Exception:
+                # the book already holds (and broadcast) this bid and the writer
+                # keeps retrying it, so report it as accepted-but-unconfirmed, not 500
+                result["persisted"] = False
+                result["message"] = "Bid accepted; saving to the database is delayed"
+        return result
+
+    def close(self):
+        """Stop accepting bids. Reads keep working."""
+        if not self.closed:
+            self._call(self._close)
+
+    def stop(self):
+        """Shut the actor thread down once the book is evicted."""
+        if self._thread.is_alive():
+            self._call(None)
+
+    # ======================================================
+    # READS (any thread)
+    # ======================================================
+    def current_price(self) -> float:
+        bids = self._bids
+        return float(bids[-1]["bid_amount"]) if bids else self.start_price
+
+    def highest(self) -> dict | None:
+        bids = self._bids
+        return dict(bids[-1]) if bids else None
+
+    def latest_bid_id(self) -> str | None:
+        bids = self._bids
+        return bids[-1]["bid_id"] if bids else None
+
+    def total_bids(self) -> int:
+        return len(self._bids)
+
+    def unconfirmed_bids(self) -> int:
+        return len(self._unconfirmed)
+
+    def all_bids(self) -> list[dict]:
+        # same shape and order as the bid table query (bid_amount desc)
+        return [_public(b) for b in reversed(self._bids)]
+
+    def bids_since(self, since_bid_id: str | None = None, since: datetime | None = None) -> list[dict]:
+        """
+        Bids accepted after the cursor, oldest first. Raises BadCursor for
+        a bid_id this auction never had (rather than resending everything).
+        """
+        bids = self._bids
+        if since_bid_id is not None:
+            pos = self._index.get(since_bid_id)
+            if pos is None:
+                raise BadCursor(f"Unknown since_bid_id {since_bid_id} for this product")
+            return [_public(b) for b in bids[pos + 1:]]
+        if since is not None:
+            return [_public(b) for b in bids if parse_timestamp(b.get("created_at")) > since]
+        return [_public(b) for b in bids]
+
+
+def _public(bid: dict) -> dict:
+    return {k: bid.get(k) for k in ("bid_id", "bidder_id", "bid_amount", "created_at")}
+
+
+class BadCursor(ValueError):
+    """A bids-delta cursor (since_bid_id / since) that cannot be resolved."""
+
+
+def parse_since(value: str) -> datetime:
+    """Strict parse of a `since` cursor (naive = UTC); BadCursor instead of guessing."""
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        raise BadCursor(f"Invalid since timestamp: {value!r}")
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        try:
+            ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return datetime.min.replace(tzinfo=timezone.utc)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+class OrderBookRegistry:
+    """Process-wide map of product_id -> OrderBook."""
+
+    def __init__(self):
+        self._books: dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+
+    def get(self, product_id: str) -> OrderBook | None:
+        return self._books.get(product_id)
+
+    def open(self, product_id: str, product: dict | None = None) -> OrderBook | None:
+        """
+        Load the book for a product that just went live (status 8).
+        Safe to call more than once; the first caller loads it.
+        """
+        book = self._books.get(product_id)
+        if book is not None and not book.closed:
+            return book
+
+        with self._lock:
+            book = self._books.get(product_id)
+            if book is not None and not book.closed:
+                return book
+
+            supabase = get_supabase_client()
+            if product is None:
+                res = (
+                    supabase.table("product")
+                    .select("product_id, start_price")
+                    .eq("product_id", product_id)
+                    .limit(1)
+                    .execute()
+                )
+                data = res.data or []
+                if not data:
+                    return None
+                product = data[0]
+
+            bid_res = (
+                supabase.table("bid")
+                .select("bid_id, bidder_id, bid_amount, created_at")
+                .eq("product_id", product_id)
+                .order("bid_amount", desc=False)
+                .execute()
+            )
+            bids = [dict(b, product_id=product_id) for b in (bid_res.data or [])]
+
+            book = OrderBook(product_id, product.get("start_price"), bids)
+            self._books[product_id] = book
+            self._evict_closed()
+            print(f"📖 [OrderBook] Opened book for {product_id} with {len(bids)} bids")
+            return book
+
+    def close(self, product_id: str) -> OrderBook | None:
+        book = self._books.get(product_id)
+        if book is not None:
+            book.close()
+        return book
+
+    def _evict_closed(self):
+        closed = [pid for pid, b in self._books.items() if b.closed]
+        for pid in closed[:-MAX_CLOSED_BOOKS]:
+            self._books.pop(pid).stop()
+
+
+order_books = OrderBookRegistry()
@@ -1,7 +1,10 @@
 from typing import List, Dict, Any, Optional
-from Service.db_connection import get_supabase_client
+from app.Service.db_connection import get_supabase_client
+from app.Service.Images.image_store import image_url
 
 PLACEHOLDER = "https://via.placeholder.com/300x300?text=No+Image"
+# Shown when the category table is empty or unreachable
+FALLBACK_CATEGORIES = ["Electronics", "Jewelry", "Collectibles", "Event tickets", "Memorabilia"]
 
 # Frontend (Categories.jsx) expects product items with fields:
 # - id          : product id (product_id)
@@ -33,28 +36,6 @@ def _compute_time_left(end_time_iso: Optional[str]) -> int:
     except Exception:
         return 0
 
-def get_categories() -> List[Dict[str, Any]]:
-    """
-    Return list of distinct categories (string list) from product table.
-    """
-    supabase = get_supabase_client()
-    try:
-        # PostgREST distinct select for category
-        resp = supabase.from_("product").select("category", count="exact", distinct="category").limit(100).execute()
-        rows = getattr(resp, "data", []) or []
-        # if category stored as array or null handle defensively
-        cats = []
-        for r in rows:
-            c = r.get("category")
-            if c and c not in cats:
-                cats.append(c)
-        if not cats:
-            # fallback sample categories
-            return ["Electronics", "Jewelry", "Collectibles", "Event tickets", "Memorabilia"]
-        return cats
-    except Exception:
-        return ["Electronics", "Jewelry", "Collectibles", "Event tickets", "Memorabilia"]
-
 def get_products_by_category(category: str, limit: int = 50, source: Optional[str] = None, onlyActive: bool = False) -> List[Dict[str, Any]]:
     """
     Returns products of a category mapped to the frontend shape.
@@ -86,7 +67,7 @@ def get_products_by_category(category: str, limit: int = 50, source: Optional[st
                 "id": r.get("product_id"),
                 "name": r.get("product_name") or r.get("name"),
                 "startPrice": r.get("start_price") or r.get("starting_price") or 0,
-                "image": r.get("product_img") or PLACEHOLDER,
+                "image": image_url(r.get("product_img"), "thumb") or PLACEHOLDER,
                 "timeLeft": time_left,
                 "status": r.get("status") or ("expired" if time_left <= 0 else "active"),
                 "views": r.get("views") or 0,
@@ -1,6 +1,7 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
-from Service.db_connection import get_supabase_client
+from app.Service.db_connection import get_supabase_client
+from app.Service.Images.image_store import image_url
 
 PLACEHOLDER = "https://via.placeholder.com/300x300?text=No+Image"
 
@@ -22,7 +23,7 @@ def _map_row_to_product(r: Dict[str, Any]) -> Dict[str, Any]:
         "id": r.get("product_id") or r.get("id"),
         "name": r.get("product_name") or r.get("name"),
         "startPrice": r.get("start_price") or r.get("starting_price") or 0,
-        "image": r.get("product_img") or r.get("product_image") or PLACEHOLDER,
+        "image": image_url(r.get("product_img"), "thumb") or r.get("product_image") or PLACEHOLDER,
         "timeLeft": time_left,
         "status": r.get("status") or ("expired" if time_left <= 0 else "active"),
         "views": r.get("views") or 0,
@@ -37,7 +38,11 @@ def _map_row_to_product(r: Dict[str, Any]) -> Dict[str, Any]:
         "source": r.get("source") or "explore"
     }
 
-def get_explore_products(limit: int = 50) -> List[Dict[str, Any]]:
+def load_explore_products(limit: int = 50) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    (explore cards, live). live is False when the cards are demo/error
+    placeholders (empty table or DB failure): callers must not cache those.
+    """
     supabase = get_supabase_client()
     try:
         select_cols = (
@@ -75,8 +80,8 @@ def get_explore_products(limit: int = 50) -> List[Dict[str, Any]]:
                     "totalBids": i % 7,
                     "source": "explore"
                 } for i in range(1, min(limit, 8) + 1)
-            ]
-        return result[:limit]
+            ], False
+        return result[:limit], True
     except Exception:
         return [
             {
@@ -97,4 +102,4 @@ def get_explore_products(limit: int = 50) -> List[Dict[str, Any]]:
                 "totalBids": 0,
                 "source": "explore"
             } for i in range(1, min(limit, 4) + 1)
-        ]
\ No newline at end of file
+        ], False
@@ -1,6 +1,7 @@
 # ...existing code...
 from typing import List, Dict, Any
-from Service.db_connection import get_supabase_client
+from app.Service.Auction.winner_feed import winner_feed
+from app.Service.Images.image_store import image_url
 
 SAMPLE_PLACEHOLDER = "https://via.placeholder.com/400x400?text=No+Image"
 SAMPLE_DATA = [
@@ -11,53 +12,31 @@ SAMPLE_DATA = [
 
 def get_recent_winners(limit: int = 20) -> List[Dict[str, Any]]:
     """
-    Use Supabase client "ORM-like" API (postgrest client) to join bid -> product.
-    Requirements:
-      - In Supabase the bid table must have a foreign key to product (e.g. bid.product_id -> product.product_id)
-      - The select uses relationship syntax: product:product(product_name,product_img)
+    Recent auction winners from the in-memory winner feed (no DB hit).
     Frontend fields returned:
-      - id (use bid_id)
+      - id (product id)
       - productId
       - productName
-      - imageUrl
-      - winnerId (bidder_id)
-      - finalPrice (bid_amount)
-      - bidTime
+      - imageUrl (thumbnail)
+      - winnerId
+      - winnerName
+      - finalPrice
+      - bidTime (auction end time)
     """
-    supabase = get_supabase_client()
-    try:
-        # select bid fields and related product fields via relationship syntax
-        resp = (
-            supabase.from_("bid")
-            .select("bid_id, product_id, bidder_id, bid_amount, bid_time, product:product(product_name, product_img)")
-            .order("bid_time", desc=True)
-            .limit(limit)
-            .execute()
-        )
-        
-        rows = getattr(resp, "data", None) or []
-        result = []
-        for r in rows:
-            # Supabase returns related rows as an array under the relationship key
-            product_arr = r.get("product") or []
-            product = product_arr[0] if isinstance(product_arr, list) and product_arr else {}
-            result.append({
-                "id": r.get("bid_id"),
-                "productId": r.get("product_id"),
-                "productName": product.get("product_name") or product.get("name") or None,
-                "imageUrl": product.get("product_img") or product.get("product_image") or SAMPLE_PLACEHOLDER,
-                "winnerId": r.get("bidder_id"),
-                "winnerName": None,  # optional: join users table or fetch separately to resolve bidder_id -> name
-                "finalPrice": r.get("bid_amount"),
-                "bidTime": r.get("bid_time"),
-            })
+    result = []
+    for w in winner_feed.recent(limit):
+        result.append({
+            "id": w["product_id"],
+            "productId": w["product_id"],
+            "productName": w["product_name"],
+            "imageUrl": image_url(w["image_ref"], "thumb") if w["image_ref"] else SAMPLE_PLACEHOLDER,
+            "winnerId": w["winner_id"],
+            "winnerName": w["winner_name"],
+            "finalPrice": w["final_price"],
+            "bidTime": w["ended_at"],
+        })
 
-        if not result:
-            return SAMPLE_DATA[:limit]
-
-        return result[:limit]
-
-    except Exception:
-        # on error return sample data so frontend stays usable
+    if not result:
         return SAMPLE_DATA[:limit]
-# ...existing code...
\ No newline at end of file
+    return result
+# ...existing code...
@@ -0,0 +1,134 @@
+# backend/app/Service/Images/image_blobs.py
+
+import os
+from contextlib import contextmanager
+
+import httpx
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.single_flight import single_flight
+from app.Service.Images.image_store import image_store, is_valid_hash, CHUNK_SIZE, ImageTooLarge
+
+# "storage" -> image bytes are kept in a private Supabase Storage bucket
+#              (sql/image_bucket.sql); the local image store is only a cache
+#              (default, needed on Render where the container disk is wiped
+#              on every deploy)
+# "none"    -> local store only; use just with a persistent volume (local dev,
+#              docker-compose) - a single volume is then the only copy
+IMAGE_DURABLE_STORE = os.getenv("IMAGE_DURABLE_STORE", "storage").lower()
+IMAGE_BUCKET = os.getenv("IMAGE_BUCKET", "images")
+# Largest object a restore will copy back (legacy images can exceed the upload limit)
+IMAGE_RESTORE_MAX_BYTES = int(os.getenv("IMAGE_RESTORE_MAX_MB", "50")) * 1024 * 1024
+SIGNED_URL_SECONDS = 60
+
+
+class DurableImageStoreError(Exception):
+    pass
+
+
+def object_path(digest: str) -> str:
+    return f"{digest[:2]}/{digest}"
+
+
+@contextmanager
+def _stream_get(url: str):
+    with httpx.stream("GET", url, timeout=30) as resp:
+        yield resp
+
+
+class _ChunkReader:
+    """File-like view of an iterator of byte chunks, for put_stream()."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        return next(self._chunks, b"")
+
+
+class StorageImageBlobs:
+    """
+    Source of truth for image bytes: one object per content hash in a
+    Supabase Storage bucket.
+
+    Uploads are copied there from the local store file before the
+    product/payment row gets the reference, and a local-store miss (fresh
+    container) is refilled from there on first read. Both directions
+    stream in CHUNK_SIZE pieces, so memory does not depend on image size.
+    """
+
+    def __init__(self, enabled: bool, bucket: str = IMAGE_BUCKET):
+        self.enabled = enabled
+        self.bucket = bucket
+        self.saved = 0
+        self.restored = 0
+        self.missing = 0
+
+    def _bucket(self):
+        return get_supabase_client().storage.from_(self.bucket)
+
+    def save_local(self, digest: str):
+        """
+        Copy an image already in the local store to the bucket, streamed
+        from disk. Raises DurableImageStoreError on failure.
+        """
+        if not self.enabled:
+            return
+        try:
+            content_type = image_store.content_type(digest)
+            with open(image_store.path_for(digest), "rb") as f:
+                # same hash = same bytes, so overwriting an existing object is harmless
+                self._bucket().upload(
+                    object_path(digest), f, {"content-type": content_type, "upsert": "true"}
+                )
+        except Exception as e:
+            raise DurableImageStoreError(f"Could not save image {digest}: {e}") from e
+        self.saved += 1
+
+    def ensure_local(self, digest: str) -> bool:
+        """True once the image is in the local store, restoring it if needed."""
+        if not is_valid_hash(digest):
+            return False
+        if image_store.exists(digest):
+            return True
+        if not self.enabled:
+            return False
+        # viewers of the same missing image share one download
+        return single_flight.do(f"images:restore:{digest}", lambda: self._restore(digest))
+
+    def _restore(self, digest: str) -> bool:
+        if image_store.exists(digest):
+            return True
+        try:
+            signed = self._bucket().create_signed_url(object_path(digest), SIGNED_URL_SECONDS)
+            with _stream_get(signed["signedURL"]) as resp:
+                if resp.status_code == 404:
+                    got = None
+                else:
+                    resp.raise_for_status()
+                    got, _ = image_store.put_stream(
+                        _ChunkReader(resp.iter_bytes(CHUNK_SIZE)), IMAGE_RESTORE_MAX_BYTES
+                    )
+        except ImageTooLarge:
+            got = None
+        except Exception as e:
+            print(f"⚠️ Image restore failed for {digest}: {e}")
+            return False
+        # put_stream files the bytes under their own hash: anything else is not our image
+        if got != digest:
+            self.missing += 1
+            return False
+        self.restored += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "durable_store": IMAGE_DURABLE_STORE,
+            "bucket": self.bucket,
+            "saved": self.saved,
+            "restored": self.restored,
+            "missing": self.missing,
+        }
+
+
+image_blobs = StorageImageBlobs(IMAGE_DURABLE_STORE == "storage")
@@ -0,0 +1,111 @@
+# backend/app/Service/Images/image_derivatives.py
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from app.Service.Images.image_store import image_store, write_atomic
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow ไม่ได้ติดตั้ง -> เสิร์ฟรูปต้นฉบับแทน
+    Image = None
+
+# Longest edge in pixels for each variant
+VARIANT_SIZES = {"thumb": 240, "medium": 960}
+JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "82"))
+# Resizing is CPU-bound: keep it in a few worker processes, not the web threads
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+# Jobs waiting beyond this are dropped; the variant is retried on first request
+IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", "64"))
+
+
+def render_derivatives(src_path: str, targets: dict[str, tuple[str, int]]) -> list[str]:
+    """
+    Runs in a worker process. Writes one JPEG per variant next to the
+    original; `targets` maps variant -> (output path, longest edge).
+    """
+    with Image.open(src_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        done = []
+        for variant, (out_path, edge) in targets.items():
+            copy = img.copy()
+            copy.thumbnail((edge, edge), Image.LANCZOS)
+            buf = BytesIO()
+            copy.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+            write_atomic(out_path, buf.getvalue())
+            done.append(variant)
+        return done
+
+
+class DerivativePipeline:
+    """
+    Generates thumbnail / medium copies of stored images in a bounded
+    process pool. `schedule()` returns immediately; uploads never wait
+    for resizing.
+    """
+
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return Image is not None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+        return self._executor
+
+    def schedule(self, digest: str) -> bool:
+        if not self.enabled or not image_store.exists(digest):
+            return False
+
+        targets = {
+            variant: (image_store.derivative_path(digest, variant), edge)
+            for variant, edge in VARIANT_SIZES.items()
+            if not image_store.has_derivative(digest, variant)
+        }
+        if not targets:
+            return False
+
+        with self._lock:
+            if digest in self._pending or len(self._pending) >= IMAGE_MAX_PENDING:
+                return False
+            self._pending.add(digest)
+            future = self._get_executor().submit(
+                render_derivatives, image_store.path_for(digest), targets
+            )
+
+        future.add_done_callback(lambda f: self._done(digest, f))
+        return True
+
+    def _done(self, digest: str, future):
+        with self._lock:
+            self._pending.discard(digest)
+        error = future.exception()
+        if error is not None:
+            print(f"❌ Image derivatives failed for {digest}: {error}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "enabled": self.enabled,
+            "workers": IMAGE_WORKERS,
+            "pending": pending,
+            "max_pending": IMAGE_MAX_PENDING,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+image_derivatives = DerivativePipeline()
@@ -0,0 +1,166 @@
+# backend/app/Service/Images/image_store.py
+
+import hashlib
+import os
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # app/
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", os.path.join(os.path.dirname(BASE_DIR), "image_store"))
+# Prefix for image URLs handed to the frontend, e.g. https://api.example.com
+IMAGE_PUBLIC_BASE_URL = os.getenv("IMAGE_PUBLIC_BASE_URL", "").rstrip("/")
+
+# What product/payment rows store instead of the image bytes
+REF_PREFIX = "sha256:"
+# The same prefix as PostgREST returns it when it sits in a bytea column
+_REF_PREFIX_HEX = "\\x" + REF_PREFIX.encode().hex()
+_HASH_LEN = 64
+# Read size for streamed uploads
+CHUNK_SIZE = 64 * 1024
+# Resized copies generated per original (see image_derivatives.py)
+VARIANTS = ("thumb", "medium")
+
+
+def sniff_content_type(head: bytes) -> str:
+    if head[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if head[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if head[:3] == b"GIF":
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class ImageTooLarge(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"Image exceeds {limit} bytes")
+        self.limit = limit
+
+
+def is_valid_hash(value: str) -> bool:
+    return len(value) == _HASH_LEN and all(c in "0123456789abcdef" for c in value)
+
+
+class LocalImageStore:
+    """
+    Content-addressed image store on the local filesystem.
+    Files live at <root>/<h[0:2]>/<h[2:4]>/<h>, so identical uploads
+    are stored once and a hash always names the same bytes.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def derivative_path(self, digest: str, variant: str) -> str:
+        return self.path_for(digest) + f".{variant}.jpg"
+
+    def exists(self, digest: str) -> bool:
+        return is_valid_hash(digest) and os.path.exists(self.path_for(digest))
+
+    def has_derivative(self, digest: str, variant: str) -> bool:
+        return os.path.exists(self.derivative_path(digest, variant))
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.exists(digest):
+            write_atomic(self.path_for(digest), data)
+        return digest
+
+    def put_stream(self, fileobj, max_bytes: int) -> tuple[str | None, int]:
+        """
+        Copy a file-like object into the store chunk by chunk, hashing as
+        it goes, so memory use does not depend on the image size.
+        Returns (hash, size); hash is None for an empty file.
+        Raises ImageTooLarge once more than `max_bytes` have been read.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := fileobj.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ImageTooLarge(max_bytes)
+                    hasher.update(chunk)
+                    out.write(chunk)
+
+            if size == 0:
+                os.remove(tmp)
+                return None, 0
+
+            digest = hasher.hexdigest()
+            path = self.path_for(digest)
+            if os.path.exists(path):
+                os.remove(tmp)  # same bytes already stored
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def content_type(self, digest: str) -> str:
+        with open(self.path_for(digest), "rb") as f:
+            return sniff_content_type(f.read(12))
+
+
+def write_atomic(path: str, data: bytes):
+    """Readers never see a half-written file: write aside, then rename."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+image_store = LocalImageStore(IMAGE_STORE_DIR)
+
+
+# ======================================================
+# ROW REFERENCES
+# ======================================================
+def to_ref(digest: str) -> str:
+    return REF_PREFIX + digest
+
+
+def parse_ref(value) -> str | None:
+    """Return the hash if `value` is an image-store reference, else None."""
+    if not isinstance(value, str):
+        return None
+    if value.startswith(REF_PREFIX):
+        digest = value[len(REF_PREFIX):]
+    elif value.startswith(_REF_PREFIX_HEX):
+        try:
+            digest = bytes.fromhex(value[2:]).decode("ascii")[len(REF_PREFIX):]
+        except ValueError:
+            return None
+    else:
+        return None
+    return digest if is_valid_hash(digest) else None
+
+
+def image_url(value, variant: str | None = None):
+    """
+    URL for a stored image reference; legacy inline images pass through
+    unchanged so old rows keep working. `variant` ("thumb" / "medium")
+    points at a resized copy instead of the original.
+    """
+    digest = parse_ref(value)
+    if digest is None:
+        return value
+    if variant:
+        return f"{IMAGE_PUBLIC_BASE_URL}/images/{digest}/{variant}"
+    return f"{IMAGE_PUBLIC_BASE_URL}/images/{digest}"
@@ -0,0 +1,74 @@
+# backend/app/Service/Images/image_upload.py
+
+import asyncio
+import os
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.Service.Images.image_store import image_store, to_ref, ImageTooLarge
+from app.Service.Images.image_derivatives import image_derivatives
+from app.Service.Images.image_blobs import image_blobs, DurableImageStoreError
+
+MAX_IMAGE_BYTES = int(os.getenv("UPLOAD_MAX_IMAGE_MB", "10")) * 1024 * 1024
+MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_MB", "30")) * 1024 * 1024
+# Uploads copied to the store at the same time (each holds one chunk buffer)
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+
+_upload_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+
+def exceeds_request_limit(content_length: str | None) -> bool:
+    """True when the declared body size is already over MAX_REQUEST_BYTES."""
+    # multipart framing adds a little on top of the images themselves
+    return bool(content_length and content_length.isdigit()
+                and int(content_length) > MAX_REQUEST_BYTES + 64 * 1024)
+
+
+async def store_uploads(files: list[UploadFile | None], derivatives: bool = True) -> list[str | None]:
+    """
+    Stream uploaded images into the image store and return a 'sha256:'
+    reference per file (None for missing/empty ones).
+
+    Each file is copied in CHUNK_SIZE pieces on a worker thread, so the
+    event loop is never blocked and memory stays flat whatever the image
+    size. Limits: MAX_IMAGE_BYTES per file, MAX_REQUEST_BYTES for all
+    files together (413 either way).
+
+    The stored file is then streamed, chunk by chunk as well, to the
+    durable store before the reference is returned, so no row ever points
+    at an image that only exists on this container's disk (503 if that
+    save fails). No step holds the whole image in memory.
+    """
+    refs: list[str | None] = []
+    remaining = MAX_REQUEST_BYTES
+
+    async with _upload_slots:
+        for file in files:
+            if not file:
+                refs.append(None)
+                continue
+
+            limit = min(MAX_IMAGE_BYTES, remaining)
+            try:
+                digest, size = await run_in_threadpool(image_store.put_stream, file.file, limit)
+            except ImageTooLarge:
+                if limit < MAX_IMAGE_BYTES:
+                    detail = f"Images exceed {MAX_REQUEST_BYTES // (1024 * 1024)} MB in total"
+                else:
+                    detail = f"{file.filename or 'Image'} exceeds {MAX_IMAGE_BYTES // (1024 * 1024)} MB"
+                raise HTTPException(status_code=413, detail=detail)
+
+            remaining -= size
+            if digest:
+                try:
+                    await run_in_threadpool(image_blobs.save_local, digest)
+                except DurableImageStoreError as e:
+                    print(f"❌ {e}")
+                    raise HTTPException(status_code=503, detail="Could not store image, please try again")
+            if digest and derivatives:
+                # thumbnail / medium ทำใน process pool ไม่ต้องรอ
+                image_derivatives.schedule(digest)
+            refs.append(to_ref(digest) if digest else None)
+
+    return refs
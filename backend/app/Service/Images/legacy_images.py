@@ -0,0 +1,256 @@
+# backend/app/Service/Images/legacy_images.py
+
+import base64
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.Images.image_store import image_store, to_ref, parse_ref, sniff_content_type
+from app.Service.Images.image_derivatives import image_derivatives
+from app.Service.Images.image_blobs import image_blobs, DurableImageStoreError
+
+# Budget for decoded (base64) legacy images kept in memory
+DECODED_CACHE_MB = int(os.getenv("IMAGE_DECODED_CACHE_MB", "64"))
+# Rows per page while normalising; legacy rows can be several MB each
+NORMALIZE_PAGE_SIZE = int(os.getenv("IMAGE_NORMALIZE_PAGE_SIZE", "20"))
+
+# table -> (primary key, image columns)
+IMAGE_COLUMNS = {
+    "product": ("product_id", ["product_img", "product_img2", "product_img3", "product_img4", "product_img5"]),
+    "payment": ("payment_id", ["payment_slip"]),
+}
+
+
+def _is_image(data: bytes) -> bool:
+    return sniff_content_type(data[:12]) != "application/octet-stream"
+
+
+def decode_legacy_image(value: str) -> bytes | None:
+    """
+    Raw image bytes from a legacy bytea value. Handles the encodings that
+    ended up in the DB over time: plain hex, hex of a base64 string
+    (double encoded) and hex of base64 of base64 (triple encoded).
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    # ลบ prefix \\x หรือ \x
+    clean = value
+    if clean.startswith("\\\\x"):
+        clean = clean[3:]
+    elif clean.startswith("\\x") or clean.startswith("0x"):
+        clean = clean[2:]
+
+    try:
+        data = bytes.fromhex(clean)
+    except ValueError:
+        return None
+
+    for _ in range(3):
+        if _is_image(data):
+            return data
+        # ไม่ใช่รูปภาพ - อาจเป็น base64 string ที่ถูกเก็บเป็น bytes
+        try:
+            data = base64.b64decode(data.decode("ascii"), validate=False)
+        except Exception:
+            return None
+    return None
+
+
+def image_version(value: str) -> str:
+    """
+    Cheap fingerprint of a stored image value: changes whenever the image
+    does, without hashing megabytes of hex on every read.
+    """
+    return f"{len(value)}:{value[-32:]}"
+
+
+class DecodedImageCache:
+    """
+    LRU of decoded legacy images keyed by (product_id, image version),
+    bounded by total size. Seller lists hit the same rows page after page,
+    so the hex/base64 work is done once per image instead of per request.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, str | None]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_decode(self, key: tuple, decode):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        value = decode()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self._size += len(value or "")
+                while self._size > self.max_bytes and self._entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted or "")
+        return value
+
+    def invalidate(self, product_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == product_id]:
+                self._size -= len(self._entries.pop(key) or "")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+decoded_images = DecodedImageCache(DECODED_CACHE_MB * 1024 * 1024)
+
+
+# ======================================================
+# BATCH NORMALISATION
+# ======================================================
+class ImageNormalizer:
+    """
+    One-off background job that moves legacy inline images (hex, double
+    and triple encoded) into the image store and rewrites the row to a
+    'sha256:' reference. Safe to re-run: rows already holding a reference
+    are skipped. Progress is readable while it runs.
+
+    The bytea value is the only copy of a legacy image, so a row is only
+    rewritten after every one of its images is confirmed in the durable
+    store (Storage bucket); without a durable store the job refuses to run.
+    """
+
+    def __init__(self):
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._progress = self._empty_progress("idle")
+
+    @staticmethod
+    def _empty_progress(status: str) -> dict:
+        return {
+            "status": status,
+            "table": None,
+            "rows_scanned": 0,
+            "images_converted": 0,
+            "images_already_canonical": 0,
+            "images_undecodable": 0,
+            "rows_failed": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+
+    def progress(self) -> dict:
+        with self._lock:
+            return dict(self._progress)
+
+    def _bump(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                self._progress[name] += n
+
+    @staticmethod
+    def refusal() -> str | None:
+        """Why the job must not run here, or None when it may."""
+        if not image_blobs.enabled:
+            return "No durable image store configured (IMAGE_DURABLE_STORE=storage); refusing to replace legacy images"
+        return None
+
+    def start(self) -> bool:
+        if self.refusal():
+            return False
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._progress = self._empty_progress("running")
+            self._progress["started_at"] = datetime.now().isoformat()
+            self._thread = threading.Thread(target=self._run, name="image-normalizer", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        try:
+            for table, (pk, columns) in IMAGE_COLUMNS.items():
+                with self._lock:
+                    self._progress["table"] = table
+                self._normalize_table(table, pk, columns)
+            status, error = "done", None
+        except Exception as e:
+            print(f"❌ Image normalisation stopped: {e}")
+            status, error = "failed", str(e)
+        with self._lock:
+            self._progress["status"] = status
+            self._progress["error"] = error
+            self._progress["finished_at"] = datetime.now().isoformat()
+        print(f"🖼️ Image normalisation {status}: {self.progress()}")
+
+    def _normalize_table(self, table: str, pk: str, columns: list[str]):
+        supabase = get_supabase_client()
+        offset = 0
+        while True:
+            res = (
+                supabase.table(table)
+                .select(", ".join([pk] + columns))
+                .order(pk)
+                .range(offset, offset + NORMALIZE_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = res.data or []
+            for row in rows:
+                self._normalize_row(supabase, table, pk, columns, row)
+            if len(rows) < NORMALIZE_PAGE_SIZE:
+                return
+            offset += NORMALIZE_PAGE_SIZE
+
+    def _normalize_row(self, supabase, table: str, pk: str, columns: list[str], row: dict):
+        update = {}
+        for col in columns:
+            value = row.get(col)
+            if not value:
+                continue
+            if parse_ref(value):
+                self._bump(images_already_canonical=1)
+                continue
+            data = decode_legacy_image(value)
+            if data is None:
+                self._bump(images_undecodable=1)
+                continue
+            digest = image_store.put(data)
+            try:
+                image_blobs.save_local(digest)
+            except DurableImageStoreError as e:
+                # keep the original bytea untouched until the bytes are safe
+                print(f"❌ Normalising {table} {row[pk]} skipped: {e}")
+                self._bump(rows_failed=1, rows_scanned=1)
+                return
+            image_derivatives.schedule(digest)
+            update[col] = to_ref(digest)
+
+        if update:
+            try:
+                supabase.table(table).update(update).eq(pk, row[pk]).execute()
+                self._bump(images_converted=len(update))
+                if table == "product":
+                    decoded_images.invalidate(row[pk])
+            except Exception as e:
+                print(f"❌ Normalising {table} {row[pk]} failed: {e}")
+                self._bump(rows_failed=1)
+        self._bump(rows_scanned=1)
+
+
+image_normalizer = ImageNormalizer()
@@ -1,13 +1,38 @@
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Request
 from pydantic import BaseModel
 from app.Service.db_connection import get_supabase_client, run_sql
+from app.Service.Images.image_store import image_url
+from app.Service.Images.legacy_images import image_normalizer
+from app.Service.http_cache import cached_json
+from app.Service.fast_json import FastJSONResponse
+from app.Service.reference_data import reference_data, ROLES, ROLE_CODES
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 class RoleUpdateIn(BaseModel):
     role: str
 
-@router.get("/users")
+class AdminUserOut(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: str = ""
+    created_at: Optional[str] = None
+
+class AdminProductStatusOut(BaseModel):
+    id: str
+    name: Optional[str] = None
+    price: Optional[float] = None
+    status_id: Optional[int] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    product_img: Optional[str] = None
+
+class AdminProductStatusList(BaseModel):
+    items: List[AdminProductStatusOut]
+
+@router.get("/users", response_class=FastJSONResponse, responses={200: {"model": List[AdminUserOut]}})
 def list_users():
     try:
         db_resp = run_sql("SELECT user_id, user_name, user_email, role_id, created_at FROM users ORDER BY user_name")
@@ -19,12 +44,6 @@ def list_users():
         # 2. actual row data
         rows = db_resp.get("rows", [])
 
-        ROLE_MAP = {
-            1: "admin",
-            2: "seller",
-            3: "buyer",
-        }
-
         result = []
         for r in rows:
             print("User row:", r)
@@ -32,13 +51,13 @@ def list_users():
                 "user_id": r.get("user_id"),
                 "name": r.get("user_name"),
                 "email": r.get("user_email"),
-                "role": ROLE_MAP.get(r.get("role_id"), ""),
+                "role": ROLES.get(r.get("role_id"), ""),
                 "created_at": r.get("created_at"),
             }
             result.append(user)
 
         result.sort(key=lambda u: (u["name"] or "").lower())
-        return result
+        return FastJSONResponse(result)
 
     except Exception as e:
         print("ERROR in /admin/users:", e)
@@ -50,16 +69,10 @@ def list_users():
 def update_role(user_id: str, body: RoleUpdateIn):
     try:
         new_role_text = body.role
-        ALLOWED = {"admin", "seller", "buyer"}
-        if new_role_text not in ALLOWED:
+        if new_role_text not in ROLE_CODES:
             raise HTTPException(status_code=400, detail="Invalid role")
 
-        ROLE_CODE_MAP = {
-            "admin": 1,
-            "seller": 2,
-            "buyer": 3,
-        }
-        role_code = ROLE_CODE_MAP[new_role_text]
+        role_code = ROLE_CODES[new_role_text]
 
         sql = f"UPDATE users SET role_id = {role_code} WHERE user_id = '{user_id}'"
         result = run_sql(sql)
@@ -91,7 +104,7 @@ def delete_user(user_id: str):
         print("ERROR in delete_user:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/products/status-list")
+@router.get("/products/status-list", response_class=FastJSONResponse, responses={200: {"model": AdminProductStatusList}})
 def admin_product_status_list():
     """
     Return a list of products with their status for the Admin screen.
@@ -122,12 +135,65 @@ def admin_product_status_list():
                     "status_id": row.get("status_id"),
                     "start_time": row.get("start_time"),
                     "end_time": row.get("end_time"),
-                    "product_img": row.get("product_img"),
+                    "product_img": image_url(row.get("product_img"), "thumb"),
                 }
             )
 
-        return {"items": items}
+        return FastJSONResponse({"items": items})
 
     except Exception as e:
         print("ERROR in admin_product_status_list:", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _require_admin(user_id: str):
+    res = (
+        get_supabase_client().table("users")
+        .select("role_id")
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+    )
+    rows = res.data or []
+    if not rows or rows[0].get("role_id") != ROLE_CODES["admin"]:
+        raise HTTPException(status_code=403, detail="Admin only")
+
+
+@router.post("/images/normalize")
+def start_image_normalization(x_user_id: str = Header(..., alias="X-User-Id")):
+    """
+    Start the background job that moves legacy hex/base64 images into the
+    image store. Poll GET /admin/images/normalize for progress.
+    Admin only, and refused (409) unless a durable image store is configured,
+    because the job replaces the only copy of each legacy image.
+    """
+    _require_admin(x_user_id)
+    refusal = image_normalizer.refusal()
+    if refusal:
+        raise HTTPException(status_code=409, detail=refusal)
+    started = image_normalizer.start()
+    return {"started": started, "progress": image_normalizer.progress()}
+
+
+@router.get("/images/normalize")
+def image_normalization_progress():
+    return image_normalizer.progress()
+
+
+
+@router.get("/reference-data")
+def get_reference_data(request: Request):
+    """Categories, statuses and roles as served from memory."""
+    data, etag = reference_data.snapshot()
+    return cached_json(request, data, etag=etag)
+
+
+@router.post("/reference-data/refresh")
+def refresh_reference_data(x_user_id: str = Header(..., alias="X-User-Id")):
+    """
+    Reload reference data now (e.g. after editing the category table).
+    Admin only: every call costs a DB reload.
+    """
+    _require_admin(x_user_id)
+    reference_data.bump()
+    return {"ok": True, "etag": reference_data.snapshot()[1]}
\ No newline at end of file
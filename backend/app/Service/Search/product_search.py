@@ -0,0 +1,237 @@
+# backend/app/Service/Search/product_search.py
+
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from app.Service.db_connection import get_supabase_client
+
+# Full reload from the DB after this long, to pick up writes made by other workers
+SEARCH_REBUILD_SECONDS = float(os.getenv("SEARCH_REBUILD_SECONDS", "300"))
+# A fuzzy match needs at least this share of the query's trigrams
+# (products containing the query as a substring always match, like ILIKE)
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.5"))
+LOAD_PAGE_SIZE = 1000
+
+# matches in the name count more than matches in the description
+NAME_WEIGHT = 2.0
+DESC_WEIGHT = 1.0
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str | None) -> str:
+    return _SPACES.sub(" ", (text or "").lower()).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Character trigrams per word, padded like pg_trgm ("  w", " wo", ...).
+    Works for Thai too, which has no spaces between words.
+    """
+    grams = set()
+    for word in normalize(text).split(" "):
+        if not word:
+            continue
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _Doc:
+    __slots__ = ("product_id", "name", "desc", "seller_id", "status_id", "start_time", "name_grams", "desc_grams")
+
+    def __init__(self, row: dict):
+        self.product_id = row["product_id"]
+        self.name = normalize(row.get("product_name"))
+        self.desc = normalize(row.get("product_desc"))
+        self.seller_id = row.get("seller_id")
+        self.status_id = row.get("status_id")
+        self.start_time = str(row.get("start_time") or "")
+        self.name_grams = trigrams(self.name)
+        self.desc_grams = trigrams(self.desc) - self.name_grams
+
+
+class ProductSearchIndex:
+    """
+    In-process trigram index over product name and description.
+
+    Loaded from the DB on first use, then kept current by upsert() /
+    set_status() from the code paths that write products, and reloaded
+    every SEARCH_REBUILD_SECONDS. Queries touch only the posting lists of
+    their own trigrams instead of ILIKE-scanning every description.
+    """
+
+    def __init__(self):
+        self._docs: dict[str, _Doc] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._by_seller: dict[str, set[str]] = defaultdict(set)
+        self._loaded_at: float | None = None
+        self._lock = threading.RLock()
+        self._loading = threading.Lock()
+
+    # --------------------------------------------------
+    # maintenance
+    # --------------------------------------------------
+    def _add(self, doc: _Doc):
+        self._docs[doc.product_id] = doc
+        self._by_seller[doc.seller_id].add(doc.product_id)
+        for gram in doc.name_grams | doc.desc_grams:
+            self._postings[gram].add(doc.product_id)
+
+    def _remove(self, product_id: str):
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        self._by_seller[doc.seller_id].discard(product_id)
+        for gram in doc.name_grams | doc.desc_grams:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def upsert(self, row: dict):
+        with self._lock:
+            self._remove(row["product_id"])
+            self._add(_Doc(row))
+
+    def set_status(self, product_ids, status_id: int) -> set[str] | None:
+        """
+        Update the indexed status. Returns the sellers of those products,
+        or None when one of them is not indexed (seller unknown), so the
+        caller can drop per-seller caches.
+        """
+        if isinstance(product_ids, str):
+            product_ids = [product_ids]
+        sellers: set[str] | None = set()
+        with self._lock:
+            for pid in product_ids:
+                doc = self._docs.get(pid)
+                if doc is None:
+                    sellers = None
+                    continue
+                doc.status_id = status_id
+                if sellers is not None:
+                    sellers.add(doc.seller_id)
+        return sellers
+
+    def remove(self, product_id: str):
+        with self._lock:
+            self._remove(product_id)
+
+    def _load_all(self) -> list[dict]:
+        supabase = get_supabase_client()
+        rows, offset = [], 0
+        while True:
+            res = (
+                supabase.table("product")
+                .select("product_id, product_name, product_desc, seller_id, status_id, start_time")
+                .order("product_id")
+                .range(offset, offset + LOAD_PAGE_SIZE - 1)
+                .execute()
+            )
+            page = res.data or []
+            rows.extend(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                return rows
+            offset += LOAD_PAGE_SIZE
+
+    def ensure_loaded(self):
+        fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < SEARCH_REBUILD_SECONDS
+        if fresh:
+            return
+        # one caller rebuilds; the rest keep using the current index if there is one
+        if not self._loading.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < SEARCH_REBUILD_SECONDS:
+                return
+            rows = self._load_all()
+            with self._lock:
+                self._docs.clear()
+                self._postings.clear()
+                self._by_seller.clear()
+                for row in rows:
+                    self._add(_Doc(row))
+                self._loaded_at = time.monotonic()
+            print(f"🔎 Search index loaded: {len(rows)} products")
+        finally:
+            self._loading.release()
+
+    # --------------------------------------------------
+    # query
+    # --------------------------------------------------
+    def _substring_matches(self, q: str, scope: set[str] | None) -> set[str]:
+        """Products whose name or description contains `q` (the old ILIKE '%q%')."""
+        if " " not in q and len(q) >= 3:
+            # every trigram inside q is indexed for a word containing q
+            lists = sorted(
+                (self._postings.get(q[i:i + 3], set()) for i in range(len(q) - 2)), key=len
+            )
+            candidates = set(lists[0]).intersection(*lists[1:])
+            if scope is not None:
+                candidates &= scope
+        else:
+            # short / multi-word queries: plain scan of the scope
+            candidates = scope if scope is not None else self._docs.keys()
+        return {pid for pid in candidates if q in self._docs[pid].name or q in self._docs[pid].desc}
+
+    def search(self, query: str, seller_id: str | None = None, status_id: int | None = None) -> list[str]:
+        """Product ids matching `query`, best match first."""
+        self.ensure_loaded()
+        q = normalize(query)
+        if not q:
+            return []
+        q_grams = trigrams(q)
+
+        with self._lock:
+            # a seller's own catalogue is usually far smaller than a posting list
+            scope = self._by_seller.get(seller_id, set()) if seller_id is not None else None
+
+            scores: dict[str, float] = defaultdict(float)
+            found: dict[str, int] = defaultdict(int)
+            for gram in q_grams:
+                ids = self._postings.get(gram)
+                if not ids:
+                    continue
+                if scope is not None:
+                    ids = scope & ids if len(scope) < len(ids) else ids & scope
+                for pid in ids:
+                    doc = self._docs[pid]
+                    if status_id is not None and doc.status_id != status_id:
+                        continue
+                    scores[pid] += NAME_WEIGHT if gram in doc.name_grams else DESC_WEIGHT
+                    found[pid] += 1
+
+            substring = self._substring_matches(q, scope)
+            if status_id is not None:
+                substring = {pid for pid in substring if self._docs[pid].status_id == status_id}
+
+            ranked = []
+            max_score = NAME_WEIGHT * len(q_grams)
+            for pid in substring | scores.keys():
+                score = scores.get(pid, 0.0)
+                # the similarity cut-off only applies to fuzzy matches
+                if pid not in substring and found[pid] < SEARCH_MIN_SIMILARITY * len(q_grams):
+                    continue
+                doc = self._docs[pid]
+                # exact substring beats a fuzzy match; name beats description
+                bonus = 2.0 if q in doc.name else 1.0 if q in doc.desc else 0.0
+                ranked.append((score / max_score + bonus, doc.start_time, pid))
+
+        ranked.sort(reverse=True)
+        return [pid for _, _, pid in ranked]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "products": len(self._docs),
+                "trigrams": len(self._postings),
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            }
+
+
+product_search = ProductSearchIndex()
@@ -0,0 +1,154 @@
+# backend/app/Service/Users/user_names.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.Service.db_connection import get_supabase_client
+from app.Service.state_versions import state_versions, WINNERS
+
+USER_NAME_TTL_SECONDS = float(os.getenv("USER_NAME_TTL_SECONDS", "300"))
+USER_NAME_CACHE_SIZE = int(os.getenv("USER_NAME_CACHE_SIZE", "10000"))
+# Lookups arriving within this window share one query
+USER_NAME_BATCH_WINDOW_MS = float(os.getenv("USER_NAME_BATCH_WINDOW_MS", "2"))
+
+
+class _Batch:
+    __slots__ = ("ids", "done", "error")
+
+    def __init__(self):
+        self.ids: set[str] = set()
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+
+
+class UserNameResolver:
+    """
+    user_id -> user_name with a TTL/LRU cache and DataLoader-style batching.
+
+    Cache misses are collected for USER_NAME_BATCH_WINDOW_MS; the first
+    caller of a window then runs one `in_` query for every id gathered,
+    and the other callers in that window wait for it. A call therefore
+    costs at most one query however many ids it asks for. Profile updates
+    call invalidate() so renamed users show up immediately.
+
+    Hot paths that must not wait (placing a bid) use peek() and hand
+    misses to prefetch(), which resolves them on a background thread.
+    """
+
+    def __init__(self):
+        self._cache: "OrderedDict[str, tuple[float, str | None]]" = OrderedDict()
+        self._batch: _Batch | None = None
+        self._lock = threading.Lock()
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-names")
+
+    def _cached(self, user_id: str, now: float):
+        entry = self._cache.get(user_id)
+        if entry is None or entry[0] < now:
+            return False, None
+        self._cache.move_to_end(user_id)
+        return True, entry[1]
+
+    def _store(self, names: dict[str, str | None]):
+        expires = time.monotonic() + USER_NAME_TTL_SECONDS
+        with self._lock:
+            for user_id, name in names.items():
+                self._cache[user_id] = (expires, name)
+                self._cache.move_to_end(user_id)
+            while len(self._cache) > USER_NAME_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _load(self, user_ids: set[str]):
+        res = (
+            get_supabase_client().table("users")
+            .select("user_id, user_name")
+            .in_("user_id", list(user_ids))
+            .execute()
+        )
+        names: dict[str, str | None] = {uid: None for uid in user_ids}  # unknown ids are cached too
+        for u in res.data or []:
+            names[u["user_id"]] = u.get("user_name")
+        self._store(names)
+
+    def resolve_many(self, user_ids) -> dict[str, str | None]:
+        wanted = {uid for uid in user_ids if uid}
+        out: dict[str, str | None] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            missing = set()
+            for uid in wanted:
+                hit, name = self._cached(uid, now)
+                if hit:
+                    out[uid] = name
+                else:
+                    missing.add(uid)
+            if not missing:
+                return out
+
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch()
+            batch.ids |= missing
+
+        if leader:
+            # เปิดหน้าต่างสั้นๆ ให้ request อื่นที่มาพร้อมกันฝาก id มาด้วย
+            time.sleep(USER_NAME_BATCH_WINDOW_MS / 1000)
+            with self._lock:
+                self._batch = None
+            try:
+                self._load(batch.ids)
+            except BaseException as e:
+                batch.error = e
+                raise
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+
+        with self._lock:
+            for uid in missing:
+                entry = self._cache.get(uid)
+                out[uid] = entry[1] if entry else None
+        return out
+
+    def peek(self, user_id: str) -> tuple[bool, str | None]:
+        """(hit, name) from the cache only; never queries."""
+        with self._lock:
+            return self._cached(user_id, time.monotonic())
+
+    def prefetch(self, user_ids):
+        """Resolve ids in the background so later reads hit the cache."""
+        wanted = [uid for uid in user_ids if uid]
+        if wanted:
+            self._prefetcher.submit(self._prefetch, wanted)
+
+    def _prefetch(self, user_ids: list[str]):
+        try:
+            self.resolve_many(user_ids)
+        except Exception as e:
+            print(f"⚠️ user name prefetch failed: {e}")
+
+    def resolve(self, user_id: str) -> str | None:
+        return self.resolve_many([user_id]).get(user_id)
+
+    def attach(self, rows: list[dict], id_key: str, name_key: str, default: str | None = None) -> list[dict]:
+        """Set rows[i][name_key] from rows[i][id_key] for a whole list in one lookup."""
+        names = self.resolve_many(r.get(id_key) for r in rows)
+        for r in rows:
+            r[name_key] = names.get(r.get(id_key)) or default
+        return rows
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._cache.pop(user_id, None)
+        # /products/winners embeds winner names under the WINNERS ETag
+        state_versions.bump(WINNERS)
+
+
+user_names = UserNameResolver()
@@ -1,22 +1,12 @@
-import os
-from supabase import create_client, Client
-import json
 import secrets
 from typing import Optional, Dict
 from app.Model.User import UserLogin, UserResponse, EditUserProfileRequest
+from app.Service.db_connection import get_supabase_client
+from app.Service.db_async import run_db
+from app.Service.Users.user_names import user_names
 from fastapi import HTTPException, status 
 import hashlib
 
-# อ่าน config
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # app/Service/..
-print("BASE_DIR =", BASE_DIR)
-CONFIG_PATH = os.path.join(BASE_DIR, "Config.json")
-
-with open(CONFIG_PATH, 'r') as f:
-    config = json.load(f)
-
-supabase: Client = create_client(config['SUPABASE_URL'], config['SUPABASE_KEY'])
-
 class AuthService:
 
     @staticmethod
@@ -39,7 +29,9 @@ class AuthService:
         try:
             # Query user จาก Supabase (ไม่ hash password)
             hashed_password = AuthService.hash_password(password)
-            response = supabase.table('users').select('*').eq('user_email', email).eq('password', hashed_password).execute()
+            response = await run_db(
+                lambda: get_supabase_client().table('users').select('*').eq('user_email', email).eq('password', hashed_password).execute()
+            )
             
             # ตรวจสอบว่ามีข้อมูลหรือไม่
             if not response.data or len(response.data) == 0:
@@ -91,7 +83,7 @@ class AuthService:
                 update_data["created_at"] = user_data.create_date
             
             # อัพเดทข้อมูลใน Supabase
-            response = supabase.table("users").update(update_data).eq("user_id", user_data.user_id).execute()
+            response = get_supabase_client().table("users").update(update_data).eq("user_id", user_data.user_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -100,6 +92,7 @@ class AuthService:
                 )
             
             user = response.data[0]
+            user_names.invalidate(user["user_id"])
             
             # Return UserResponse
             return UserResponse(
@@ -0,0 +1,27 @@
+# backend/app/Service/clock.py
+
+from datetime import datetime, timedelta
+
+DB_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def get_now() -> datetime:
+    """
+    Return current real time (Adjusted to Thai Time UTC+7)
+    """
+    # ดึงเวลาปัจจุบันแบบ UTC (เวลาโลก)
+    utc_now = datetime.utcnow()
+    # บวก 7 ชั่วโมงเพื่อให้เป็นเวลาไทย
+    thai_now = utc_now + timedelta(hours=7)
+    # ตัดหน่วยไมโครวินาทีออกเพื่อให้ Format ตรงกับ DB
+    return thai_now.replace(microsecond=0)
+
+
+def parse_db_time(value: str | None) -> datetime | None:
+    """Parse a product start_time/end_time ('YYYY-MM-DD HH:MM:SS', Thai local)."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19].replace("T", " "), DB_TIME_FORMAT)
+    except ValueError:
+        return None
@@ -0,0 +1,43 @@
+# backend/app/Service/db_async.py
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads reserved for blocking Supabase calls made from async endpoints
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "16"))
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db"
+        )
+    return _executor
+
+
+async def run_db(fn, *args, **kwargs):
+    """
+    Run a blocking Supabase call off the event loop.
+
+    The sync client is fine inside plain `def` endpoints (FastAPI already
+    runs those in its threadpool), but inside `async def` it freezes the
+    whole worker for the length of the round trip. Wrap such calls:
+
+        res = await run_db(lambda: supabase.table("x").select("*").execute())
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_db_executor(), functools.partial(fn, *args, **kwargs)
+    )
+
+
+def shutdown_db_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
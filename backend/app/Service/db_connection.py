@@ -1,31 +1,143 @@
 import os
 import json
-from typing import Any, Dict, List
+import threading
+import importlib.util
+from typing import Any, Dict
+
+import httpx
 from supabase import create_client, Client
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Config.json")
 
-with open(CONFIG_PATH) as f:
-    config = json.load(f)
+# ======================================================
+# HTTP POOL SETTINGS (PostgREST session)
+# ======================================================
+DB_POOL_MAX_CONNECTIONS = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "50"))
+DB_POOL_MAX_KEEPALIVE = int(os.getenv("DB_POOL_MAX_KEEPALIVE", "20"))
+DB_POOL_KEEPALIVE_EXPIRY = float(os.getenv("DB_POOL_KEEPALIVE_EXPIRY", "60"))
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+DB_READ_TIMEOUT = float(os.getenv("DB_READ_TIMEOUT", "15"))
+# "auto" -> HTTP/2 when the h2 package is installed
+DB_HTTP2 = os.getenv("DB_HTTP2", "auto").lower()
+
+_client: Client | None = None
+_transport: "_MeteredTransport | None" = None
+_lock = threading.Lock()
+
+
+def _load_settings() -> tuple[str, str]:
+    """SUPABASE_URL / SUPABASE_KEY from the environment, Config.json as local fallback."""
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if (not url or not key) and os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH) as f:
+            config = json.load(f)
+        url = url or config.get("SUPABASE_URL")
+        key = key or config.get("SUPABASE_KEY")
+    if not url or not key:
+        raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set")
+    return url, key
+
+
+def _http2_enabled() -> bool:
+    if DB_HTTP2 == "auto":
+        return importlib.util.find_spec("h2") is not None
+    return DB_HTTP2 in ("1", "true", "yes", "on")
+
+
+class _MeteredTransport(httpx.HTTPTransport):
+    """HTTP transport that tracks in-flight requests for pool metrics."""
 
-SUPABASE_URL = config["SUPABASE_URL"]
-SUPABASE_KEY = config["SUPABASE_KEY"]
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self._counter_lock = threading.Lock()
 
-print("SUPABASE_URL =", SUPABASE_URL)
-print("SUPABASE_KEY starts with =", SUPABASE_KEY[:10])
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._counter_lock:
+            self.in_flight += 1
+            self.requests_total += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return super().handle_request(request)
+        finally:
+            with self._counter_lock:
+                self.in_flight -= 1
+
+    def open_connections(self) -> int | None:
+        pool = getattr(self, "_pool", None)
+        conns = getattr(pool, "connections", None)
+        return len(conns) if conns is not None else None
+
+
+def _build_client() -> Client:
+    global _transport
+    url, key = _load_settings()
+    client = create_client(url, key)
+
+    # supabase-py builds its PostgREST session with default pool settings;
+    # swap it for one with keep-alive, pool limits, timeouts and HTTP/2
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    _transport = _MeteredTransport(
+        http2=_http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=DB_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=DB_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=DB_POOL_KEEPALIVE_EXPIRY,
+        ),
+    )
+    postgrest.session = httpx.Client(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=httpx.Timeout(DB_READ_TIMEOUT, connect=DB_CONNECT_TIMEOUT),
+        transport=_transport,
+    )
+    default_session.close()
+    return client
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 def get_supabase_client() -> Client:
-    return supabase
+    """Process-wide Supabase client, created on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Utilisation of the PostgREST HTTP connection pool."""
+    if _transport is None:
+        return {"initialised": False}
+    return {
+        "initialised": True,
+        "http2": _http2_enabled(),
+        "max_connections": DB_POOL_MAX_CONNECTIONS,
+        "max_keepalive_connections": DB_POOL_MAX_KEEPALIVE,
+        "open_connections": _transport.open_connections(),
+        "in_flight": _transport.in_flight,
+        "peak_in_flight": _transport.peak_in_flight,
+        "utilisation": round(_transport.in_flight / DB_POOL_MAX_CONNECTIONS, 4),
+        "requests_total": _transport.requests_total,
+    }
+
+
+def __getattr__(name: str):
+    # keeps `from app.Service.db_connection import supabase` working, lazily
+    if name == "supabase":
+        return get_supabase_client()
+    raise AttributeError(name)
 
-from typing import Any, Dict, List
 
 def run_sql(query: str) -> Dict[str, Any]:
     print("Executing SQL query:", query)
-    resp = supabase.rpc("exec_sql", {"q": query}).execute()
+    resp = get_supabase_client().rpc("exec_sql", {"q": query}).execute()
 
-    data = resp.data 
+    data = resp.data
     if data is None:
         return {"status": "error", "error": "No data returned from exec_sql"}
 
@@ -0,0 +1,42 @@
+# backend/app/Service/http_cache.py
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # compare ignoring the weak prefix, as If-None-Match does
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def cache_headers(etag: str, max_age: int = 0) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={max_age}" if max_age else "no-cache"}
+
+
+def not_modified(request: Request, etag: str, max_age: int = 0, headers: dict | None = None) -> Response | None:
+    """
+    304 Not Modified when the client already holds `etag`, else None.
+    Check this before building the body so a matching poll costs nothing.
+    """
+    if not etag_matches(request, etag):
+        return None
+    return Response(status_code=304, headers={**cache_headers(etag, max_age), **(headers or {})})
+
+
+def cached_json(request: Request, payload, etag: str, max_age: int = 0) -> Response:
+    """
+    JSON response with a version ETag (state_versions / reference_data, never
+    a hash of the body); answers 304 Not Modified when the client already
+    holds this version. `max_age` lets browsers skip the request entirely
+    for a while; 0 means "revalidate every time".
+    """
+    return not_modified(request, etag, max_age) or JSONResponse(
+        content=jsonable_encoder(payload), headers=cache_headers(etag, max_age)
+    )
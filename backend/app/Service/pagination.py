@@ -0,0 +1,46 @@
+# backend/app/Service/pagination.py
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _quote(value) -> str:
+    # PostgREST logic trees need quoting for values with spaces / , . : ( )
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_after_desc(query, sort_col: str, tie_col: str, cursor: str | None):
+    """
+    Apply ORDER BY sort_col DESC, tie_col DESC and, when a cursor is given,
+    continue strictly after the row it points at:
+
+        sort_col < v  OR  (sort_col = v AND tie_col < t)
+
+    Each page is an index range scan from the cursor, so page 500 costs
+    the same as page 1 (unlike OFFSET, which reads and discards).
+    """
+    if cursor:
+        sort_value, tie_value = decode_cursor(cursor, 2)
+        sv, tv = _quote(sort_value), _quote(tie_value)
+        query = query.or_(
+            f"{sort_col}.lt.{sv},and({sort_col}.eq.{sv},{tie_col}.lt.{tv})"
+        )
+    return query.order(sort_col, desc=True).order(tie_col, desc=True)
@@ -0,0 +1,126 @@
+# backend/app/Service/reference_data.py
+
+import os
+import secrets
+import threading
+import time
+
+from app.Service.db_connection import get_supabase_client
+
+# Reload categories from the DB at most this often (or sooner after bump())
+REFERENCE_TTL_SECONDS = float(os.getenv("REFERENCE_TTL_SECONDS", "300"))
+
+# product.status_id
+STATUSES = {
+    1: "unverified",
+    2: "verified",
+    8: "bidding",
+    4: "completed",
+    9: "received",
+    6: "refunded",
+}
+
+# users.role_id
+ROLES = {
+    1: "admin",
+    2: "seller",
+    3: "buyer",
+}
+ROLE_CODES = {name: code for code, name in ROLES.items()}
+
+
+def category_names_of(snapshot: dict) -> list[str]:
+    return [c["category_name"] for c in snapshot["categories"] if c.get("category_name")]
+
+
+class ReferenceData:
+    """
+    Categories, product statuses and roles, loaded once and served from
+    memory. Categories come from the `category` table and are reloaded
+    after REFERENCE_TTL_SECONDS or when bump() is called; statuses and
+    roles are code constants kept here so there is one place to read them.
+
+    The ETag is a version number that only moves when a reload returns
+    different data, and only one caller reloads at a time: the others keep
+    serving the previous snapshot (or wait for it on the very first load).
+    """
+
+    def __init__(self):
+        self._snapshot: dict | None = None
+        self._loaded_at = 0.0
+        self._version = 0
+        # bumped whenever a reload changes the data; restarts get a new epoch
+        self._generation = 0
+        self._epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+
+    def _load(self) -> dict:
+        res = (
+            get_supabase_client().table("category")
+            .select("category_id, category_name")
+            .order("category_id", desc=False)
+            .execute()
+        )
+        return {
+            "categories": res.data or [],
+            "statuses": [{"status_id": k, "status_name": v} for k, v in STATUSES.items()],
+            "roles": [{"role_id": k, "role_name": v} for k, v in ROLES.items()],
+        }
+
+    def _fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._loaded_at < REFERENCE_TTL_SECONDS
+
+    def _current(self) -> tuple[dict, int]:
+        with self._lock:
+            if self._fresh():
+                return self._snapshot, self._generation
+
+        # one caller reloads; the rest keep the current snapshot if there is one
+        if not self._loading.acquire(blocking=self._snapshot is None):
+            with self._lock:
+                return self._snapshot, self._generation
+        try:
+            with self._lock:
+                if self._fresh():
+                    return self._snapshot, self._generation
+                version = self._version
+
+            snapshot = self._load()
+
+            with self._lock:
+                if snapshot != self._snapshot:
+                    self._generation += 1
+                self._snapshot = snapshot
+                # a bump() during the load wins: serve this, reload next time
+                self._loaded_at = time.monotonic() if version == self._version else 0.0
+                return self._snapshot, self._generation
+        finally:
+            self._loading.release()
+
+    def get(self) -> dict:
+        return self._current()[0]
+
+    def snapshot(self, variant: str = "all") -> tuple[dict, str]:
+        """
+        (data, version ETag) from a single read, so a reload between
+        building the body and tagging it can never pair old data with the
+        new version. `variant` keeps tags distinct per response shape.
+        """
+        data, generation = self._current()
+        return data, f'W/"ref-{self._epoch}-{generation}-{variant}"'
+
+    def categories(self) -> list[dict]:
+        return self.get()["categories"]
+
+    def category_names(self) -> list[str]:
+        return category_names_of(self.get())
+
+    def bump(self):
+        """Force a reload on next access (after categories change)."""
+        with self._lock:
+            self._version += 1
+            self._loaded_at = 0.0
+
+
+reference_data = ReferenceData()
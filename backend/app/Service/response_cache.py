@@ -0,0 +1,105 @@
+# backend/app/Service/response_cache.py
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.Service.clock import get_now
+
+
+def next_minute(now: datetime) -> datetime:
+    return (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
+
+
+class MinuteCache:
+    """
+    Cache whose entries expire at the next minute boundary of get_now().
+
+    Auctions run in one-minute slots, so slot-based answers (what is live,
+    what is upcoming) only change at a boundary or when an auction changes
+    status. Status transitions call `invalidate()`; everything in between
+    is served without touching the DB.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[datetime, object]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: tuple, loader):
+        now = get_now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[0]:
+                return entry[1]
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            # don't store a value loaded before an invalidation
+            if generation == self._generation:
+                self._entries[key] = (next_minute(now), value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+
+
+class TTLCache:
+    """
+    Small keyed cache with a fixed time-to-live, for values that may be a
+    little stale (counts, totals) but are expensive to recompute.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1000):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[tuple, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: tuple, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[0]:
+                return entry[1]
+
+        value = loader()
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, match=None):
+        """Drop every entry, or only those whose key satisfies `match(key)`."""
+        with self._lock:
+            if match is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if match(k)]:
+                    del self._entries[key]
+
+
+# Shared by /products/bidding-now and /products/upcoming
+slot_cache = MinuteCache()
+
+# Seller product counts for /api/seller/products, keyed (seller, status)
+seller_totals = TTLCache(ttl_seconds=60)
+
+
+def invalidate_seller_totals(seller_ids: set[str] | None):
+    """
+    Drop the cached counts of these sellers, after product create or any
+    status change; None (seller unknown) drops every seller's counts.
+    """
+    if seller_ids is None:
+        seller_totals.invalidate()
+    elif seller_ids:
+        seller_totals.invalidate(lambda key: key[0] in seller_ids)
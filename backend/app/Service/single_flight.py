@@ -0,0 +1,84 @@
+# backend/app/Service/single_flight.py
+
+import threading
+from collections import OrderedDict
+
+# Keep metrics for at most this many distinct keys
+MAX_TRACKED_KEYS = 1000
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Request coalescing for identical reads.
+
+    While a call for `key` is in flight, other callers with the same key
+    wait for it and share its result instead of issuing their own backend
+    query. Works from the sync endpoints FastAPI runs in its threadpool.
+
+    Callers get the very same result object, so treat it as read-only
+    (copy before mutating).
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._stats: "OrderedDict[str, list[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0]  # [calls, executions]
+                if len(self._stats) > MAX_TRACKED_KEYS:
+                    self._stats.popitem(last=False)
+            stats[0] += 1
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                stats[1] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict[str, dict]:
+        """Per-key calls / backend executions / coalescing ratio."""
+        with self._lock:
+            items = list(self._stats.items())
+        out = {}
+        for key, (calls, executions) in items:
+            shared = calls - executions
+            out[key] = {
+                "calls": calls,
+                "executions": executions,
+                "shared": shared,
+                "coalescing_ratio": round(shared / calls, 4) if calls else 0.0,
+            }
+        return out
+
+
+single_flight = SingleFlight()
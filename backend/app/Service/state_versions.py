@@ -0,0 +1,67 @@
+# backend/app/Service/state_versions.py
+
+import secrets
+import threading
+
+from app.Service.clock import get_now
+
+# Counter names
+CATALOG = "catalog"   # product created / status changed (upcoming, explore, coming-up)
+WINNERS = "winners"   # auction finalized, paid, received, refunded; user renamed
+BIDS = "bids"         # any accepted bid (bids rewrite product.start_price)
+
+
+def bids_of(product_id: str) -> str:
+    """Counter for the bids of one product (/bids/{id}/highest)."""
+    return f"{BIDS}:{product_id}"
+
+
+class StateVersions:
+    """
+    Monotonic counters bumped wherever state changes, used as ETags.
+
+    Building the tag costs a few dict lookups, so a poll whose tag still
+    matches is answered 304 before any query, cache lookup or encoding.
+    The tag carries a per-process epoch: counters restart at 0 on boot and
+    must never match a tag handed out by an earlier process.
+    Counters are never dropped for the same reason (a reset would repeat
+    an old value).
+    """
+
+    def __init__(self):
+        self._epoch = secrets.token_hex(4)
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *names: str):
+        with self._lock:
+            for name in names:
+                self._counters[name] = self._counters.get(name, 0) + 1
+
+    def get(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def etag(self, *names: str, per_minute: bool = False) -> str:
+        """
+        Weak ETag from the given counters. `per_minute` adds the current
+        minute slot, for bodies that also depend on the clock (what is
+        upcoming, seconds left); they then revalidate at each boundary.
+        """
+        parts = [self._epoch] + [str(self.get(name)) for name in names]
+        if per_minute:
+            parts.append(get_now().strftime("%Y%m%d%H%M"))
+        return f'W/"{"-".join(parts)}"'
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_product = sum(1 for name in self._counters if name.startswith(BIDS + ":"))
+            return {
+                "epoch": self._epoch,
+                CATALOG: self._counters.get(CATALOG, 0),
+                WINNERS: self._counters.get(WINNERS, 0),
+                BIDS: self._counters.get(BIDS, 0),
+                "products_with_bids": per_product,
+            }
+
+
+state_versions = StateVersions()
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from app.Service.db_connection import run_sql
@@ -28,9 +29,28 @@ from app.Controller.Passwordmanagement.ResetPasswordController import router as
 from app.Controller.Payment.PaymentController import router as payment_router
 
 from app.Controller.Bidding.BiddingController import router as bidding_router
+from app.Controller.Metrics.MetricsController import router as metrics_router
+from app.Controller.Images.ImageController import router as image_router
+from app.Service.Bidding.bid_writer import bid_writer
+from app.Service.Auction.auction_scheduler import auction_scheduler
+from app.Service.Auction.winner_feed import winner_feed
+from app.Service.db_async import shutdown_db_executor
+from app.Service.Images.image_derivatives import image_derivatives
+from app.Service.Images.image_upload import exceeds_request_limit, MAX_REQUEST_BYTES
 
 app = FastAPI()
 
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # ตัดทิ้งก่อน FastAPI จะ parse multipart body (ประกาศก่อน CORS เพื่อให้ 413 ยังมี CORS header)
+    if request.headers.get("content-type", "").startswith("multipart/form-data") \
+            and exceeds_request_limit(request.headers.get("content-length")):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Request exceeds {MAX_REQUEST_BYTES // (1024 * 1024)} MB"},
+        )
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -45,8 +65,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ให้ frontend อ่าน header ของ conditional GET ได้
+    expose_headers=["ETag", "X-Server-Time"],
 )
 
+@app.on_event("startup")
+def start_auction_scheduler():
+    # เปลี่ยนสถานะ 2 -> 8 -> 4 ตามเวลา start_time / end_time
+    auction_scheduler.start()
+    # โหลดผู้ชนะล่าสุดเข้า memory สำหรับ /api/winners/
+    winner_feed.start()
+
+@app.on_event("shutdown")
+def flush_pending_bids():
+    auction_scheduler.stop()
+    winner_feed.stop()
+    # เขียน bid ที่ค้างอยู่ในคิวลง DB ก่อนปิด server
+    bid_writer.shutdown()
+    shutdown_db_executor()
+    image_derivatives.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "FastAPI + Supabase connected!"}
@@ -92,6 +130,12 @@ app.include_router(forget_password_router)
 app.include_router(reset_password_router)
 app.include_router(payment_router)
 
+# Content-addressed images
+app.include_router(image_router)
+
+# Internal metrics
+app.include_router(metrics_router)
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+# backend/scripts/bench_serialization.py
+#
+# Serialisation cost per 1k rows: FastAPI's default response path
+# (response_model validation / jsonable_encoder + JSONResponse) vs
+# FastJSONResponse. No DB needed; rows are synthetic but route-shaped.
+#
+#   cd backend && python scripts/bench_serialization.py [rows] [repeats]
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.Model.ProfileBuyer.OrdersModel import OrderOut
+from app.Service import fast_json
+from app.Service.fast_json import FastJSONResponse
+
+NOW = datetime.now(timezone.utc)
+
+
+def card_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()), "name": f"Product {i}", "startPrice": 100 + i,
+            "image": f"http://localhost:8000/images/{uuid.uuid4().hex * 2}/thumb",
+            "timeLeft": i * 7, "status": "active", "views": i, "likes": i // 3,
+            "auctionId": f"AUC-{i}", "listedBy": "seller_demo", "category": "Electronics",
+            "description": "ของดี สภาพสวย " * 4, "condition": "New",
+            "currentBid": 150 + i, "totalBids": i % 9, "source": "explore",
+        }
+        for i in range(n)
+    ]
+
+
+def order_rows(n: int) -> list[dict]:
+    rows = []
+    for i in range(n):
+        pid = str(uuid.uuid4())
+        rows.append({
+            "id": pid, "orderId": "ORD-" + pid[:8].upper(), "productId": pid,
+            "productName": f"Product {i}", "finalPrice": 250.0 + i, "quantity": 1,
+            "purchasedAt": (NOW - timedelta(minutes=i)).isoformat(), "cancelledAt": None,
+            "thumbnailUrl": f"http://localhost:8000/images/{uuid.uuid4().hex * 2}/thumb",
+            "status": "completed",
+        })
+    return rows
+
+
+def bid_rows(n: int) -> dict:
+    bids = [
+        {
+            "bid_id": str(uuid.uuid4()), "bidder_id": str(uuid.uuid4()), "bidder_name": f"user{i}",
+            "bid_amount": 100.0 + i, "created_at": (NOW + timedelta(seconds=i)).isoformat(),
+        }
+        for i in range(n)
+    ]
+    return {"total_bids": n, "bids": bids}
+
+
+LOOP = asyncio.new_event_loop()
+
+
+def default_path(field, content) -> bytes:
+    # what FastAPI does for a plain return value: validate against
+    # response_model (or jsonable_encoder when there is none), then render
+    payload = LOOP.run_until_complete(serialize_response(field=field, response_content=content))
+    return JSONResponse(payload).body
+
+
+def fast_path(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    per_1k = 1000 / rows
+
+    cards = card_rows(rows)
+    orders = order_rows(rows)
+    bids = bid_rows(rows)
+    cases = [
+        # route, response field before, content before, content after
+        ("explore / coming-up", create_model_field("r", List[Dict[str, Any]]), lambda: cards, cards),
+        ("buyer orders", create_model_field("r", List[OrderOut]),
+         lambda: [OrderOut(**o) for o in orders], orders),
+        ("bid list", None, lambda: bids, bids),
+    ]
+
+    print(f"rows={rows} repeats={repeats} encoder={fast_json.backend()} (ms per 1k rows, best run)")
+    print(f"{'route':<22}{'default':>10}{'fast':>10}{'speedup':>10}")
+    for name, field, before_content, after_content in cases:
+        before = best_ms(lambda: default_path(field, before_content()), repeats) * per_1k
+        after = best_ms(lambda: fast_path(after_content), repeats) * per_1k
+        print(f"{name:<22}{before:>10.2f}{after:>10.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
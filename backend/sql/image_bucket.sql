@@ -0,0 +1,13 @@
+-- Durable copy of every image in the content-addressed image store.
+-- product/payment rows hold 'sha256:<hash>' references; the private
+-- Storage bucket "images" is the source of truth for the bytes, one object
+-- per hash at '<h[0:2]>/<hash>'. The container filesystem (IMAGE_STORE_DIR)
+-- is only a cache that is refilled from here after a redeploy or restart.
+--
+-- Written by app/Service/Images/image_blobs.py (uploads and the legacy image
+-- normaliser) before any row is pointed at the hash. The backend uses the
+-- service key, so the bucket needs no public access or extra policies.
+
+insert into storage.buckets (id, name, public)
+values ('images', 'images', false)
+on conflict (id) do nothing;
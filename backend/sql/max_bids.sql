@@ -0,0 +1,40 @@
+-- Highest bid per product for a set of products, computed server-side.
+-- Replaces pulling every bid row over the wire to take a max in Python.
+-- Returns one row per product that has bids: amount, who placed it, bid count.
+--
+-- Called from app/Service/Bidding/bid_store.py via supabase.rpc("max_bids", ...)
+
+create or replace function max_bids(p_product_ids uuid[])
+returns table (
+    product_id uuid,
+    bid_amount numeric,
+    bidder_id uuid,
+    total_bids bigint
+)
+language sql
+stable
+as $$
+    select distinct on (b.product_id)
+           b.product_id,
+           b.bid_amount,
+           b.bidder_id,
+           count(*) over (partition by b.product_id) as total_bids
+      from bid b
+     where b.product_id = any(p_product_ids)
+     order by b.product_id, b.bid_amount desc, b.created_at asc;
+$$;
+
+-- Index that lets the function (and the per-product highest-bid reads)
+-- walk straight to the top bid of each product.
+create index if not exists bid_product_amount_idx
+    on bid (product_id, bid_amount desc);
+
+-- One-off backfill: completed auctions finalized before final_price was
+-- always written. Highest bid wins; no bids -> the start price.
+update product p
+   set final_price = coalesce(
+           (select max(b.bid_amount) from bid b where b.product_id = p.product_id),
+           p.start_price
+       )
+ where p.status_id in (4, 9, 6)
+   and p.final_price is null;
@@ -0,0 +1,68 @@
+-- Atomic "place bid if greater than current price".
+-- Inserts into bid and bumps product.start_price (the current price) in a
+-- single server-side call. Concurrent bids on the same product serialise on
+-- the product row lock, so two bids can never both pass the price check.
+--
+-- Called from app/Service/Bidding/bid_store.py via supabase.rpc("place_bid", ...)
+
+create or replace function place_bid(
+    p_product_id uuid,
+    p_bidder_id uuid,
+    p_bid_amount numeric
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_start_price numeric;
+    v_status_id int;
+    v_highest numeric;
+    v_current numeric;
+    v_bid_id uuid := gen_random_uuid();
+    v_created_at timestamptz := now();
+begin
+    select start_price, status_id
+      into v_start_price, v_status_id
+      from product
+     where product_id = p_product_id
+       for update;
+
+    if not found then
+        return jsonb_build_object('status', 'not_found');
+    end if;
+
+    -- only verified / bidding auctions take bids (same as BIDDABLE_STATUSES)
+    if v_status_id not in (2, 8) then
+        return jsonb_build_object('status', 'closed', 'status_id', v_status_id);
+    end if;
+
+    select max(bid_amount) into v_highest from bid where product_id = p_product_id;
+    v_current := greatest(coalesce(v_start_price, 0), coalesce(v_highest, 0));
+
+    if p_bid_amount <= v_current then
+        return jsonb_build_object(
+            'status', 'rejected',
+            'current_price', v_current,
+            'status_id', v_status_id
+        );
+    end if;
+
+    insert into bid (bid_id, product_id, bidder_id, bid_amount, created_at)
+    values (v_bid_id, p_product_id, p_bidder_id, p_bid_amount, v_created_at);
+
+    update product set start_price = p_bid_amount where product_id = p_product_id;
+
+    return jsonb_build_object(
+        'status', 'accepted',
+        'current_price', p_bid_amount,
+        'status_id', v_status_id,
+        'bid', jsonb_build_object(
+            'bid_id', v_bid_id,
+            'product_id', p_product_id,
+            'bidder_id', p_bidder_id,
+            'bid_amount', p_bid_amount,
+            'created_at', v_created_at
+        )
+    );
+end;
+$$;
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# tests import the app as `app.…`, the same way main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# nothing talks to a real Supabase; get_supabase_client is replaced per test
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
@@ -0,0 +1,230 @@
+"""
+In-memory stand-in for the parts of the supabase-py query builder the app
+uses. Every `.execute()` is recorded in `client.calls` as (table, action),
+so tests can assert round-trip budgets. `client.storage` stands in for the
+Storage bucket API.
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+
+# what httpx reads per chunk when it streams a multipart file
+UPLOAD_CHUNK = 64 * 1024
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.filters = []
+        self.order_by = []
+        self.limit_n = None
+        self.range_ = None
+        self.one = False
+        self.on_conflict = None
+        self.ignore_duplicates = False
+
+    # ---- builders ----
+    def select(self, *args, **kwargs):
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self.action, self.payload = "upsert", rows
+        self.on_conflict, self.ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, values):
+        self.action, self.payload = "update", values
+        return self
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r.get(col) == value)
+        return self
+
+    def neq(self, col, value):
+        self.filters.append(lambda r: r.get(col) != value)
+        return self
+
+    def in_(self, col, values):
+        values = set(values)
+        self.filters.append(lambda r: r.get(col) in values)
+        return self
+
+    def is_(self, col, value):
+        self.filters.append(lambda r: r.get(col) is None)
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: r.get(col) is not None and r.get(col) >= value)
+        return self
+
+    def gt(self, col, value):
+        self.filters.append(lambda r: r.get(col) is not None and r.get(col) > value)
+        return self
+
+    def lte(self, col, value):
+        self.filters.append(lambda r: r.get(col) is not None and r.get(col) <= value)
+        return self
+
+    def order(self, col, desc=False):
+        self.order_by.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def range(self, start, end):
+        self.range_ = (start, end)
+        return self
+
+    def single(self):
+        self.one = True
+        return self
+
+    # ---- execution ----
+    def execute(self):
+        return self.client._execute(self)
+
+
+class FakeStreamResponse:
+    def __init__(self, data: bytes | None):
+        self.data = data
+        self.status_code = 200 if data is not None else 404
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ConnectionError(f"fake storage: HTTP {self.status_code}")
+
+    def iter_bytes(self, chunk_size: int):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start:start + chunk_size]
+
+
+class FakeBucket:
+    def __init__(self, storage, name: str):
+        self.storage = storage
+        self.name = name
+
+    def upload(self, path: str, file, file_options=None):
+        self.storage._check()
+        if isinstance(file, bytes):
+            self.storage.largest_read = max(self.storage.largest_read, len(file))
+            data = file
+        else:
+            parts, hasher = [], hashlib.sha256()
+            while chunk := file.read(UPLOAD_CHUNK):
+                self.storage.largest_read = max(self.storage.largest_read, len(chunk))
+                hasher.update(chunk)
+                if self.storage.keep_bytes:
+                    parts.append(chunk)
+            # keep_bytes=False: remember only the hash (memory tests)
+            data = b"".join(parts) if self.storage.keep_bytes else hasher.hexdigest()
+        self.storage.objects[(self.name, path)] = data
+        self.storage.uploads.append((self.name, path, dict(file_options or {})))
+        return {"path": path}
+
+    def create_signed_url(self, path: str, expires_in: int):
+        self.storage._check()
+        if (self.name, path) not in self.storage.objects:
+            raise LookupError(f"fake storage: {path} not found")
+        return {"signedURL": f"fake://{self.name}/{path}"}
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: list[tuple[str, str, dict]] = []
+        # largest single chunk handed over in an upload (bytes)
+        self.largest_read = 0
+        self.keep_bytes = True
+        self.fail_next = 0
+
+    def _check(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise ConnectionError("fake storage: connection reset")
+
+    def from_(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+    @contextmanager
+    def stream(self, url: str):
+        """Drop-in for image_blobs._stream_get over fake:// signed URLs."""
+        bucket, path = url.removeprefix("fake://").split("/", 1)
+        yield FakeStreamResponse(self.objects.get((bucket, path)))
+
+
+class FakeSupabase:
+    def __init__(self, tables: dict | None = None):
+        self.tables: dict[str, list[dict]] = {k: [dict(r) for r in v] for k, v in (tables or {}).items()}
+        self.calls: list[tuple[str, str]] = []
+        # raise on the next N executes (before touching data)
+        self.fail_next = 0
+        # apply the next N writes, then raise anyway (lost response)
+        self.fail_after_write = 0
+        self._lock = threading.Lock()
+        self.storage = FakeStorage()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    from_ = table
+
+    def queries(self, table: str | None = None) -> int:
+        return sum(1 for t, _ in self.calls if table is None or t == table)
+
+    def _execute(self, q: FakeQuery) -> FakeResponse:
+        with self._lock:
+            self.calls.append((q.table, q.action))
+            if self.fail_next:
+                self.fail_next -= 1
+                raise ConnectionError("fake supabase: connection reset")
+
+            rows = self.tables.setdefault(q.table, [])
+            if q.action in ("insert", "upsert"):
+                new = q.payload if isinstance(q.payload, list) else [q.payload]
+                out = []
+                for row in new:
+                    key = q.on_conflict
+                    if key and any(r.get(key) == row.get(key) for r in rows):
+                        if q.ignore_duplicates:
+                            continue
+                    rows.append(dict(row))
+                    out.append(dict(row))
+                result = FakeResponse(out)
+            else:
+                matched = [r for r in rows if all(f(r) for f in q.filters)]
+                if q.action == "update":
+                    for r in matched:
+                        r.update(q.payload)
+                for col, desc in reversed(q.order_by):
+                    matched.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+                # count="exact" counts every match, not just the returned page
+                total = len(matched)
+                if q.range_:
+                    matched = matched[q.range_[0]:q.range_[1] + 1]
+                if q.limit_n is not None:
+                    matched = matched[:q.limit_n]
+                data = [dict(r) for r in matched]
+                if q.one:
+                    data = data[0] if data else None
+                result = FakeResponse(data, count=total)
+
+            if q.action != "select" and self.fail_after_write:
+                self.fail_after_write -= 1
+                raise ConnectionError("fake supabase: response lost after write")
+            return result
@@ -0,0 +1,75 @@
+import pytest
+
+from app.Service.Auction import auction_lifecycle
+from app.Service.Bidding.bid_store import LocalBidStore
+from fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({"product": [
+        {"product_id": "p1", "status_id": 8, "start_price": 100, "winner_id": None,
+         "final_price": None, "end_time": "2025-01-01 00:01:00"},
+    ]})
+    monkeypatch.setattr(auction_lifecycle, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(auction_lifecycle, "bid_store", LocalBidStore())
+    return db
+
+
+def test_finalize_reports_status(fake_db):
+    first = auction_lifecycle.finalize("p1")
+    assert first["status"] == auction_lifecycle.FINALIZED
+    assert first["final_price"] == 100
+    assert fake_db.tables["product"][0]["status_id"] == auction_lifecycle.STATUS_COMPLETED
+
+    again = auction_lifecycle.finalize("p1")
+    assert again["status"] == auction_lifecycle.ALREADY_FINALIZED
+
+    missing = auction_lifecycle.finalize("nope")
+    assert missing["status"] == auction_lifecycle.NOT_FOUND
+
+
+def test_finalize_locks_are_bounded():
+    for i in range(1000):
+        auction_lifecycle._finalize_lock(f"product-{i}")
+    assert len(auction_lifecycle._finalize_locks) == auction_lifecycle.FINALIZE_LOCK_STRIPES
+    assert auction_lifecycle._finalize_lock("p1") is auction_lifecycle._finalize_lock("p1")
+
+
+def test_update_status_promotes_through_lifecycle_once(fake_db, monkeypatch):
+    from app.Controller.Product import ProductController
+
+    fake_db.tables["product"].append({"product_id": "p2", "status_id": 2})
+    opened = []
+    monkeypatch.setattr(ProductController, "get_supabase_client", lambda: fake_db)
+    monkeypatch.setattr(auction_lifecycle.order_books, "open", opened.append)
+
+    first = ProductController.update_status("p2", target=8)
+    assert first["updated"] == {"product_id": "p2", "old_status_id": 2, "new_status_id": 8}
+    assert opened == ["p2"]
+
+    # already at 8: reported as no change, the order book is not reopened
+    again = ProductController.update_status("p2", target=8)
+    assert again["message"] == "No change"
+    assert opened == ["p2"]
+
+
+def test_status_change_drops_seller_totals(fake_db, monkeypatch):
+    from app.Service import response_cache
+    from app.Service.Search.product_search import ProductSearchIndex, _Doc
+
+    index = ProductSearchIndex()
+    index._add(_Doc({"product_id": "p1", "product_name": "Lamp", "seller_id": "s1", "status_id": 8}))
+    monkeypatch.setattr(auction_lifecycle, "product_search", index)
+    totals = response_cache.TTLCache(ttl_seconds=60)
+    monkeypatch.setattr(response_cache, "seller_totals", totals)
+    for key in [("s1", None), ("s1", 8), ("s2", 8)]:
+        totals.get_or_load(key, lambda: 1)
+
+    auction_lifecycle.finalize("p1")
+
+    # s1's counts reload on next read; other sellers keep theirs
+    loaded = []
+    for key in [("s1", 8), ("s2", 8)]:
+        totals.get_or_load(key, lambda key=key: loaded.append(key) or 0)
+    assert loaded == [("s1", 8)]
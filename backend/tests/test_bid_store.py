@@ -0,0 +1,79 @@
+import threading
+
+from app.Service.Bidding.bid_store import LocalBidStore
+
+
+def _store(start_price=100, status_id=8):
+    store = LocalBidStore()
+    store.add_product("p1", start_price, status_id)
+    return store
+
+
+def test_accepts_higher_bid_and_moves_price():
+    store = _store()
+    res = store.place_bid("p1", "alice", 150)
+    assert res["status"] == "accepted"
+    assert res["current_price"] == 150
+    assert res["bid"]["bidder_id"] == "alice"
+
+
+def test_rejects_bid_not_above_current_price():
+    store = _store()
+    store.place_bid("p1", "alice", 150)
+
+    assert store.place_bid("p1", "bob", 150)["status"] == "rejected"
+    low = store.place_bid("p1", "bob", 120)
+    assert low == {"status": "rejected", "current_price": 150, "status_id": 8}
+    assert len(store.bids) == 1
+
+
+def test_rejects_closed_auction():
+    store = _store(status_id=4)
+    assert store.place_bid("p1", "alice", 500) == {"status": "closed", "status_id": 4}
+    assert store.bids == []
+
+
+def test_unknown_product():
+    assert LocalBidStore().place_bid("nope", "alice", 10) == {"status": "not_found"}
+
+
+def test_concurrent_bids_never_accept_a_lower_price():
+    store = _store(start_price=0)
+    start = threading.Barrier(40)
+    results = []
+
+    def bidder(i):
+        start.wait()
+        # two bidders per amount: only one of each pair can win it
+        results.append(store.place_bid("p1", f"user{i}", float(i // 2 + 1)))
+
+    threads = [threading.Thread(target=bidder, args=(i,)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    amounts = [b["bid_amount"] for b in store.bids]
+    # acceptance order is strictly increasing, no amount accepted twice
+    assert amounts == sorted(set(amounts))
+    accepted = [r for r in results if r["status"] == "accepted"]
+    assert len(accepted) == len(store.bids)
+    assert store.place_bid("p1", "late", amounts[-1])["status"] == "rejected"
+
+
+def test_max_bids_per_product():
+    store = LocalBidStore()
+    store.add_product("p1", 10)
+    store.add_product("p2", 10)
+    store.add_product("p3", 10)
+    store.place_bid("p1", "alice", 20)
+    store.place_bid("p1", "bob", 30)
+    store.place_bid("p2", "carol", 15)
+
+    top = store.max_bids(["p1", "p2", "p3"])
+    assert top["p1"] == {"product_id": "p1", "bid_amount": 30, "bidder_id": "bob", "total_bids": 2}
+    assert top["p2"]["bidder_id"] == "carol"
+    assert top["p2"]["total_bids"] == 1
+    # no bids -> absent, like the SQL function
+    assert "p3" not in top
+    assert store.max_bids([]) == {}
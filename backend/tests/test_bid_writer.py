@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from app.Service.Bidding import bid_writer as writer_module
+from app.Service.Bidding import order_book as order_book_module
+from app.Service.Bidding.bid_writer import BidWriter
+from app.Service.Bidding.order_book import OrderBook
+from fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({"product": [{"product_id": "p1", "start_price": 100}]})
+    monkeypatch.setattr(writer_module, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(writer_module, "RETRY_BASE_MS", 10)
+    return db
+
+
+def _bid(i, amount):
+    return {"bid_id": f"b{i}", "product_id": "p1", "bidder_id": "u", "bid_amount": amount, "created_at": "t"}
+
+
+def test_failed_batch_is_retried_not_dropped(fake_db):
+    writer = BidWriter(flush_interval_ms=1)
+    fake_db.fail_next = 2
+
+    acks = [writer.submit(_bid(i, 100 + i)) for i in range(1, 4)]
+    for ack in acks:
+        assert ack.result(timeout=3) is True
+    writer.shutdown()
+
+    assert sorted(b["bid_id"] for b in fake_db.tables["bid"]) == ["b1", "b2", "b3"]
+    assert fake_db.tables["product"][0]["start_price"] == 103
+    stats = writer.stats()
+    assert stats["failed_attempts"] == 2
+    assert stats["consecutive_failures"] == 0
+    assert stats["pending_retry"] == 0
+
+
+def test_retry_after_lost_response_does_not_duplicate(fake_db):
+    writer = BidWriter(flush_interval_ms=1)
+    fake_db.fail_after_write = 1
+
+    writer.submit(_bid(1, 150)).result(timeout=3)
+    writer.shutdown()
+
+    assert [b["bid_id"] for b in fake_db.tables["bid"]] == ["b1"]
+
+
+def test_durable_timeout_keeps_bid_as_unconfirmed(monkeypatch):
+    monkeypatch.setattr(order_book_module.bid_writer, "durable", True)
+    monkeypatch.setattr(order_book_module, "PLACE_TIMEOUT_SECONDS", 0.05)
+    pending: list[Future] = []
+
+    def persist(bid):
+        ack = Future()
+        pending.append(ack)
+        return ack
+
+    book = OrderBook("p1", 100, [], persist=persist)
+    try:
+        result = book.place("alice", 150)
+        assert result["status"] == "success"
+        assert result["persisted"] is False
+        assert book.current_price() == 150
+        assert book.unconfirmed_bids() == 1
+
+        # the writer eventually gets it into the DB
+        pending[0].set_result(True)
+        assert book.unconfirmed_bids() == 0
+    finally:
+        book.stop()
+
+
+def test_long_outage_keeps_each_attempt_bounded(fake_db, monkeypatch):
+    monkeypatch.setattr(writer_module, "RETRY_MAX_SECONDS", 0.02)
+    sent = []  # rows per bid upsert attempt
+    execute = fake_db._execute
+
+    def recording(q):
+        if q.table == "bid":
+            sent.append(len(q.payload))
+        return execute(q)
+
+    fake_db._execute = recording
+    fake_db.fail_next = 10**6  # DB down
+    writer = BidWriter(flush_interval_ms=1, max_rows=20)
+
+    acks = [writer.submit(_bid(i, 100 + i)) for i in range(500)]
+    deadline = time.monotonic() + 3
+    while writer.failed_attempts < 15 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = writer.stats()
+    assert writer.failed_attempts >= 15
+    assert max(sent) <= 20
+    assert stats["pending_retry"] <= 20
+    assert stats["queued"] >= 480  # the rest waits in the queue, not the retry batch
+
+    fake_db.fail_next = 0  # DB back
+    for ack in acks:
+        assert ack.result(timeout=5) is True
+    writer.shutdown()
+
+    assert len(fake_db.tables["bid"]) == 500
+    assert max(sent) <= 20
+
+
+def test_shutdown_mid_outage_fails_queued_acks(fake_db, monkeypatch):
+    fake_db.fail_next = 10**6
+    writer = BidWriter(flush_interval_ms=1, max_rows=5)
+    acks = [writer.submit(_bid(i, 100 + i)) for i in range(30)]
+    time.sleep(0.05)
+
+    writer.shutdown()
+
+    for ack in acks:
+        with pytest.raises(RuntimeError):
+            ack.result(timeout=1)
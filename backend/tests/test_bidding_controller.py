@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.Controller.Bidding import BiddingController as controller
+
+
+def _accept(**kwargs):
+    return {"bid": {"bid_id": "b-1", "bidder_id": kwargs["bidder_id"], "bid_amount": kwargs["bid_amount"]},
+            "new_price": kwargs["bid_amount"], "total_bids": 1}
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(controller.bid_stream, "publish", lambda pid, event: events.append(event))
+    return events
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Fails the test on any blocking name lookup; records prefetches."""
+    calls = {"prefetch": []}
+
+    def blocking(*args, **kwargs):
+        raise AssertionError("blocking user name lookup on the bid path")
+
+    monkeypatch.setattr(controller.user_names, "resolve", blocking)
+    monkeypatch.setattr(controller.user_names, "resolve_many", blocking)
+    monkeypatch.setattr(controller.user_names, "prefetch", calls["prefetch"].append)
+    return calls
+
+
+def _bid(amount="150"):
+    return controller.BidRequest(product_id="p-1", bid_amount=Decimal(amount), user_id="u-1")
+
+
+def test_cached_name_is_published_with_the_bid(monkeypatch, published, lookups):
+    monkeypatch.setattr(controller.BiddingModel, "insert_bid", staticmethod(_accept))
+    monkeypatch.setattr(controller.user_names, "peek", lambda user_id: (True, "Alice"))
+
+    response = controller.create_bid(_bid())
+
+    assert response["status"] == "success"
+    assert published[0]["bid"]["bidder_name"] == "Alice"
+    assert lookups["prefetch"] == []
+
+
+def test_name_miss_never_blocks_an_accepted_bid(monkeypatch, published, lookups):
+    monkeypatch.setattr(controller.BiddingModel, "insert_bid", staticmethod(_accept))
+    monkeypatch.setattr(controller.user_names, "peek", lambda user_id: (False, None))
+
+    response = controller.create_bid(_bid())
+
+    assert response["new_price"] == 150.0
+    assert published[0]["bid"]["bidder_name"] is None
+    assert lookups["prefetch"] == [["u-1"]]
+
+
+def test_rejected_bid_costs_no_name_lookup(monkeypatch, published, lookups):
+    monkeypatch.setattr(controller.BiddingModel, "insert_bid",
+                        staticmethod(lambda **kwargs: {"error": "Bid too low. Must be > 200"}))
+    monkeypatch.setattr(controller.user_names, "peek", lookups["prefetch"].append)
+
+    with pytest.raises(HTTPException) as exc:
+        controller.create_bid(_bid())
+
+    assert exc.value.status_code == 400
+    assert lookups["prefetch"] == [] and published == []
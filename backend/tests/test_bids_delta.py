@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.Controller.Bidding import BiddingController as controller
+from app.Model.Bidding import BiddingModel as model_module
+from app.Service.Bidding.order_book import OrderBook, BadCursor, parse_since
+from fake_supabase import FakeSupabase
+
+T0 = "2026-01-01T10:00:00+00:00"
+T1 = "2026-01-01T10:00:01+00:00"
+
+# three bids in the same instant, then one later
+BIDS = [
+    {"bid_id": "a", "product_id": "p1", "bidder_id": "u1", "bid_amount": 110, "created_at": T0},
+    {"bid_id": "b", "product_id": "p1", "bidder_id": "u2", "bid_amount": 120, "created_at": T0},
+    {"bid_id": "c", "product_id": "p1", "bidder_id": "u1", "bid_amount": 130, "created_at": T0},
+    {"bid_id": "d", "product_id": "p1", "bidder_id": "u2", "bid_amount": 140, "created_at": T1},
+    {"bid_id": "x", "product_id": "p2", "bidder_id": "u3", "bid_amount": 500, "created_at": T0},
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeSupabase({"bid": BIDS, "product": [{"product_id": "p1", "start_price": 100}]})
+    monkeypatch.setattr(model_module, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(model_module.order_books, "get", lambda product_id: None)
+    monkeypatch.setattr(controller.user_names, "resolve_many", lambda ids: {})
+    return db
+
+
+@pytest.fixture
+def book():
+    book = OrderBook("p1", 100, [dict(b) for b in BIDS if b["product_id"] == "p1"], persist=lambda bid: None)
+    yield book
+    book.stop()
+
+
+def _ids(bids):
+    return [b["bid_id"] for b in bids]
+
+
+# ---------------- DB path (no live order book) ----------------
+def test_delta_keyset_keeps_bids_sharing_the_cursor_timestamp(db):
+    out = json.loads(controller.get_bids_delta("p1", since_bid_id="a").body)
+    assert _ids(out["bids"]) == ["b", "c", "d"]
+    assert out["cursor"] == "d"
+    assert out["total_bids"] == 4
+    assert out["highest_bid"] == 140.0
+
+
+def test_delta_cursor_at_the_end_returns_nothing(db):
+    assert model_module.BiddingModel.get_bids_since("p1", since_bid_id="d") == []
+
+
+def test_delta_since_timestamp_is_strict(db):
+    assert _ids(model_module.BiddingModel.get_bids_since("p1", since=T0)) == ["d"]
+    # naive timestamps are read as UTC on both paths
+    assert _ids(model_module.BiddingModel.get_bids_since("p1", since="2026-01-01T10:00:00")) == ["d"]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"since_bid_id": "missing"},
+    {"since_bid_id": "x"},            # a bid of another product
+    {"since": "yesterday-ish"},
+])
+def test_bad_cursor_is_a_400_not_the_full_history(db, kwargs):
+    with pytest.raises(HTTPException) as exc:
+        controller.get_bids_delta("p1", **kwargs)
+    assert exc.value.status_code == 400
+    # only the cursor lookup ran (if any), never the full bid query
+    assert db.queries("bid") <= 1
+
+
+# ---------------- order book path ----------------
+def test_order_book_bids_since(book):
+    assert _ids(book.bids_since(since_bid_id="a")) == ["b", "c", "d"]
+    assert book.bids_since(since_bid_id="d") == []
+    assert _ids(book.bids_since(since=parse_since(T0))) == ["d"]
+    assert _ids(book.bids_since()) == ["a", "b", "c", "d"]
+
+
+def test_order_book_rejects_unknown_cursor(book):
+    with pytest.raises(BadCursor):
+        book.bids_since(since_bid_id="x")
+
+
+def test_both_paths_agree(db, book):
+    for cursor in ("a", "b", "c", "d"):
+        from_db = model_module.BiddingModel.get_bids_since("p1", since_bid_id=cursor)
+        assert _ids(from_db) == _ids(book.bids_since(since_bid_id=cursor))
+
+
+def test_malformed_since_fails_on_the_book_path_too(book, monkeypatch):
+    monkeypatch.setattr(model_module.order_books, "get", lambda product_id: book)
+    with pytest.raises(BadCursor):
+        model_module.BiddingModel.get_bids_since("p1", since="not-a-time")
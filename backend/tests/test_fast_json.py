@@ -0,0 +1,101 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.Controller.ProfileBuyer import OrdersController as orders
+from app.Model.ProfileBuyer.OrdersModel import OrderOut
+from app.Service import fast_json
+from app.Service.fast_json import FastJSONResponse
+from app.Service.Home.explore_product_service import _map_row_to_product
+
+ORDER_ROWS = [
+    {   # values as typed objects (UUID / Decimal / aware datetime)
+        "product_id": uuid.UUID(int=7), "product_name": "Camera", "status_id": 6,
+        "final_price": Decimal("1250.50"), "product_img": None,
+        "paid_at": datetime(2026, 1, 2, 12, 0, 0, 123000, tzinfo=timezone.utc),
+        "cancelled_at": datetime(2026, 1, 5, 8, 0, tzinfo=timezone(timedelta(hours=7))),
+    },
+    {   # values as PostgREST sends them
+        "product_id": "0b6d8a0e-5f43-4a57-9d1b-2f1c7f3b9e10", "product_name": None, "status_id": 9,
+        "final_price": 300, "product_img": None,
+        "paid_at": "2026-01-05T08:00:00.12+00:00", "cancelled_at": None,
+    },
+    {
+        "product_id": str(uuid.UUID(int=9)), "product_name": "Lamp", "status_id": 4,
+        "final_price": None, "product_img": None, "paid_at": "2026-01-01T10:00:00", "cancelled_at": None,
+    },
+]
+
+CARD_ROWS = [
+    {
+        "product_id": uuid.UUID(int=3), "product_name": "Watch", "start_price": 150,
+        "current_bid": 199.99, "total_bids": 4, "auction_id": uuid.UUID(int=4),
+        "end_time": "2099-01-01T00:00:00+00:00", "category": "Jewelry", "source": "explore",
+    },
+    {"product_id": "p-2", "product_name": "Desk", "start_price": 80, "end_time": None, "source": "coming_up"},
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def client(request, monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON_ORJSON", request.param == "orjson")
+    if request.param == "orjson" and fast_json.orjson is None:
+        pytest.skip("orjson not installed")
+
+    app = FastAPI()
+
+    # the pre-FastJSONResponse routes: response_model validation + jsonable_encoder
+    @app.get("/old/orders", response_model=List[OrderOut])
+    def old_orders():
+        return [orders._to_dto(dict(r)) for r in ORDER_ROWS]
+
+    @app.get("/old/cards", response_model=List[Dict[str, Any]])
+    def old_cards():
+        return [_map_row_to_product(r) for r in CARD_ROWS]
+
+    @app.get("/new/orders")
+    def new_orders():
+        return FastJSONResponse([orders._to_order(dict(r)) for r in ORDER_ROWS])
+
+    @app.get("/new/cards")
+    def new_cards():
+        return FastJSONResponse([_map_row_to_product(r) for r in CARD_ROWS])
+
+    return TestClient(app)
+
+
+def _canonical(body: bytes) -> str:
+    # key order and whitespace aside, 150 vs 150.0 or "...Z" vs "+00:00" still differ
+    return json.dumps(json.loads(body), sort_keys=True)
+
+
+@pytest.mark.parametrize("route", ["orders", "cards"])
+def test_fast_body_matches_response_model_output(client, route):
+    old = client.get(f"/old/{route}")
+    new = client.get(f"/new/{route}")
+
+    assert old.status_code == new.status_code == 200
+    assert new.headers["content-type"] == "application/json"
+    assert _canonical(new.content) == _canonical(old.content)
+
+
+def test_decimal_card_prices_are_numbers(client):
+    # the old List[Dict[str, Any]] route sent Decimals as strings ("150");
+    # the fast path sends numbers, as ProductCard (startPrice: float) documents
+    row = dict(CARD_ROWS[0], start_price=Decimal("150"), current_bid=Decimal("199.99"))
+    body = json.loads(fast_json.dumps([_map_row_to_product(row)]))
+
+    assert body[0]["startPrice"] == 150.0
+    assert body[0]["currentBid"] == 199.99
+
+
+def test_unknown_types_still_fail_loudly(monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON_ORJSON", False)
+    with pytest.raises(TypeError):
+        fast_json.dumps({"x": object()})
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.Controller.Home import ExploreProductController
+from app.Service import state_versions as versions_module
+from app.Service.Home import explore_product_service
+from app.Service.state_versions import state_versions, WINNERS
+from app.Service.Users.user_names import user_names
+from fake_supabase import FakeSupabase
+
+ROW = {"product_id": "p-1", "product_name": "Watch", "start_price": 150,
+       "end_time": "2099-01-01T00:00:00+00:00", "source": "explore"}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ExploreProductController.router)
+    return TestClient(app)
+
+
+def _use_db(monkeypatch, db):
+    monkeypatch.setattr(explore_product_service, "get_supabase_client", lambda: db)
+
+
+def test_live_cards_get_an_etag_and_server_time(client, monkeypatch):
+    _use_db(monkeypatch, FakeSupabase({"product": [ROW]}))
+
+    first = client.get("/api/products/explore/")
+    assert first.status_code == 200
+    assert first.json()[0]["id"] == "p-1"
+    assert first.headers["ETag"]
+    assert first.headers["X-Server-Time"]
+
+    again = client.get("/api/products/explore/", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["X-Server-Time"]
+
+
+@pytest.mark.parametrize("db", [
+    FakeSupabase({"product": []}),  # empty table -> demo cards
+    None,                           # DB down -> error cards
+])
+def test_placeholder_cards_are_never_cached(client, monkeypatch, db):
+    if db is None:
+        db = FakeSupabase()
+        db.fail_next = 1
+    _use_db(monkeypatch, db)
+
+    resp = client.get("/api/products/explore/")
+
+    assert resp.status_code == 200
+    assert resp.json()  # placeholders still render
+    assert "ETag" not in resp.headers
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert resp.headers["X-Server-Time"]
+
+
+def test_winners_tag_moves_on_rename_and_each_minute(monkeypatch):
+    minute = {"now": datetime(2026, 1, 1, 10, 0, 5)}
+    monkeypatch.setattr(versions_module, "get_now", lambda: minute["now"])
+
+    tag = state_versions.etag(WINNERS, per_minute=True)
+    assert state_versions.etag(WINNERS, per_minute=True) == tag
+
+    user_names.invalidate("u-1")
+    renamed = state_versions.etag(WINNERS, per_minute=True)
+    assert renamed != tag
+
+    minute["now"] = datetime(2026, 1, 1, 10, 1, 0)
+    assert state_versions.etag(WINNERS, per_minute=True) != renamed
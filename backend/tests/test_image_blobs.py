@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import io
+import os
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+
+from app.Service.Images import image_blobs as blobs_module
+from app.Service.Images import image_upload
+from app.Service.Images.image_blobs import StorageImageBlobs, object_path
+from app.Service.Images.image_store import LocalImageStore, CHUNK_SIZE
+from fake_supabase import FakeSupabase, UPLOAD_CHUNK
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"pixels" * 100
+
+
+class _Upload:
+    def __init__(self, data):
+        self.file = _ChunkCheckingFile(data)
+        self.filename = "a.png"
+
+
+class _ChunkCheckingFile(io.BytesIO):
+    """Fails the test on any read that is not a bounded chunk."""
+
+    def read(self, size=-1):
+        assert size is not None and 0 < size <= CHUNK_SIZE, f"unbounded read({size})"
+        return super().read(size)
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path):
+    db = FakeSupabase()
+    store = LocalImageStore(str(tmp_path / "first-container"))
+    blobs = StorageImageBlobs(enabled=True)
+    monkeypatch.setattr(blobs_module, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(blobs_module, "_stream_get", db.storage.stream)
+    monkeypatch.setattr(blobs_module, "image_store", store)
+    monkeypatch.setattr(image_upload, "image_store", store)
+    monkeypatch.setattr(image_upload, "image_blobs", blobs)
+    return db, store, blobs
+
+
+def test_upload_saves_bytes_and_a_fresh_container_restores_them(setup, monkeypatch, tmp_path):
+    db, store, blobs = setup
+    refs = asyncio.run(image_upload.store_uploads([_Upload(PNG)], derivatives=False))
+    digest = hashlib.sha256(PNG).hexdigest()
+    assert refs == [f"sha256:{digest}"]
+    assert db.storage.objects[("images", object_path(digest))] == PNG
+    assert db.storage.uploads[0][2]["content-type"] == "image/png"
+
+    # redeploy: empty disk, same bucket
+    fresh = LocalImageStore(str(tmp_path / "second-container"))
+    monkeypatch.setattr(blobs_module, "image_store", fresh)
+    assert not fresh.exists(digest)
+    assert blobs.ensure_local(digest)
+    with open(fresh.path_for(digest), "rb") as f:
+        assert f.read() == PNG
+    assert blobs.stats()["restored"] == 1
+
+
+def test_large_upload_is_streamed_with_bounded_memory(setup, monkeypatch):
+    db, store, blobs = setup
+    monkeypatch.setattr(image_upload, "MAX_IMAGE_BYTES", 16 * 1024 * 1024)
+    db.storage.keep_bytes = False
+    image = PNG + os.urandom(8 * 1024 * 1024)
+    upload = _Upload(image)
+
+    tracemalloc.start()
+    try:
+        refs = asyncio.run(image_upload.store_uploads([upload], derivatives=False))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    digest = hashlib.sha256(image).hexdigest()
+    assert refs == [f"sha256:{digest}"]
+    assert db.storage.objects[("images", object_path(digest))] == digest
+    # a few chunk buffers, not a copy (or hex copy) of the image
+    assert peak < 1024 * 1024
+    assert db.storage.largest_read <= UPLOAD_CHUNK
+
+
+def test_upload_fails_when_durable_save_fails(setup):
+    db, store, blobs = setup
+    db.storage.fail_next = 1
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(image_upload.store_uploads([_Upload(PNG)], derivatives=False))
+    assert exc.value.status_code == 503
+
+
+def test_unknown_hash_is_not_restored(setup):
+    db, store, blobs = setup
+    assert not blobs.ensure_local("0" * 64)
+    assert not blobs.ensure_local("not-a-hash")
+
+
+def test_restore_rejects_bytes_that_do_not_match_the_hash(setup):
+    db, store, blobs = setup
+    digest = hashlib.sha256(PNG).hexdigest()
+    db.storage.objects[("images", object_path(digest))] = b"tampered"
+
+    assert not blobs.ensure_local(digest)
+    assert not store.exists(digest)
+    assert blobs.stats()["missing"] == 1
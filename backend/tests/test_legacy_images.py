@@ -0,0 +1,56 @@
+import pytest
+
+from app.Service.Images import image_blobs as blobs_module
+from app.Service.Images import legacy_images
+from app.Service.Images.image_blobs import StorageImageBlobs, object_path
+from app.Service.Images.image_store import LocalImageStore
+from fake_supabase import FakeSupabase
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"legacy" * 50
+LEGACY = "\\x" + PNG.hex()
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path):
+    db = FakeSupabase({"product": [{"product_id": "p1", "product_img": LEGACY}]})
+    store = LocalImageStore(str(tmp_path))
+    blobs = StorageImageBlobs(enabled=True)
+    for module in (legacy_images, blobs_module):
+        monkeypatch.setattr(module, "get_supabase_client", lambda: db)
+        monkeypatch.setattr(module, "image_store", store)
+    monkeypatch.setattr(legacy_images, "image_blobs", blobs)
+    monkeypatch.setattr(legacy_images.image_derivatives, "schedule", lambda digest: None)
+    return db, blobs
+
+
+def _run(normalizer):
+    normalizer._normalize_table("product", "product_id", ["product_img"])
+    return normalizer.progress()
+
+
+def test_row_rewritten_only_after_durable_copy(setup):
+    db, blobs = setup
+    progress = _run(legacy_images.ImageNormalizer())
+
+    assert progress["images_converted"] == 1
+    assert db.tables["product"][0]["product_img"].startswith("sha256:")
+    digest = db.tables["product"][0]["product_img"].removeprefix("sha256:")
+    assert db.storage.objects[("images", object_path(digest))] == PNG
+
+
+def test_original_kept_when_durable_save_fails(setup):
+    db, blobs = setup
+    # page read succeeds, the bucket upload fails
+    db.storage.fail_next = 1
+    progress = _run(legacy_images.ImageNormalizer())
+
+    assert progress["rows_failed"] == 1
+    assert db.tables["product"][0]["product_img"] == LEGACY
+
+
+def test_refuses_without_durable_store(setup, monkeypatch):
+    monkeypatch.setattr(legacy_images, "image_blobs", StorageImageBlobs(enabled=False))
+    normalizer = legacy_images.ImageNormalizer()
+    assert normalizer.refusal()
+    assert normalizer.start() is False
+    assert normalizer.progress()["status"] == "idle"
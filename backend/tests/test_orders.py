@@ -0,0 +1,97 @@
+import json
+import uuid
+
+import pytest
+
+from app.Controller.ProfileBuyer import OrdersController as orders
+from fake_supabase import FakeSupabase
+
+BUYER = "buyer-1"
+
+
+def _history(n: int, refunded_every: int = 5) -> dict:
+    """n won products, each with the buyer's bids, a payment and (some) a refund."""
+    products, bids, payments, deliveries = [], [], [], []
+    for i in range(n):
+        pid = str(uuid.UUID(int=i + 1))
+        status_id = 6 if i % refunded_every == 0 else 4
+        products.append({
+            "product_id": pid, "product_name": f"Item {i}", "start_price": 100 + i,
+            "end_time": "2026-01-01T10:00:00", "winner_id": BUYER,
+            "status_id": status_id, "product_img": None,
+        })
+        for k in range(2):
+            bids.append({"bid_id": f"b-{i}-{k}", "product_id": pid, "bidder_id": BUYER,
+                         "created_at": f"2026-01-01T09:0{k}:00"})
+        payments.append({"bid_id": f"b-{i}-1", "amount": 500 + i, "payment_time": "2026-01-02T12:00:00"})
+        if status_id == 6:
+            deliveries.append({"product_id": pid, "delivery_status": "Refund",
+                               "received_date": "2026-01-05T08:00:00"})
+    return {"product": products, "bid": bids, "payment": payments, "delivery": deliveries}
+
+
+@pytest.fixture
+def make_db(monkeypatch):
+    def make(n):
+        db = FakeSupabase(_history(n))
+        monkeypatch.setattr(orders, "get_supabase_client", lambda: db)
+        return db
+    return make
+
+
+@pytest.mark.parametrize("n", [0, 1, 50, orders.IN_CHUNK])
+def test_list_orders_stays_at_four_queries(make_db, n):
+    db = make_db(n)
+
+    completed = json.loads(orders.list_orders(status="completed", x_user_id=BUYER).body)
+    completed_queries = db.queries()
+    cancelled = json.loads(orders.list_orders(status="cancelled", x_user_id=BUYER).body)
+
+    assert len(completed) + len(cancelled) == n
+    assert completed_queries <= 4
+    assert db.queries() - completed_queries <= 4
+
+
+def test_list_orders_grows_per_chunk_not_per_order(make_db):
+    n = orders.IN_CHUNK * 2 + 50
+    db = make_db(n)
+
+    rows = json.loads(orders.list_orders(status="cancelled", x_user_id=BUYER).body)
+
+    chunks = -(-len(rows) // orders.IN_CHUNK)
+    assert db.queries() <= 1 + 3 * chunks
+    # enrichment: latest bid's payment, refund date
+    first = rows[0]
+    assert first["finalPrice"] == 500.0
+    assert first["purchasedAt"] == "2026-01-02T12:00:00"
+    assert first["cancelledAt"] == "2026-01-05T08:00:00"
+    assert first["status"] == "refunded"
+
+
+@pytest.mark.parametrize("n", [2, 300])
+def test_receive_and_refund_budgets_do_not_depend_on_history(make_db, n):
+    db = make_db(n)
+    pid = uuid.UUID(int=2)  # status 4
+
+    received = orders.receive_order(pid, x_user_id=BUYER)
+    # product, update, delivery insert, bid + payment enrichment
+    assert db.queries() == 5
+    assert received.status == "received"
+    assert received.finalPrice == 501.0
+
+    before = db.queries()
+    refunded = orders.refund_order(pid, x_user_id=BUYER)
+    # same plus the refund delivery lookup
+    assert db.queries() - before == 6
+    assert refunded.status == "refunded"
+    assert refunded.cancelledAt is not None
+
+
+def test_receive_rejects_other_buyers(make_db):
+    db = make_db(3)
+
+    with pytest.raises(orders.HTTPException) as exc:
+        orders.receive_order(uuid.UUID(int=1), x_user_id="someone-else")
+
+    assert exc.value.status_code == 403
+    assert ("product", "update") not in db.calls
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from app.Service.Search.product_search import ProductSearchIndex, _Doc
+
+
+@pytest.fixture
+def index():
+    idx = ProductSearchIndex()
+    rows = [
+        {"product_id": "switch", "product_name": "Nintendo Switch OLED", "product_desc": "", "seller_id": "s1", "status_id": 2},
+        {"product_id": "iphone", "product_name": "iPhone 13", "product_desc": "128GB", "seller_id": "s1", "status_id": 8},
+        {"product_id": "thai", "product_name": "ขายมือถือใหม่", "product_desc": "", "seller_id": "s2", "status_id": 2},
+        {"product_id": "lamp", "product_name": "Desk lamp", "product_desc": "warm light, extendable arm", "seller_id": "s2", "status_id": 2},
+        {"product_id": "camera", "product_name": "Canon camera", "product_desc": "", "seller_id": "s1", "status_id": 4},
+    ]
+    for row in rows:
+        idx._add(_Doc(row))
+    idx._loaded_at = time.monotonic()  # skip the DB load
+    return idx
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("tend", "switch"),          # infix, no trigram shared with the padded query
+    ("ph", "iphone"),            # two letters
+    ("มือ", "thai"),             # Thai infix
+    ("switch ol", "switch"),     # multi-word substring
+])
+def test_substring_matches_are_always_found(index, query, expected):
+    assert expected in index.search(query)
+
+
+def test_substring_in_description(index):
+    assert index.search("tend") == ["switch", "lamp"]
+
+
+def test_fuzzy_matches_still_need_similarity(index):
+    assert index.search("camra") == ["camera"]
+    assert index.search("xqz") == []
+
+
+def test_filters_apply_to_substring_matches(index):
+    assert index.search("ph", status_id=2) == []
+    assert index.search("tend", seller_id="s2") == ["lamp"]
+
+
+def test_set_status_reports_sellers(index):
+    assert index.set_status(["switch", "thai"], 8) == {"s1", "s2"}
+    assert index.search("switch", status_id=8) == ["switch"]
+    # an unindexed product has no known seller
+    assert index.set_status(["lamp", "missing"], 4) is None
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from app.Service import reference_data as reference_module
+from app.Service.reference_data import ReferenceData
+from fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeSupabase({"category": [{"category_id": 1, "category_name": "Electronics"}]})
+    monkeypatch.setattr(reference_module, "get_supabase_client", lambda: db)
+    return db
+
+
+def test_etag_is_a_version_that_moves_only_on_change(db):
+    ref = ReferenceData()
+    _, first = ref.snapshot("products")
+    assert ref.snapshot("products")[1] == first
+    assert ref.snapshot("seller")[1] != first
+
+    ref.bump()  # reload, same rows
+    assert ref.snapshot("products")[1] == first
+
+    db.tables["category"].append({"category_id": 2, "category_name": "Jewelry"})
+    ref.bump()
+    data, changed = ref.snapshot("products")
+    assert changed != first
+    assert [c["category_name"] for c in data["categories"]] == ["Electronics", "Jewelry"]
+
+
+def test_snapshot_pairs_body_and_tag_across_a_reload(db):
+    ref = ReferenceData()
+    old_data, old_tag = ref.snapshot()
+
+    db.tables["category"].append({"category_id": 2, "category_name": "Jewelry"})
+    ref.bump()
+    new_data, new_tag = ref.snapshot()
+
+    # the old body is never handed out with the new tag (or vice versa)
+    assert len(old_data["categories"]) == 1 and len(new_data["categories"]) == 2
+    assert old_tag != new_tag
+    assert ref.snapshot() == (new_data, new_tag)
+
+
+def test_refresh_is_admin_only(db, monkeypatch):
+    from fastapi import HTTPException
+    from app.Service.ProfileAdmin import ProfileAdminService
+
+    db.tables["users"] = [{"user_id": "admin", "role_id": 1}, {"user_id": "buyer", "role_id": 3}]
+    monkeypatch.setattr(ProfileAdminService, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(ProfileAdminService, "reference_data", ReferenceData())
+
+    with pytest.raises(HTTPException) as exc:
+        ProfileAdminService.refresh_reference_data(x_user_id="buyer")
+    assert exc.value.status_code == 403
+    assert db.queries("category") == 0
+
+    assert ProfileAdminService.refresh_reference_data(x_user_id="admin")["ok"]
+
+
+def test_expired_ttl_reloads_once_for_concurrent_callers(db, monkeypatch):
+    ref = ReferenceData()
+    ref.get()
+    loads_before = db.queries("category")
+
+    slow_load = ref._load
+
+    def load():
+        time.sleep(0.05)
+        return slow_load()
+
+    monkeypatch.setattr(ref, "_load", load)
+    ref._loaded_at = 0.0  # TTL expired
+
+    start = threading.Barrier(20)
+
+    def reader():
+        start.wait()
+        assert ref.categories()
+
+    threads = [threading.Thread(target=reader) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert db.queries("category") - loads_before == 1
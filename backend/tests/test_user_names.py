@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from app.Service.Users import user_names as names_module
+from app.Service.Users.user_names import UserNameResolver
+from fake_supabase import FakeSupabase
+
+USERS = [{"user_id": f"u{i}", "user_name": f"User {i}"} for i in range(10)]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeSupabase({"users": USERS})
+    monkeypatch.setattr(names_module, "get_supabase_client", lambda: db)
+    monkeypatch.setattr(names_module, "USER_NAME_BATCH_WINDOW_MS", 50)
+    return db
+
+
+def _concurrently(fn, args_list):
+    results, errors = [None] * len(args_list), [None] * len(args_list)
+    start = threading.Barrier(len(args_list))
+
+    def run(i, args):
+        start.wait()
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, a)) for i, a in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_one_query_per_batch_window(db):
+    resolver = UserNameResolver()
+
+    results, errors = _concurrently(resolver.resolve, [(f"u{i}",) for i in range(8)])
+
+    assert errors == [None] * 8
+    assert results == [f"User {i}" for i in range(8)]
+    assert db.queries("users") == 1
+    # everything is cached now, unknown ids included
+    assert resolver.resolve_many(["u0", "u7", "ghost"]) == {"u0": "User 0", "u7": "User 7", "ghost": None}
+    assert db.queries("users") == 2
+    resolver.resolve("ghost")
+    assert db.queries("users") == 2
+
+
+def test_entries_expire_after_ttl(db, monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(names_module.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(names_module, "USER_NAME_BATCH_WINDOW_MS", 0)
+    resolver = UserNameResolver()
+
+    resolver.resolve("u1")
+    clock["now"] += names_module.USER_NAME_TTL_SECONDS - 1
+    assert resolver.peek("u1") == (True, "User 1")
+
+    clock["now"] += 2
+    assert resolver.peek("u1") == (False, None)
+    resolver.resolve("u1")
+    assert db.queries("users") == 2
+
+
+def test_cache_is_lru_bounded(db, monkeypatch):
+    monkeypatch.setattr(names_module, "USER_NAME_CACHE_SIZE", 3)
+    monkeypatch.setattr(names_module, "USER_NAME_BATCH_WINDOW_MS", 0)
+    resolver = UserNameResolver()
+
+    for uid in ("u1", "u2", "u3"):
+        resolver.resolve(uid)
+    resolver.resolve("u1")          # u1 becomes most recent
+    resolver.resolve("u4")          # evicts u2, the least recent
+
+    assert len(resolver._cache) == 3
+    assert resolver.peek("u2") == (False, None)
+    assert resolver.peek("u1")[0] and resolver.peek("u3")[0] and resolver.peek("u4")[0]
+
+
+def test_batch_error_reaches_every_waiter(db):
+    resolver = UserNameResolver()
+    db.fail_next = 1
+
+    results, errors = _concurrently(resolver.resolve, [(f"u{i}",) for i in range(5)])
+
+    assert db.queries("users") == 1
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    # nothing was cached, the next call queries again
+    assert resolver.resolve("u1") == "User 1"
+
+
+def test_prefetch_warms_the_cache_off_thread(db):
+    resolver = UserNameResolver()
+    assert resolver.peek("u5") == (False, None)
+
+    resolver.prefetch(["u5", None])
+    resolver._prefetcher.submit(lambda: None).result(timeout=2)  # queue drained
+
+    assert resolver.peek("u5") == (True, "User 5")
+
+
+def test_invalidate_forgets_a_name(db):
+    resolver = UserNameResolver()
+    resolver.resolve("u2")
+    resolver.invalidate("u2")
+    assert resolver.peek("u2") == (False, None)
@@ -3,6 +3,8 @@ import { useParams, useLocation, useNavigate } from "react-router-dom";
 import Swal from "sweetalert2";
 import { useAuth } from "../../contexts/AuthContext";
 import { API_BASE_URL } from "../../config/api";
+import { subscribeBids } from "../../services/bidStream";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 const MIN_INCREMENT = 500;
 
@@ -25,7 +27,10 @@ function computeRemainingTime(targetTime, currentTime = new Date()) {
 function decodeImage(raw) {
   if (!raw) return null;
   
-  if (raw.startsWith("data:") || raw.startsWith("http")) {
+  const url = resolveImageUrl(raw);
+  if (url) return url;
+
+  if (raw.startsWith("data:")) {
     return raw;
   }
   
@@ -136,15 +141,20 @@ export default function AuctionProductDetail() {
     }
     
     loadHighest();
-    
-    // Refresh highest bid ทุก 3 วินาทีระหว่างประมูล
-    const interval = setInterval(() => {
-      if (phase === "active") {
-        loadHighest();
-      }
-    }, 3000);
-    
-    return () => clearInterval(interval);
+  }, [productId, productData]);
+
+  // ✅ Live bid updates ระหว่างประมูล (server push แทนการ poll ทุก 3 วินาที)
+  useEffect(() => {
+    if (!productData || phase !== "active") return;
+
+    return subscribeBids(productId, (update) => {
+      const highest = update.highest_bid || productData.startPrice;
+      setCurrentBid(highest);
+      if (update.total_bids != null) setTotalBids(update.total_bids);
+      else if (update.bid) setTotalBids((n) => n + 1);
+      setNextMin(highest + MIN_INCREMENT);
+      setUserBidAmount(highest + MIN_INCREMENT);
+    });
   }, [productId, productData, phase]);
 
   // ✅ Real Clock + Phase Detection
@@ -1,5 +1,6 @@
 import { useEffect, useRef, useState } from "react";
 import { getProductStatusList } from "../../services/ProfileAdmin/userService";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 /* ---------- money + date ---------- */
 
@@ -77,6 +78,10 @@ const isValidImageBase64 = (b64) => {
 const toThumbSrc = (raw, trackUrl) => {
   if (!raw || typeof raw !== "string") return null;
 
+  // image store URL
+  const url = resolveImageUrl(raw);
+  if (url) return url;
+
   // already data URL
   if (raw.startsWith("data:")) return raw;
 
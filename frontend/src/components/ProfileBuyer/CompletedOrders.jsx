@@ -2,6 +2,7 @@
 import React, { useEffect, useState, useRef } from "react";
 import { useAuth } from "../../contexts/AuthContext";
 import { API_BASE_URL } from "../../config/api";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 const PLACEHOLDER = "https://via.placeholder.com/200x200?text=No+Image";
 const STATUS = "completed";
@@ -70,6 +71,10 @@ const isValidImageBase64 = (b64) => {
 const toThumbSrc = (raw, trackUrl) => {
   if (!raw || typeof raw !== "string") return null;
 
+  // image store URL
+  const url = resolveImageUrl(raw);
+  if (url) return url;
+
   // already a data URL
   if (raw.startsWith("data:")) return raw;
 
@@ -1,6 +1,7 @@
 import { useEffect, useMemo, useRef, useState } from "react";
 import { useAuth } from "../../contexts/AuthContext";
 import { API_BASE_URL } from "../../config/api";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 /* ---------- image helpers ---------- */
 // sniff MIME from magic numbers
@@ -46,6 +47,10 @@ const isValidImageBase64 = (b64) => {
 const toThumbSrc = (raw, trackUrl) => {
     if (!raw || typeof raw !== "string") return null;
 
+    // image store URL
+    const url = resolveImageUrl(raw);
+    if (url) return url;
+
     // already data URL
     if (raw.startsWith("data:")) return raw;
 
@@ -120,7 +125,10 @@ export default function ProductLists() {
     const [filter, setFilter] = useState("all"); // all | 1 | 2 | 3
     const [searchTerm, setSearchTerm] = useState("");
     const [page, setPage] = useState(1);
+    const [hasMore, setHasMore] = useState(false);
     const pageSize = 10;
+    // cursor ของแต่ละหน้า (หน้า 1 = null) จาก next_cursor ของหน้าก่อนหน้า
+    const cursorsRef = useRef({ 1: null });
 
     // track created object URLs to revoke later
     const blobUrlsRef = useRef(new Set());
@@ -163,7 +171,9 @@ export default function ProductLists() {
         setError("");
         try {
             const params = new URLSearchParams();
-            params.set("page", String(page));
+            const cursor = cursorsRef.current[page];
+            if (cursor) params.set("cursor", cursor);
+            else params.set("page", String(page));
             params.set("page_size", String(pageSize));
             if (searchTerm.trim()) params.set("search", searchTerm.trim());
             if (filter !== "all") params.set("status_id", filter);
@@ -174,6 +184,8 @@ export default function ProductLists() {
             if (!res.ok) throw new Error(data.detail || "Failed to load products");
             setItems(data.items || []);
             setTotal(data.total || 0);
+            setHasMore(Boolean(data.has_more));
+            cursorsRef.current[page + 1] = data.next_cursor || null;
         } catch (e) {
             console.error(e);
             setError(e.message);
@@ -189,6 +201,7 @@ export default function ProductLists() {
 
     const onSearch = async (e) => {
         e?.preventDefault?.();
+        cursorsRef.current = { 1: null };
         setPage(1);
         await fetchProducts();
     };
@@ -313,7 +326,7 @@ export default function ProductLists() {
                     </button>
                     <button
                         onClick={() => setPage((p) => p + 1)}
-                        disabled={page * pageSize >= total}
+                        disabled={!hasMore}
                         className="px-4 py-2 border border-gray-300 rounded-md text-sm hover:bg-gray-50 disabled:opacity-50"
                     >
                         Next
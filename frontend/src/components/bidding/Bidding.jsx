@@ -2,6 +2,8 @@ import { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import Swal from "sweetalert2";
 import { API_BASE_URL } from "../../config/api";
+import { subscribeBids } from "../../services/bidStream";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 const MIN_INCREMENT = 500;
 const TEMP_USER_ID = "ce729402-fcac-4c62-868d-3d04800c5db7";
@@ -11,6 +13,8 @@ const TEMP_USER_ID = "ce729402-fcac-4c62-868d-3d04800c5db7";
 // ----------------------------------------
 function decodeImage(hex) {
   try {
+    const url = resolveImageUrl(hex);
+    if (url) return url;
     if (!hex || !hex.startsWith("\\x")) return null;
     const buffer = Buffer.from(hex.replace("\\x", ""), "hex");
     return `data:image/jpeg;base64,${buffer.toString("base64")}`;
@@ -65,32 +69,19 @@ export default function Bidding() {
   }
 
   // ============================================================
-  // LOAD BIDS — REAL TIME
+  // APPLY BID UPDATE — REAL TIME (from the bid stream)
   // ============================================================
-  async function loadBids() {
-    if (!product) return;
-
-    try {
-      // GET HIGHEST BID
-      const highest = await fetch(`${API_BASE_URL}/bids/product/${productId}/highest`);
-      const highestData = await highest.json();
-
-      let newHighest = parseFloat(highestData.highest_bid);
-      if (isNaN(newHighest)) newHighest = parseFloat(product.start_price);
+  function applyBidUpdate(update) {
+    let newHighest = parseFloat(update.highest_bid);
+    if (isNaN(newHighest)) newHighest = parseFloat(product.start_price);
 
-      setHighestBid(newHighest);
+    setHighestBid(newHighest);
 
-      // GET TOTAL BIDS
-      const all = await fetch(`${API_BASE_URL}/bids/product/${productId}/bids`);
-      const allData = await all.json();
-      setTotalBids(allData.total_bids || 0);
+    if (update.total_bids != null) setTotalBids(update.total_bids);
+    else if (update.bid) setTotalBids((n) => n + 1);
 
-      // Update next minimum bid
-      setBidAmount((newHighest + MIN_INCREMENT).toFixed(2));
-
-    } catch (err) {
-      console.log("Load bids error:", err);
-    }
+    // Update next minimum bid
+    setBidAmount((newHighest + MIN_INCREMENT).toFixed(2));
   }
 
   // ============================================================
@@ -166,7 +157,6 @@ export default function Bidding() {
       if (!res.ok) throw new Error(data.detail);
 
       Swal.fire("Success", "Bid submitted!", "success");
-      await loadBids();
 
     } catch (err) {
       Swal.fire("Bid Failed", err.message, "error");
@@ -205,11 +195,11 @@ export default function Bidding() {
   }, [auctionEnded]);
 
   // ============================================================
-  // AUTO REFRESH BIDS EVERY 1 SEC
+  // LIVE BIDS VIA SERVER PUSH (replaces 1-second polling)
   // ============================================================
   useEffect(() => {
-    const interval = setInterval(loadBids, 1000);
-    return () => clearInterval(interval);
+    if (!product) return;
+    return subscribeBids(productId, applyBidUpdate);
   }, [product]);
 
   // ============================================================
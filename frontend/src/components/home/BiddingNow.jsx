@@ -2,12 +2,17 @@
 import { useEffect, useState, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { API_BASE_URL } from "../../config/api";
+import { subscribeBids } from "../../services/bidStream";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 // Helper: decode image from hex or base64
 function decodeImage(raw) {
   if (!raw) return null;
   
-  if (raw.startsWith("data:") || raw.startsWith("http")) {
+  const url = resolveImageUrl(raw);
+  if (url) return url;
+
+  if (raw.startsWith("data:")) {
     return raw;
   }
   
@@ -146,15 +151,14 @@ export default function BiddingNow() {
     }
   }, [timeLeft]);
 
-  // Refresh highest bid ทุก 5 วินาที
+  // รับ highest bid แบบ real-time ผ่าน bid stream
   useEffect(() => {
     if (!item) return;
-    
-    const bidInterval = setInterval(() => {
-      loadHighestBid(item.product_id);
-    }, 5000);
-    
-    return () => clearInterval(bidInterval);
+
+    return subscribeBids(item.product_id, (update) => {
+      if (update.highest_bid) setHighestBid(update.highest_bid);
+      if (update.bid) setHighestBidder(update.bid.bidder_id || null);
+    });
   }, [item?.product_id]);
 
   // ----------------------------------------------------
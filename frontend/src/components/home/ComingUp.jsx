@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { API_BASE_URL } from "../../config/api";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 const PLACEHOLDER = "https://via.placeholder.com/300x200?text=No+Image";
 
@@ -11,6 +12,10 @@ const PLACEHOLDER = "https://via.placeholder.com/300x200?text=No+Image";
 function decodeImage(raw) {
   try {
     if (!raw) return null;
+
+    // รูปจาก image store
+    const url = resolveImageUrl(raw);
+    if (url) return url;
     
     // ถ้าเป็น base64 ของรูปจริง (JPEG/PNG/GIF/WEBP)
     if (raw.startsWith("/9j/") || raw.startsWith("iVBOR") || 
@@ -85,8 +90,10 @@ export default function ComingUp() {
       
       setItems(sortedItems);
       
-      if (json.current_time) {
-        setCountdown(secondsToNextMinute(json.current_time));
+      // body may come from the browser cache (304), the header is always fresh
+      const serverTime = res.headers.get("X-Server-Time") || json.current_time;
+      if (serverTime) {
+        setCountdown(secondsToNextMinute(serverTime));
       } else {
         setCountdown(60);
       }
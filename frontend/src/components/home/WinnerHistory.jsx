@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { FiHeart, FiEye } from 'react-icons/fi';
 import { API_BASE_URL } from "../../config/api";
+import { resolveImageUrl } from "../../services/imageUrl";
 
 
 export default function WinnerHistory() {
@@ -16,6 +17,8 @@ export default function WinnerHistory() {
   const decodeImage = (hex) => {
     try {
       if (!hex) return null;
+      const url = resolveImageUrl(hex);
+      if (url) return url;
       if (hex.startsWith("data:image")) return hex;
       if (!hex.startsWith("\\x")) return null;
       const h = hex.slice(2);
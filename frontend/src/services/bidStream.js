@@ -0,0 +1,24 @@
+import { API_BASE_URL } from "../config/api";
+
+/**
+ * Subscribe to live bid updates for one product (Server-Sent Events).
+ * onUpdate receives { highest_bid, total_bids, bids? , bid? } — a full
+ * snapshot on connect, then one event per accepted bid.
+ * Returns an unsubscribe function.
+ */
+export function subscribeBids(productId, onUpdate) {
+    const source = new EventSource(`${API_BASE_URL}/bids/product/${productId}/stream`);
+
+    const handle = (e) => {
+        try {
+            onUpdate(JSON.parse(e.data));
+        } catch (err) {
+            console.error("Bad bid stream event:", err);
+        }
+    };
+
+    source.addEventListener("snapshot", handle);
+    source.addEventListener("bid", handle);
+
+    return () => source.close();
+}
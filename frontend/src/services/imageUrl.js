@@ -0,0 +1,13 @@
+import { API_BASE_URL } from "../config/api";
+
+/**
+ * Image-store URL for an <img> src, or null if `raw` is an inline image
+ * (data URL / hex / base64) that the caller should decode itself.
+ * The backend returns "/images/<hash>" paths relative to the API.
+ */
+export function resolveImageUrl(raw) {
+    if (!raw || typeof raw !== "string") return null;
+    if (raw.startsWith("/images/")) return `${API_BASE_URL}${raw}`;
+    if (raw.startsWith("http://") || raw.startsWith("https://")) return raw;
+    return null;
+}